@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Save Archive Analytics
+==============================
+
+Cross-version queries over every versioned save of a matchup
+(DBR_TTS_Assets/*_v1.1…v4.5 and the timestamped saves in the root)
+without re-parsing JSON each time.
+
+Saves are streamed in parallel worker processes and flattened into one
+record per object (save, nickname, kind, container depth, asset URL and
+world transform). Records are kept column by column in typed `array`
+files (strings interned into a shared table) under the cache directory,
+and opened with mmap for queries. A save is only re-parsed when its size
+or mtime changes; unchanged saves have their rows copied across.
+
+Versions are ordered by the _YYYYmmdd_HHMMSS stamp in their file names.
+
+Usage:
+    python archive_analytics.py counts
+    python archive_analytics.py changes "English Billman"
+    python archive_analytics.py changes "Terrain Wood Large" --field posX DBR_TTS_Assets
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from batch_validate import expand_paths
+from result_cache import DEFAULT_CACHE_DIR
+from test_framework import (TRANSFORM_FIELDS, TRANSFORM_COLUMN, Color, ObjectIndex,
+                            iter_save_stream)
+
+DEFAULT_STORE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'archive')
+
+# Saves analysed when no paths are given
+DEFAULT_PATHS = ('DBR_TTS_Assets', 'DBR_*.json')
+
+# Bump when the column layout changes
+STORE_VERSION = 1
+
+# Column name -> array typecode; 'transform' holds len(TRANSFORM_FIELDS) values per row
+COLUMNS = {
+    'save': 'I',
+    'nickname': 'I',
+    'kind': 'B',
+    'depth': 'B',
+    'url': 'I',
+    'transform': 'd',
+}
+
+KINDS = ('table', 'unit', 'terrain', 'tool', 'bag', 'other')
+KIND_CODE = {kind: code for code, kind in enumerate(KINDS)}
+
+# Changes smaller than this are not reported
+CHANGE_EPSILON = 1e-6
+
+VERSION_STAMP = re.compile(r'_(\d{8}_\d{6})(?:\.json)?$')
+
+
+def version_sort_key(path: str) -> Tuple[str, str]:
+    """Order saves by their file name timestamp, then name"""
+    name = os.path.basename(path)
+    match = VERSION_STAMP.search(name)
+    return (match.group(1) if match else '', name)
+
+
+def extract_records(path: str) -> Dict[str, list]:
+    """Per-object columns of one save (runs inside a worker process)"""
+    index = ObjectIndex(slim=True)
+    for key, value in iter_save_stream(path):
+        if key == 'ObjectStates' and isinstance(value, dict):
+            index.add(value)
+
+    records = {'nickname': [], 'kind': [], 'depth': [], 'url': [], 'transform': []}
+    for entry in index.objects:
+        data = entry.data
+        url = (data.get('CustomAssetbundle', {}).get('AssetbundleURL', '') or
+               data.get('CustomMesh', {}).get('MeshURL', ''))
+        transform = entry.world_transform
+        records['nickname'].append(entry.nickname)
+        records['kind'].append(entry.kind)
+        records['depth'].append(min(entry.depth, 255))
+        records['url'].append(url)
+        records['transform'].extend(float(transform.get(field, 0)) for field in TRANSFORM_FIELDS)
+    return records
+
+
+class ArchiveStore:
+    """Memory-mapped columnar store of per-object records across saves"""
+
+    def __init__(self, store_dir: str = DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.saves: List[Dict] = []  # path, label, size, mtime_ns, start, count
+        self.strings: List[str] = ['']
+        self._string_ids: Dict[str, int] = {'': 0}
+        self._maps: Dict[str, mmap.mmap] = {}
+        self.columns: Dict[str, memoryview] = {}
+        self._load()
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.store_dir, 'manifest.json')
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.store_dir, f"{name}.{COLUMNS[name]}")
+
+    def _load(self):
+        try:
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        if manifest.get('version') != STORE_VERSION:
+            return
+        self.saves = manifest['saves']
+        self.strings = manifest['strings']
+        self._string_ids = {s: i for i, s in enumerate(self.strings)}
+        self._open_columns()
+
+    def _open_columns(self):
+        self.close()
+        for name, typecode in COLUMNS.items():
+            try:
+                with open(self._column_path(name), 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        self.columns[name] = memoryview(array(typecode))
+                        continue
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except OSError:
+                self.saves = []  # Incomplete store: rebuild everything
+                self.close()
+                return
+            self._maps[name] = mapped
+            self.columns[name] = memoryview(mapped).cast(typecode)
+
+    def close(self):
+        for view in self.columns.values():
+            view.release()
+        self.columns = {}
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps = {}
+
+    def intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def refresh(self, paths: List[str], jobs: int = 0) -> Tuple[int, int]:
+        """Bring the store in line with `paths`; returns (parsed, reused) counts"""
+        paths = sorted(paths, key=version_sort_key)
+        old = {save['path']: save for save in self.saves}
+        stats = {}
+        todo = []
+        for path in paths:
+            abs_path = os.path.abspath(path)
+            st = os.stat(path)
+            stats[abs_path] = st
+            cached = old.get(abs_path)
+            if not (cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns):
+                todo.append(path)
+
+        unchanged = [os.path.abspath(p) for p in paths] == [s['path'] for s in self.saves]
+        if not todo and unchanged:
+            return 0, len(paths)
+
+        parsed = dict(zip(todo, self._extract_all(todo, jobs)))
+
+        new_columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        width = len(TRANSFORM_FIELDS)
+        saves = []
+        for number, path in enumerate(paths):
+            abs_path = os.path.abspath(path)
+            start = len(new_columns['nickname'])
+            if path in parsed:
+                records = parsed[path]
+                count = len(records['nickname'])
+                new_columns['nickname'].extend(self.intern(s) for s in records['nickname'])
+                new_columns['kind'].extend(KIND_CODE.get(k, KIND_CODE['other']) for k in records['kind'])
+                new_columns['depth'].extend(records['depth'])
+                new_columns['url'].extend(self.intern(s) for s in records['url'])
+                new_columns['transform'].extend(records['transform'])
+            else:
+                cached = old[abs_path]
+                lo, count = cached['start'], cached['count']
+                for name in ('nickname', 'kind', 'depth', 'url'):
+                    new_columns[name].extend(self.columns[name][lo:lo + count])
+                new_columns['transform'].extend(self.columns['transform'][lo * width:(lo + count) * width])
+            new_columns['save'].extend([number] * count)
+            st = stats[abs_path]
+            saves.append({
+                'path': abs_path,
+                'label': os.path.splitext(os.path.basename(path))[0],
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'start': start,
+                'count': count,
+            })
+
+        self._write(new_columns, saves)
+        return len(todo), len(paths) - len(todo)
+
+    @staticmethod
+    def _extract_all(paths: List[str], jobs: int) -> List[Dict[str, list]]:
+        jobs = min(jobs or os.cpu_count() or 1, len(paths))
+        if jobs <= 1:
+            return [extract_records(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(extract_records, paths))
+
+    def _write(self, new_columns: Dict[str, array], saves: List[Dict]):
+        """Replace the column files and manifest atomically, then remap them"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.close()
+        for name, values in new_columns.items():
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                values.tofile(f)
+            os.replace(tmp_path, self._column_path(name))
+
+        self.saves = saves
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'saves': saves, 'strings': self.strings}, f)
+        os.replace(tmp_path, self._manifest_path())
+        self._open_columns()
+
+    def object_counts(self) -> List[Tuple[str, int, Counter]]:
+        """(version label, object count, count per kind) for every save"""
+        counts = []
+        kinds = self.columns.get('kind')
+        for save in self.saves:
+            lo, count = save['start'], save['count']
+            by_kind = Counter(KINDS[code] for code in kinds[lo:lo + count]) if count else Counter()
+            counts.append((save['label'], count, by_kind))
+        return counts
+
+    def field_history(self, nickname: str, field: str = 'scaleX') -> List[Tuple[str, Optional[float]]]:
+        """(version label, value) of one transform field for an object, None where absent.
+
+        Nicknames match case-insensitively; where several objects share the
+        nickname, the shallowest (loose before bagged) first one is used.
+        """
+        wanted = nickname.lower()
+        ids = {i for i, s in enumerate(self.strings) if s.lower() == wanted}
+        column = TRANSFORM_COLUMN[field]
+        width = len(TRANSFORM_FIELDS)
+        nicknames, depths = self.columns.get('nickname'), self.columns.get('depth')
+        transforms = self.columns.get('transform')
+
+        history = []
+        for save in self.saves:
+            best = None
+            for row in range(save['start'], save['start'] + save['count']):
+                if nicknames[row] in ids and (best is None or depths[row] < depths[best]):
+                    best = row
+            value = transforms[best * width + column] if best is not None else None
+            history.append((save['label'], value))
+        return history
+
+
+def changes(history: List[Tuple[str, Optional[float]]]
+            ) -> List[Tuple[str, Optional[float], Optional[float]]]:
+    """(version label, old, new) wherever the value differs from the previous version"""
+    found = []
+    previous = None
+    for number, (label, value) in enumerate(history):
+        if number and (
+                (value is None) != (previous is None) or
+                (value is not None and abs(value - previous) > CHANGE_EPSILON)):
+            found.append((label, previous, value))
+        previous = value
+    return found
+
+
+def _format(value: Optional[float]) -> str:
+    return 'absent' if value is None else f"{value:g}"
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Query object history across versioned DBR saves")
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR, help="Columnar store directory")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Worker processes for parsing (default: one per CPU core)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    counts = commands.add_parser('counts', help="Object count per version")
+    counts.add_argument('paths', nargs='*', help="Saves, directories or globs (default: the archive)")
+
+    history = commands.add_parser('changes', help="Versions where an object's transform field changed")
+    history.add_argument('nickname', help="Object nickname (case-insensitive)")
+    history.add_argument('paths', nargs='*', help="Saves, directories or globs (default: the archive)")
+    history.add_argument('--field', default='scaleX', choices=TRANSFORM_FIELDS,
+                         help="Transform field to follow (default: scaleX)")
+    args = parser.parse_args()
+
+    paths = expand_paths(args.paths or list(DEFAULT_PATHS))
+    if not paths:
+        print(f"{Color.RED}✗ No save files matched{Color.END}")
+        sys.exit(1)
+
+    store = ArchiveStore(args.store_dir)
+    parsed, reused = store.refresh(paths, args.jobs)
+    print(f"{Color.BLUE}{len(paths)} saves: {parsed} parsed, {reused} from the store{Color.END}")
+
+    if args.command == 'counts':
+        rows = store.object_counts()
+        label_width = max(len(label) for label, _, _ in rows)
+        print(f"{'Version':<{label_width}}  {'Objects':>7}  " +
+              '  '.join(f"{kind:>7}" for kind in KINDS))
+        for label, count, by_kind in rows:
+            print(f"{label:<{label_width}}  {count:>7}  " +
+                  '  '.join(f"{by_kind[kind]:>7}" for kind in KINDS))
+    else:
+        found = changes(store.field_history(args.nickname, args.field))
+        if not found:
+            print(f"{args.nickname}: {args.field} never changed")
+        for label, old, new in found:
+            print(f"{label}: {args.field} {_format(old)} -> {_format(new)}")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+DBR Asset Coverage Report
+=========================
+
+Links the .unity3d bundles in the checkout to the saves that use them.
+
+The bundle inventory comes from the bundle manifest (persisted, rescanned
+only when a bundle's size or mtime changes) and is indexed by path, by
+full-file SHA-256 and by URL-mangled file name. Bundle URLs come from
+the archive analytics store, so each save is parsed at most once per
+change. Joining the two yields:
+
+- used: bundles a raw GitHub URL resolves to
+- mangled only: URLs whose real file is missing but whose URL-mangled
+  copy (httpsrawgithubusercontentcom...unity3d) exists - TTS caches the
+  copy, GitHub still 404s
+- missing: URLs with no local file under either name
+- unused: bundles none of the given saves reference; those with the same
+  SHA-256 as a referenced bundle are flagged as byte-identical copies
+  (prune candidates - saves outside the scanned set may still use them)
+
+Usage:
+    python asset_coverage.py
+    python asset_coverage.py --unused DBR_TTS_Assets/*_v4.5_*.json
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+from archive_analytics import DEFAULT_PATHS, DEFAULT_STORE_DIR, ArchiveStore
+from batch_validate import expand_paths
+from bundle_manifest import (BUNDLE_EXTENSION, DEFAULT_MANIFEST, MANGLED_PREFIX, RAW_URL_PREFIX,
+                             REPO_ROOT, BundleManifest)
+from test_framework import Color
+from url_resolver import mangled_name
+
+
+class BundleInventory:
+    """Bundle manifest entries indexed by path, content hash and mangled name"""
+
+    def __init__(self, root: str = REPO_ROOT, manifest_path: str = DEFAULT_MANIFEST):
+        self.manifest = BundleManifest(root, manifest_path)
+        self.scanned, self.reused = self.manifest.refresh()
+        self.bundles = self.manifest.bundles
+        self.by_hash: Dict[str, List[str]] = {}
+        self.by_mangled: Dict[str, str] = {}
+        for rel_path in sorted(self.bundles):
+            self.by_hash.setdefault(self.content_hash(rel_path), []).append(rel_path)
+            name = os.path.basename(rel_path)
+            if name.startswith(MANGLED_PREFIX):
+                self.by_mangled.setdefault(name, rel_path)
+
+    def content_hash(self, rel_path: str) -> str:
+        """SHA-256 of a bundle's bytes (not the layout fingerprint, which
+        bundles built alike share even when their contents differ)"""
+        return self.bundles[rel_path]['sha256']
+
+    def twins(self, rel_path: str) -> List[str]:
+        """Other bundles with byte-identical content"""
+        return [p for p in self.by_hash[self.content_hash(rel_path)] if p != rel_path]
+
+
+def bundle_references(store: ArchiveStore) -> Dict[str, Set[str]]:
+    """Bundle URL -> labels of the saves referencing it, from the store's columns"""
+    saves, urls = store.columns.get('save'), store.columns.get('url')
+    if not saves:
+        return {}
+    by_url_id: Dict[int, Set[int]] = {}
+    for save, url_id in zip(saves, urls):
+        if url_id:
+            by_url_id.setdefault(url_id, set()).add(save)
+
+    references = {}
+    for url_id, numbers in by_url_id.items():
+        url = store.strings[url_id]
+        if url.split('?', 1)[0].endswith(BUNDLE_EXTENSION):
+            references[url] = {store.saves[n]['label'] for n in numbers}
+    return references
+
+
+class Coverage:
+    """Join of an inventory against the bundle URLs of a set of saves"""
+
+    def __init__(self, inventory: BundleInventory, references: Dict[str, Set[str]]):
+        self.inventory = inventory
+        self.used: Dict[str, Set[str]] = {}              # bundle -> saves
+        self.mangled_only: Dict[str, str] = {}           # url -> mangled bundle
+        self.missing: Dict[str, Set[str]] = {}           # url -> saves
+        self.external: Dict[str, Set[str]] = {}          # url -> saves
+        self.references = references
+
+        for url, saves in references.items():
+            rel_path = self.inventory.manifest.resolve_url(url)
+            if rel_path is None:
+                self.external[url] = saves
+            elif rel_path in inventory.bundles:
+                self.used.setdefault(rel_path, set()).update(saves)
+            else:
+                mangled = inventory.by_mangled.get(mangled_name(url))
+                if mangled:
+                    self.mangled_only[url] = mangled
+                    self.used.setdefault(mangled, set()).update(saves)
+                else:
+                    self.missing[url] = saves
+
+        self.unused = sorted(p for p in inventory.bundles if p not in self.used)
+
+    def duplicate_of(self, rel_path: str) -> Optional[str]:
+        """A referenced bundle byte-identical to rel_path, if any"""
+        for twin in self.inventory.twins(rel_path):
+            if twin in self.used:
+                return twin
+        return None
+
+    def broken(self) -> Dict[str, List[str]]:
+        """Referenced bundles whose headers are malformed -> their problems"""
+        return {p: self.inventory.bundles[p]['problems'] for p in sorted(self.used)
+                if self.inventory.bundles[p]['problems']}
+
+
+def _saves_note(saves: Set[str], limit: int = 3) -> str:
+    labels = sorted(saves)
+    note = ', '.join(labels[:limit])
+    if len(labels) > limit:
+        note += f" (+{len(labels) - limit} more)"
+    return note
+
+
+def print_report(coverage: Coverage, save_count: int, show_unused: bool = False):
+    inventory = coverage.inventory
+    duplicates = {p: coverage.duplicate_of(p) for p in coverage.unused}
+    prunable = [p for p, twin in duplicates.items() if twin]
+
+    print(f"\n{Color.BOLD}{'='*70}{Color.END}")
+    print(f"{Color.BOLD}ASSET COVERAGE{Color.END}")
+    print(f"{Color.BOLD}{'='*70}{Color.END}")
+    print(f"Saves:        {save_count} ({len(coverage.references)} unique bundle URLs)")
+    print(f"Bundles:      {len(inventory.bundles)} in {len(inventory.by_hash)} content groups")
+    print(f"Used:         {len(coverage.used)}")
+    print(f"Mangled only: {len(coverage.mangled_only)}")
+    print(f"Missing:      {len(coverage.missing)}")
+    print(f"Unused:       {len(coverage.unused)} ({len(prunable)} byte-identical to used bundles)")
+    if coverage.external:
+        print(f"External:     {len(coverage.external)} URLs not served from this repository")
+
+    for rel_path, problems in coverage.broken().items():
+        print(f"{Color.RED}✗ Malformed but referenced: {rel_path}: {'; '.join(problems)}{Color.END}")
+
+    if coverage.missing:
+        print(f"\n{Color.RED}{Color.BOLD}MISSING ({len(coverage.missing)}):{Color.END}")
+        for url, saves in sorted(coverage.missing.items()):
+            print(f"{Color.RED}✗ {url[len(RAW_URL_PREFIX):]} - {_saves_note(saves)}{Color.END}")
+
+    if coverage.mangled_only:
+        print(f"\n{Color.YELLOW}{Color.BOLD}MANGLED ONLY ({len(coverage.mangled_only)}):{Color.END}")
+        for url, mangled in sorted(coverage.mangled_only.items()):
+            print(f"{Color.YELLOW}⚠ {url[len(RAW_URL_PREFIX):]} only exists as {mangled}{Color.END}")
+
+    if show_unused and coverage.unused:
+        print(f"\n{Color.BOLD}UNUSED ({len(coverage.unused)}):{Color.END}")
+        for rel_path in coverage.unused:
+            twin = duplicates[rel_path]
+            print(f"  - {rel_path}" + (f" (same bytes as {twin})" if twin else ''))
+
+    if not coverage.missing and not coverage.mangled_only:
+        print(f"\n{Color.GREEN}✓ Every bundle URL maps to a local bundle{Color.END}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Report which local bundles saves use, miss or leave unused")
+    parser.add_argument('paths', nargs='*', help="Saves, directories or globs (default: the archive)")
+    parser.add_argument('--unused', action='store_true', help="List every unused bundle")
+    parser.add_argument('--root', default=REPO_ROOT, help="Repository checkout to scan")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="Bundle manifest index file")
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR, help="Archive columnar store directory")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Worker processes for parsing changed saves (default: one per CPU core)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = expand_paths(args.paths or list(DEFAULT_PATHS))
+    if not paths:
+        print(f"{Color.RED}✗ No save files matched{Color.END}")
+        sys.exit(1)
+
+    inventory = BundleInventory(args.root, args.manifest)
+    store = ArchiveStore(args.store_dir)
+    parsed, reused = store.refresh(paths, args.jobs)
+    coverage = Coverage(inventory, bundle_references(store))
+    store.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{Color.BLUE}{len(paths)} saves: {parsed} parsed, {reused} from the store; "
+          f"{inventory.scanned} bundles scanned, {inventory.reused} unchanged "
+          f"({elapsed:.2f}s){Color.END}")
+    print_report(coverage, len(paths), args.unused)
+    print()
+    sys.exit(1 if coverage.missing else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Save Auto-Fixer
+=======================
+
+Applies deterministic corrections for the failures we otherwise fix by
+hand, writes them to a new timestamped save and re-validates it:
+
+- tables drifting from EXPECTED_*_TABLE are moved/rescaled back (and the
+  main table locked)
+- loose units and tools off UNIT_SCALE are rescaled uniformly
+- loose units outside RIGHT_TABLE_BOUNDS are re-gridded into free slots
+  of the right side table's unit grid
+- terrain outside its DBR_TERRAIN_SIZES range is rescaled uniformly to
+  the nearest allowed size
+
+Corrections are planned from the framework's slim index, keyed by each
+object's walk order. The save is then streamed a second time: every
+top-level member and every ObjectStates entry is patched and written out
+as soon as it is decoded, so no second copy of the save is built in
+memory. The output is formatted like the saves we generate (indent=2).
+
+Usage:
+    python autofix.py DBR_Scots_Common_Early_Tudor_English.json
+    python autofix.py --dry-run --rules other_army.json save.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from test_framework import (Color, IndexedObject, TTSTestFramework, iter_save_stream,
+                            load_rules, walk_objects)
+
+# Unit grid on the right side table, as laid out by the save generator
+UNIT_GRID_COLUMNS = (35.0, 38.0, 42.0, 45.0)
+UNIT_GRID_ROW_START = -18.0
+UNIT_GRID_ROW_STEP = 2.0
+
+# A grid slot is taken when a unit already sits this close to it
+SLOT_RADIUS = 1.0
+
+# Trailing _YYYYmmdd_HHMMSS of generated save names
+FILENAME_STAMP = re.compile(r'_\d{8}_\d{6}$')
+SAVENAME_STAMP = re.compile(r' - \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+
+
+class FixPlan:
+    """Corrections keyed by object walk order (IndexedObject.order)"""
+
+    def __init__(self):
+        self.patches: Dict[int, Dict[str, Any]] = {}
+        self.descriptions: List[str] = []
+        self.unfixable: List[str] = []
+
+    def __len__(self):
+        return len(self.descriptions)
+
+    def add(self, entry: IndexedObject, description: str, transform: Optional[Dict] = None,
+            **fields):
+        patch = self.patches.setdefault(entry.order, {})
+        if transform:
+            patch.setdefault('Transform', {}).update(transform)
+        patch.update(fields)
+        self.descriptions.append(f"{entry.nickname or entry.name}: {description}")
+
+    def apply(self, entry: IndexedObject):
+        """Patch an object of the streamed save in place"""
+        patch = self.patches.get(entry.order)
+        if not patch:
+            return
+        for key, value in patch.items():
+            if key == 'Transform':
+                entry.data.setdefault('Transform', {}).update(value)
+            else:
+                entry.data[key] = value
+
+
+def _uniform_scale(transform: Dict, scale: float) -> Dict:
+    """scaleX/Y/Z rescaled so scaleX becomes `scale`, keeping proportions"""
+    current = transform.get('scaleX', 0)
+    if not current:
+        return {'scaleX': scale, 'scaleY': scale, 'scaleZ': scale}
+    ratio = scale / current
+    return {axis: transform.get(axis, current) * ratio for axis in ('scaleX', 'scaleY', 'scaleZ')}
+
+
+def plan_fixes(framework: TTSTestFramework) -> FixPlan:
+    """Corrections for a loaded framework, using its (possibly overridden) rules"""
+    plan = FixPlan()
+    index = framework.index
+
+    expected_tables = {
+        'main': framework.EXPECTED_MAIN_TABLE,
+        'left': framework.EXPECTED_LEFT_TABLE,
+        'right': framework.EXPECTED_RIGHT_TABLE,
+    }
+    for side, table in index.tables.items():
+        if table is None:
+            plan.unfixable.append(f"{side.title()} table not found")
+            continue
+        expected = expected_tables[side]
+        wanted = {f'pos{axis.upper()}': v for axis, v in expected['position'].items()}
+        wanted.update({f'scale{axis.upper()}': v for axis, v in expected['scale'].items()})
+        if any(abs(table.transform.get(field, 0) - value) > 0.1 for field, value in wanted.items()):
+            plan.add(table, "table transform reset", wanted)
+        if side == 'main' and not table.data.get('Locked', False):
+            plan.add(table, "locked", Locked=True)
+
+    # Loose units and tools share the 40mm base scale, as do their States variants
+    units = index.of_kind('unit', 'tool', loose_only=True) + index.variants_of_kind('unit', 'tool')
+    for unit in sorted(units, key=lambda entry: entry.order):
+        scale = unit.transform.get('scaleX', 0)
+        if abs(scale - framework.UNIT_SCALE) > framework.UNIT_SCALE_TOLERANCE:
+            plan.add(unit, f"scale {scale:.4f} -> {framework.UNIT_SCALE}",
+                     _uniform_scale(unit.transform, framework.UNIT_SCALE))
+
+    _plan_unit_grid(framework, plan)
+
+    for terrain in index.of_kind('terrain'):
+        key = framework.terrain_matcher.resolve(terrain.nickname)
+        if not key:
+            continue
+        base_size = framework.TERRAIN_BASE_SIZES.get(key, framework.TERRAIN_BASE_SIZES['default'])
+        rules = framework.DBR_TERRAIN_SIZES[key]
+        scale = terrain.transform.get('scaleX', 0)
+        size = scale * base_size / 100.0
+        target = min(max(size, rules['min']), rules['max'])
+        if target != size:
+            new_scale = target * 100.0 / base_size
+            plan.add(terrain, f"{size:.2f}ft -> {target:.2f}ft (scale {scale:.3f} -> {new_scale:.3f})",
+                     _uniform_scale(terrain.transform, new_scale))
+    return plan
+
+
+def _plan_unit_grid(framework: TTSTestFramework, plan: FixPlan):
+    """Move loose units that are off the right table into free grid slots, in save order"""
+    bounds = framework.RIGHT_TABLE_BOUNDS
+    on_table: List[Tuple[float, float]] = []
+    off_table: List[IndexedObject] = []
+    for unit in framework.index.of_kind('unit', loose_only=True):
+        t = unit.world_transform
+        x, y, z = t.get('posX', 0), t.get('posY', 0), t.get('posZ', 0)
+        if (bounds['x_min'] <= x <= bounds['x_max'] and bounds['z_min'] <= z <= bounds['z_max']
+                and abs(y - bounds['y']) < 0.5):
+            on_table.append((x, z))
+        else:
+            off_table.append(unit)
+    if not off_table:
+        return
+
+    def free_slots():
+        z = UNIT_GRID_ROW_START
+        while z <= bounds['z_max']:
+            for x in UNIT_GRID_COLUMNS:
+                if all(abs(x - ux) > SLOT_RADIUS or abs(z - uz) > SLOT_RADIUS for ux, uz in on_table):
+                    yield x, z
+            z += UNIT_GRID_ROW_STEP
+
+    slots = free_slots()
+    for unit in off_table:
+        slot = next(slots, None)
+        if slot is None:
+            plan.unfixable.append(f"No free grid slot for {unit.nickname} on the right table")
+            continue
+        x, z = slot
+        t = unit.transform
+        plan.add(unit, f"({t.get('posX', 0):.1f}, {t.get('posY', 0):.1f}, {t.get('posZ', 0):.1f}) "
+                       f"-> ({x:.1f}, {bounds['y']:.1f}, {z:.1f})",
+                 {'posX': x, 'posY': bounds['y'], 'posZ': z})
+
+
+def fixed_path(save_path: str, now: Optional[datetime] = None) -> str:
+    """Sibling path with a fresh _YYYYmmdd_HHMMSS stamp"""
+    stem, extension = os.path.splitext(save_path)
+    stamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    return f"{FILENAME_STAMP.sub('', stem)}_{stamp}{extension or '.json'}"
+
+
+def _dump(value: Any, level: int) -> str:
+    """json.dumps(indent=2) text for a value nested `level` deep"""
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * level)
+
+
+def write_fixed(save_path: str, out: TextIO, plan: FixPlan, save_name: Optional[str] = None):
+    """Stream save_path to out, patching objects from the plan as they pass.
+
+    Output matches json.dump(save, indent=2). Objects are walked in the
+    same order as the index the plan was made from.
+    """
+    order = 0
+    state = 'start'  # 'start', 'members' or 'objects' (inside ObjectStates)
+    for key, value in iter_save_stream(save_path):
+        if key == 'ObjectStates' and isinstance(value, dict):
+            for entry in walk_objects((value,), order):
+                plan.apply(entry)
+                order += 1
+            if state != 'objects':
+                out.write('{\n  ' if state == 'start' else ',\n  ')
+                out.write('"ObjectStates": [\n    ')
+                state = 'objects'
+            else:
+                out.write(',\n    ')
+            out.write(_dump(value, 2))
+            continue
+
+        if key == 'SaveName' and save_name is not None:
+            value = save_name
+        if state == 'objects':
+            out.write('\n  ]')
+        out.write('{\n  ' if state == 'start' else ',\n  ')
+        out.write(f"{json.dumps(key)}: {_dump(value, 1)}")
+        state = 'members'
+
+    if state == 'objects':
+        out.write('\n  ]')
+    out.write('{}' if state == 'start' else '\n}')
+
+
+def restamp_save_name(save_name: str, now: datetime) -> str:
+    stamp = now.strftime('%Y-%m-%d %H:%M:%S')
+    if SAVENAME_STAMP.search(save_name):
+        return SAVENAME_STAMP.sub(f' - {stamp}', save_name)
+    return f"{save_name} - {stamp}" if save_name else save_name
+
+
+def _run_quietly(framework: TTSTestFramework) -> bool:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return framework.run_all_tests()
+
+
+def fix_save(save_path: str, rules: Optional[Dict] = None, only: Optional[Iterable[str]] = None,
+             output: Optional[str] = None, dry_run: bool = False) -> bool:
+    """Fix one save and re-validate the result; returns whether it passes"""
+    # Plan against every check: a narrowed selection slims the index down to
+    # fields the planner still reads (e.g. 'Locked'). Both --only and the rule
+    # set's "checks" list only narrow re-validation.
+    planning_rules = {name: value for name, value in (rules or {}).items() if name != 'checks'}
+    framework = TTSTestFramework(save_path, streaming=True, rules=planning_rules)
+    _run_quietly(framework)
+    name = os.path.basename(save_path)
+    if not framework.index:
+        print(f"{Color.RED}✗ {name}: {framework.errors[0]}{Color.END}")
+        return False
+
+    plan = plan_fixes(framework)
+    print(f"{Color.BOLD}{name}: {len(framework.errors)} errors, "
+          f"{len(plan)} corrections{Color.END}")
+    for description in plan.descriptions:
+        print(f"  - {description}")
+    for problem in plan.unfixable:
+        print(f"{Color.YELLOW}⚠ {problem}{Color.END}")
+
+    if dry_run:
+        return not framework.errors
+    if not plan.descriptions:
+        print(f"{Color.GREEN}✓ Nothing to fix{Color.END}")
+        return not framework.errors
+
+    now = datetime.now()
+    target = output or fixed_path(save_path, now)
+    save_name = restamp_save_name(framework.save_data.get('SaveName', ''), now)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            write_fixed(save_path, f, plan, save_name)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    print(f"{Color.BLUE}Wrote {target}{Color.END}")
+
+    fixed = TTSTestFramework(target, streaming=True, rules=rules, only=only)
+    passed = _run_quietly(fixed)
+    if passed:
+        print(f"{Color.GREEN}✓ Re-validated: passed, {len(fixed.warnings)} warnings{Color.END}")
+    else:
+        print(f"{Color.RED}✗ Re-validated: {len(fixed.errors)} errors remain{Color.END}")
+        for error in fixed.errors:
+            print(f"{Color.RED}  {error}{Color.END}")
+    return passed
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Fix common DBR TTS save failures")
+    parser.add_argument('save_file', help="Save file to fix")
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help="Write here instead of a new timestamped sibling")
+    parser.add_argument('--dry-run', action='store_true', help="List corrections without writing")
+    parser.add_argument('--rules', metavar='FILE',
+                        help="JSON rule set overriding the built-in rule constants")
+    parser.add_argument('--only', metavar='CHECK', action='append',
+                        help="Re-validate only checks with this name or tag (repeatable)")
+    args = parser.parse_args()
+
+    try:
+        rules = load_rules(args.rules) if args.rules else None
+        passed = fix_save(args.save_file, rules, args.only, args.output, args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"{Color.RED}✗ {e}{Color.END}")
+        sys.exit(1)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
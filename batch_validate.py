@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Batch Validator
+=======================
+
+Runs the TTS save file test framework over many saves at once:
+files, directories and glob patterns are expanded, each save is
+validated in its own worker process, and an aggregated pass/fail
+table is printed at the end.
+
+Usage:
+    python batch_validate.py DBR_TTS_Assets TTS_Saves "DBR_*.json"
+    python batch_validate.py --jobs 4 DBR_TTS_Assets/*_v4.*.json
+"""
+
+import argparse
+import contextlib
+import functools
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from report_formats import save_record, write_jsonl, write_junit
+from result_cache import DEFAULT_CACHE_DIR, ResultCache
+from test_framework import Color, TTSTestFramework, load_rules
+from mesh_loader import get_mesh_loader
+from url_resolver import get_resolver
+
+
+def expand_paths(patterns: List[str], recursive: bool = False) -> List[str]:
+    """Expand files, directories and glob patterns into a sorted list of save files"""
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            sub = os.path.join('**', '*.json') if recursive else '*.json'
+            found.extend(glob.glob(os.path.join(pattern, sub), recursive=recursive))
+        elif os.path.isfile(pattern):
+            found.append(pattern)
+        else:
+            found.extend(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+
+    # De-duplicate while keeping a stable order
+    seen = set()
+    paths = []
+    for path in sorted(found):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            paths.append(path)
+    return paths
+
+
+def validate_file(save_file: str, streaming: bool = False, cache_dir: Optional[str] = None,
+                  trace_memory: bool = False, profile_dir: Optional[str] = None,
+                  resolve_urls: bool = False, url_server: Optional[str] = None,
+                  check_meshes: bool = False, rules: Optional[Dict] = None,
+                  only: Optional[List[str]] = None) -> Dict:
+    """Validate one save and return its results (runs inside a worker process)"""
+    start = time.perf_counter()
+    cache = ResultCache(cache_dir) if cache_dir else None
+    profile_path = None
+    if profile_dir:
+        name = os.path.splitext(os.path.basename(save_file))[0]
+        profile_path = os.path.join(profile_dir, f"{name}.prof")
+    # One memoizing resolver per worker process, shared by all its saves
+    url_resolver = get_resolver(url_server) if resolve_urls or url_server else None
+    mesh_loader = get_mesh_loader() if check_meshes else None
+    framework = TTSTestFramework(save_file, streaming=streaming, cache=cache,
+                                 trace_memory=trace_memory, profile_path=profile_path,
+                                 url_resolver=url_resolver, mesh_loader=mesh_loader,
+                                 rules=rules, only=only)
+
+    # Per-test headers are noise when many files run at once
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            passed = framework.run_all_tests()
+        except Exception as e:
+            framework.report('error', f"Framework crashed: {type(e).__name__}: {e}")
+            passed = False
+
+    result = save_record(framework)
+    result.update({
+        'passed': passed,
+        'errors': framework.errors,
+        'warnings': framework.warnings,
+        'info': framework.info,
+        'elapsed': time.perf_counter() - start,
+    })
+    return result
+
+
+def run_batch(paths: List[str], jobs: int = 0, streaming: bool = False,
+              cache_dir: Optional[str] = None, trace_memory: bool = False,
+              profile_dir: Optional[str] = None, resolve_urls: bool = False,
+              url_server: Optional[str] = None, check_meshes: bool = False,
+              rules: Optional[Dict] = None, only: Optional[List[str]] = None) -> List[Dict]:
+    """Validate every save across a process pool, returning results in input order"""
+    if not paths:
+        return []
+
+    validate = functools.partial(validate_file, streaming=streaming, cache_dir=cache_dir,
+                                 trace_memory=trace_memory, profile_dir=profile_dir,
+                                 resolve_urls=resolve_urls, url_server=url_server,
+                                 check_meshes=check_meshes, rules=rules, only=only)
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(paths))
+    if jobs == 1:
+        return [validate(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(validate, paths))
+
+
+def print_summary(results: List[Dict], show_errors: bool = False):
+    """Print the aggregated pass/fail table"""
+    print(f"\n{Color.BOLD}{'='*70}{Color.END}")
+    print(f"{Color.BOLD}DBR TTS BATCH VALIDATION ({len(results)} files){Color.END}")
+    print(f"{Color.BOLD}{'='*70}{Color.END}")
+
+    name_width = max([len(os.path.basename(r['path'])) for r in results] + [4])
+    print(f"{'File':<{name_width}}  {'Result':<6}  {'Err':>4}  {'Warn':>4}  {'Time':>7}")
+
+    for r in results:
+        name = os.path.basename(r['path'])
+        if r['passed']:
+            status = f"{Color.GREEN}PASS  {Color.END}"
+        else:
+            status = f"{Color.RED}FAIL  {Color.END}"
+        print(f"{name:<{name_width}}  {status}  {len(r['errors']):>4}  "
+              f"{len(r['warnings']):>4}  {r['elapsed']:>6.2f}s")
+
+        if show_errors and not r['passed']:
+            for error in r['errors']:
+                print(f"    {Color.RED}{error}{Color.END}")
+
+    passed = sum(1 for r in results if r['passed'])
+    failed = len(results) - passed
+
+    print(f"\n{Color.BOLD}{'='*70}{Color.END}")
+    if failed == 0:
+        print(f"{Color.GREEN}{Color.BOLD}✓ ALL {passed} FILES PASSED{Color.END}")
+    else:
+        print(f"{Color.RED}{Color.BOLD}✗ {failed} of {len(results)} FILES FAILED{Color.END}")
+    print(f"{Color.BOLD}{'='*70}{Color.END}\n")
+
+
+def print_timing_summary(results: List[Dict], slowest: int = 5):
+    """Aggregate per-check timings across files and name the slowest saves"""
+    phases: Dict[str, List] = {}
+    for r in results:
+        for phase, t in r.get('timings', {}).items():
+            phases.setdefault(phase, []).append((t, r['path']))
+
+    print(f"{Color.BOLD}TIMINGS ACROSS {len(results)} FILES{Color.END}")
+    if not phases:
+        print("  (all results replayed from cache, nothing was measured)\n")
+        return
+
+    memory = any('peak_kb' in t for entries in phases.values() for t, _ in entries)
+    print(f"  {'Phase':<26} {'Total ms':>9} {'Mean ms':>8} {'Max ms':>8} {'CPU ms':>9}"
+          + (f" {'Peak KB':>8}" if memory else "") + "  Slowest file")
+    for phase, entries in phases.items():
+        walls = [t['wall'] for t, _ in entries]
+        worst_t, worst_path = max(entries, key=lambda e: e[0]['wall'])
+        cpu = sum(t['cpu'] for t, _ in entries)
+        peak = max(t.get('peak_kb', 0) for t, _ in entries)
+        print(f"  {phase:<26} {sum(walls) * 1000:>9.1f} {sum(walls) / len(walls) * 1000:>8.2f} "
+              f"{worst_t['wall'] * 1000:>8.2f} {cpu * 1000:>9.1f}"
+              + (f" {peak:>8.0f}" if memory else "")
+              + f"  {os.path.basename(worst_path)}")
+
+    measured = [r for r in results if r.get('timings')]
+    measured.sort(key=lambda r: sum(t['wall'] for t in r['timings'].values()), reverse=True)
+    print("\n  Slowest saves (checks + load):")
+    for r in measured[:slowest]:
+        total = sum(t['wall'] for t in r['timings'].values())
+        objects = r['timings'].get('load', {}).get('objects', 0)
+        print(f"  {total * 1000:>9.1f} ms  {objects:>6} objects  {os.path.basename(r['path'])}")
+    print()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Validate many DBR TTS save files in parallel")
+    parser.add_argument('paths', nargs='+', help="Save files, directories or glob patterns")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Worker processes (default: one per CPU core)")
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help="Search directories recursively")
+    parser.add_argument('-e', '--show-errors', action='store_true',
+                        help="List the errors of each failing file")
+    parser.add_argument('--stream', action='store_true',
+                        help="Parse ObjectStates incrementally (bounded memory per worker)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Revalidate every file, ignoring cached results")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="Result cache directory")
+    parser.add_argument('--jsonl', metavar='FILE',
+                        help="Write every finding as JSON Lines ('-' for stdout, skips the table)")
+    parser.add_argument('--junit', metavar='FILE', help="Write a JUnit XML report")
+    parser.add_argument('--timings', action='store_true',
+                        help="Aggregate per-check timings across files (implies --no-cache)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Also record peak memory per check with tracemalloc (slower)")
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help="Dump cProfile stats per save into DIR")
+    parser.add_argument('--resolve-urls', action='store_true',
+                        help="Check GitHub URLs resolve to files in the local checkout")
+    parser.add_argument('--url-server', metavar='URL',
+                        help="Resolve GitHub URLs with HEAD requests against this HTTP stand-in")
+    parser.add_argument('--check-meshes', action='store_true',
+                        help="Measure the main table mesh from the local checkout")
+    parser.add_argument('--only', metavar='CHECK', action='append',
+                        help="Run only checks with this name or tag (repeatable)")
+    parser.add_argument('--rules', metavar='FILE',
+                        help="JSON rule set overriding the built-in rule constants")
+    args = parser.parse_args()
+
+    paths = expand_paths(args.paths, args.recursive)
+    if not paths:
+        print(f"{Color.RED}✗ No save files matched: {' '.join(args.paths)}{Color.END}")
+        sys.exit(1)
+
+    # Reject bad rule sets and selectors before starting any workers
+    try:
+        rules = load_rules(args.rules) if args.rules else None
+        TTSTestFramework(paths[0], rules=rules, only=args.only)
+    except (OSError, ValueError) as e:
+        print(f"{Color.RED}✗ {e}{Color.END}")
+        sys.exit(1)
+
+    # Measuring needs real runs, and resolution and meshes depend on files
+    # outside the saves, so none of them may be replayed from the cache
+    measuring = args.timings or args.trace_memory or args.profile_dir
+    resolving = args.resolve_urls or args.url_server or args.check_meshes
+    cache_dir = None if args.no_cache or measuring or resolving else args.cache_dir
+    if args.profile_dir:
+        os.makedirs(args.profile_dir, exist_ok=True)
+    results = run_batch(paths, args.jobs, args.stream, cache_dir,
+                        args.trace_memory, args.profile_dir, args.resolve_urls, args.url_server,
+                        args.check_meshes, rules, args.only)
+    if args.junit:
+        write_junit(results, args.junit)
+    if args.jsonl == '-':
+        write_jsonl(results, sys.stdout)
+    else:
+        if args.jsonl:
+            with open(args.jsonl, 'w', encoding='utf-8') as f:
+                write_jsonl(results, f)
+        print_summary(results, args.show_errors)
+        if measuring:
+            print_timing_summary(results)
+
+    sys.exit(0 if all(r['passed'] for r in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Framework Benchmark
+===========================
+
+Measures how the test framework scales beyond the ~100 KB sample saves.
+
+Synthetic saves are generated in the shape of ours: the main grass
+table and the two side tables, Custom_AssetBundle units at UNIT_SCALE
+laid out in rows from the right-hand table, and terrain pieces inside
+"Terrain Collection" bags (optionally nested to a given depth). Each
+save is loaded and every test_* method is timed via the framework's
+own instrumentation; the best of several repeats is kept.
+
+Results are compared against a JSON baseline and phases that got
+slower than the threshold are flagged as regressions.
+
+Usage:
+    python benchmark.py                          # 1k/10k/100k objects
+    python benchmark.py --sizes 1000 5000 --depths 1 3 --repeat 5
+    python benchmark.py --save-baseline          # record a new baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List
+
+from test_framework import Color, TTSTestFramework
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmark_baseline.json')
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_DEPTHS = (1,)
+
+# A phase is a regression when this much slower than baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and slower by more than this many seconds (timer noise floor)
+NOISE_FLOOR = 0.002
+
+ASSET_URL = 'https://raw.githubusercontent.com/krumphau/DBR_assets/main/{}.unity3d'
+
+UNIT_NAMES = (
+    'Burgundian Man At Arms', 'French Pike', 'Landsknecht Arquebusier Shot',
+    'Scots Pike', 'English Longbow', 'Italian Stradiots', 'Spanish Neapolitan Jinete',
+)
+TERRAIN_NAMES = (
+    'Terrain Bua Small', 'Terrain Wood Medium', 'Terrain Marsh Large',
+    'Terrain Hill Gentle Small', 'Terrain River Straight Medium', 'Terrain Road Curved Small',
+    'Terrain Enclosure Medium', 'Terrain Fortification Bastion Large',
+)
+
+# Fraction of generated objects that are terrain (the rest are units)
+TERRAIN_FRACTION = 0.25
+# Unit rows are laid out this far apart, in TTS units (inches)
+UNIT_SPACING_X = 1.7
+UNIT_SPACING_Z = 0.9
+UNITS_PER_ROW = 12
+
+
+def _transform(x: float, y: float, z: float, scale: float, rot_y: float = 0.0) -> Dict:
+    return {
+        'posX': x, 'posY': y, 'posZ': z,
+        'rotX': 0.0, 'rotY': rot_y, 'rotZ': 0.0,
+        'scaleX': scale, 'scaleY': scale, 'scaleZ': scale,
+    }
+
+
+def _object(name: str, nickname: str, transform: Dict, **extra) -> Dict:
+    obj = {
+        'Name': name,
+        'Transform': transform,
+        'Nickname': nickname,
+        'Description': '',
+        'GMNotes': '',
+        'ColorDiffuse': {'r': 1.0, 'g': 1.0, 'b': 1.0},
+        'Locked': False,
+        'Grid': True,
+        'Snap': True,
+        'Autoraise': True,
+        'Sticky': True,
+        'Tooltip': True,
+        'GridProjection': False,
+        'HideWhenFaceDown': False,
+        'Hands': False,
+    }
+    obj.update(extra)
+    obj.update({'LuaScript': '', 'LuaScriptState': '', 'XmlUI': ''})
+    return obj
+
+
+def _asset_bundle(nickname: str, transform: Dict, guid: str) -> Dict:
+    file_name = nickname.lower().replace(' ', '_')
+    return _object('Custom_AssetBundle', nickname, transform, GUID=guid, CustomAssetbundle={
+        'AssetbundleURL': ASSET_URL.format(file_name),
+        'AssetbundleSecondaryURL': '',
+        'MaterialIndex': 0,
+        'TypeIndex': 0,
+        'LoopingEffectIndex': 0,
+    })
+
+
+def _tables(framework: TTSTestFramework) -> List[Dict]:
+    main, left, right = (framework.EXPECTED_MAIN_TABLE, framework.EXPECTED_LEFT_TABLE,
+                         framework.EXPECTED_RIGHT_TABLE)
+    tables = []
+    for expected, nickname in ((main, 'Main Gaming Table - 6x4 feet'),
+                               (left, 'Side Table - Left (Terrain)'),
+                               (right, 'Side Table - Right (Units)')):
+        pos, scale = expected['position'], expected['scale']
+        transform = _transform(pos['x'], pos['y'], pos['z'], 1.0)
+        transform.update({'scaleX': scale['x'], 'scaleY': scale['y'], 'scaleZ': scale['z']})
+        extra = {}
+        if expected['name'] == 'Custom_Model':
+            extra['CustomMesh'] = {
+                'MeshURL': 'https://raw.githubusercontent.com/krumphau/DBR_assets/main/grass_table_6x4.obj',
+                'DiffuseURL': 'https://raw.githubusercontent.com/krumphau/DBR_assets/main/grass_texture.png',
+                'NormalURL': '', 'ColliderURL': '', 'Convex': True,
+                'MaterialIndex': 0, 'TypeIndex': 0,
+            }
+        table = _object(expected['name'], nickname, transform, **extra)
+        table['Locked'] = True
+        tables.append(table)
+    return tables
+
+
+def generate_save(objects: int, bag_depth: int = 1, seed: int = 0) -> Dict:
+    """A synthetic save with roughly `objects` objects shaped like the DBR saves.
+
+    Terrain goes into a "Terrain Collection" bag; with bag_depth > 1 each
+    bag holds part of the terrain plus the next bag down.
+    """
+    rng = random.Random(seed)
+    framework = TTSTestFramework('')
+    bounds = framework.RIGHT_TABLE_BOUNDS
+    states = _tables(framework)
+
+    terrain_count = int(objects * TERRAIN_FRACTION)
+    unit_count = max(objects - terrain_count - len(states) - bag_depth, 0)
+
+    for i in range(unit_count):
+        row, col = divmod(i, UNITS_PER_ROW)
+        transform = _transform(bounds['x_min'] + 1 + col * UNIT_SPACING_X, bounds['y'],
+                               bounds['z_min'] + 1 + row * UNIT_SPACING_Z,
+                               framework.UNIT_SCALE, 180.0)
+        states.append(_asset_bundle(rng.choice(UNIT_NAMES), transform, f"u{i:06x}"))
+
+    # Terrain split evenly across the nested bags
+    terrain = []
+    for i in range(terrain_count):
+        name = rng.choice(TERRAIN_NAMES)
+        key = framework.terrain_matcher.resolve(name)
+        rules = framework.DBR_TERRAIN_SIZES.get(key, {'typical': 1.0})
+        base = framework.TERRAIN_BASE_SIZES.get(key, framework.TERRAIN_BASE_SIZES['default'])
+        scale = rules['typical'] * 100.0 / base
+        terrain.append(_asset_bundle(name, _transform(0.0, 0.0, 0.0, scale), f"t{i:06x}"))
+
+    depth = max(bag_depth, 1)
+    per_bag = -(-len(terrain) // depth) if terrain else 0
+    inner = None
+    for level in reversed(range(depth)):
+        contents = terrain[level * per_bag:(level + 1) * per_bag]
+        if inner is not None:
+            contents.append(inner)
+        bag = _object('Bag', 'Terrain Collection', _transform(-40.0, 2.5, 0.0, 1.5),
+                      GUID=f"bag{level:03d}", Bag={'Order': 0}, ContainedObjects=contents)
+        inner = bag
+    states.append(inner)
+
+    return {
+        'SaveName': f"DBR - Synthetic Benchmark - {objects} objects - "
+                    f"{datetime(2026, 1, 1).strftime('%Y-%m-%d %H:%M:%S')}",
+        'VersionNumber': 'v14.3.1',
+        'Tags': ['DBR', '15mm', 'Renaissance'],
+        'ObjectStates': states,
+    }
+
+
+def time_save(path: str, repeat: int = 3, streaming: bool = False) -> Dict[str, float]:
+    """Best-of-`repeat` wall time per phase (load and each check)"""
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        framework = TTSTestFramework(path, streaming=streaming)
+        with contextlib.redirect_stdout(io.StringIO()):
+            framework.run_all_tests()
+        for phase, timing in framework.timings.items():
+            best[phase] = min(best.get(phase, timing['wall']), timing['wall'])
+    best['total'] = sum(best.values())
+    return best
+
+
+def run_benchmarks(sizes: List[int], depths: List[int], repeat: int,
+                   streaming: bool = False) -> Dict[str, Dict[str, float]]:
+    """Generate each save into a temp dir and time it, keyed 'objects/depth'"""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='dbr_bench_') as tmp:
+        for size in sizes:
+            for depth in depths:
+                key = f"{size}/{depth}"
+                path = os.path.join(tmp, f"bench_{size}_{depth}.json")
+                with open(path, 'w') as f:
+                    json.dump(generate_save(size, depth), f)
+                mb = os.path.getsize(path) / 1024 / 1024
+                print(f"  {key:<12} {mb:>7.1f} MB ... ", end='', flush=True)
+                results[key] = time_save(path, repeat, streaming)
+                print(f"{results[key]['total'] * 1000:.1f} ms")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """Regressions of results against the baseline, as report lines"""
+    regressions = []
+    for key, phases in results.items():
+        for phase, seconds in phases.items():
+            old = baseline.get(key, {}).get(phase)
+            if old is None:
+                continue
+            if seconds > old * (1 + threshold) and seconds - old > NOISE_FLOOR:
+                regressions.append(f"{key} {phase}: {old * 1000:.1f} ms → {seconds * 1000:.1f} ms "
+                                   f"(+{(seconds / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, float]]):
+    phases = []
+    for timings in results.values():
+        phases.extend(p for p in timings if p not in phases)
+    keys = list(results)
+
+    print(f"\n  {'Phase (ms)':<26}" + ''.join(f"{k:>14}" for k in keys))
+    for phase in phases:
+        print(f"  {phase:<26}" + ''.join(
+            f"{results[k][phase] * 1000:>14.1f}" if phase in results[k] else f"{'-':>14}" for k in keys))
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the test framework on synthetic saves")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Object counts to generate")
+    parser.add_argument('--depths', type=int, nargs='+', default=list(DEFAULT_DEPTHS),
+                        help="Terrain bag nesting depths to generate")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per save (best is kept)")
+    parser.add_argument('--stream', action='store_true', help="Benchmark the streaming loader")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Write these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown fraction that counts as a regression")
+    parser.add_argument('--generate', metavar='FILE',
+                        help="Only write a synthetic save (first --sizes/--depths value) to FILE")
+    args = parser.parse_args()
+
+    if args.generate:
+        with open(args.generate, 'w') as f:
+            json.dump(generate_save(args.sizes[0], args.depths[0]), f, indent=2)
+        print(f"Wrote {args.generate}")
+        sys.exit(0)
+
+    print(f"\n{Color.BOLD}{'='*70}{Color.END}")
+    print(f"{Color.BOLD}DBR TTS FRAMEWORK BENCHMARK{Color.END}")
+    print(f"{Color.BOLD}{'='*70}{Color.END}")
+    print("Generating and timing (objects/bag depth):")
+    results = run_benchmarks(args.sizes, args.depths, args.repeat, args.stream)
+    print_table(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'created': datetime.now().isoformat(timespec='seconds'),
+                       'streaming': args.stream, 'results': results}, f, indent=2)
+        print(f"\n{Color.GREEN}✓ Baseline written to {args.baseline}{Color.END}\n")
+        sys.exit(0)
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f"\n{Color.YELLOW}⚠ No baseline at {args.baseline} (run with --save-baseline){Color.END}\n")
+        sys.exit(0)
+
+    if baseline.get('streaming', False) != args.stream:
+        print(f"\n{Color.YELLOW}⚠ Baseline was recorded with streaming={baseline.get('streaming')}{Color.END}")
+
+    regressions = compare(results, baseline['results'], args.threshold)
+    if regressions:
+        print(f"\n{Color.RED}{Color.BOLD}REGRESSIONS ({len(regressions)}):{Color.END}")
+        for line in regressions:
+            print(f"{Color.RED}✗ {line}{Color.END}")
+        print()
+        sys.exit(1)
+    print(f"\n{Color.GREEN}✓ No regressions against {os.path.basename(args.baseline)}{Color.END}\n")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
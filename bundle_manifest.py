@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+DBR Unity AssetBundle Manifest
+==============================
+
+Scans the repo's .unity3d AssetBundles without decompressing their
+payloads: each bundle is memory-mapped and only the UnityFS header and
+the (small, LZ4/LZMA-compressed) block-info table are decoded. From those
+we record the signature, format and Unity versions, declared and actual
+sizes, block and node layout and a layout fingerprint, and flag bundles
+that are truncated or malformed. The whole file is also hashed (sha256),
+which is the only field that identifies a bundle's content: bundles built
+the same way share a layout fingerprint even when their bytes differ.
+
+Results are persisted to a manifest index and only re-scanned (and
+re-hashed) when a bundle's size or mtime changes. The manifest can then check that every
+CustomAssetbundle.AssetbundleURL in a save points at a real, well-formed
+bundle in the local checkout - the offline way to find the GitHub 404s
+described in ORGANIC_TERRAIN_STATUS.md.
+
+Usage:
+    python bundle_manifest.py                      # refresh and summarize
+    python bundle_manifest.py --check DBR_TTS_Assets/*_v4.5_*.json
+"""
+
+import argparse
+import hashlib
+import json
+import lzma
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from test_framework import Color, iter_save_stream, walk_objects
+
+# GitHub raw URL prefix that maps onto this checkout
+RAW_URL_PREFIX = 'https://raw.githubusercontent.com/krumphau/DBR_assets/main/'
+
+# Prefix of checkout files named after their download URL
+MANGLED_PREFIX = 'httpsrawgithubusercontentcom'
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(REPO_ROOT, '.bundle_manifest.json')
+
+BUNDLE_EXTENSION = '.unity3d'
+UNITYFS_SIGNATURE = b'UnityFS'
+
+# Bump when the manifest entry layout changes
+MANIFEST_VERSION = 2
+
+# UnityFS header flags
+FLAG_COMPRESSION_MASK = 0x3F
+FLAG_BLOCKINFO_AT_END = 0x80
+FLAG_BLOCKINFO_PADDING = 0x200
+
+COMPRESSION_NAMES = {0: 'none', 1: 'lzma', 2: 'lz4', 3: 'lz4hc'}
+
+# Directories never scanned for bundles
+SKIP_DIRS = {'.git', '__pycache__', '.venv', 'venv'}
+
+
+class BundleFormatError(ValueError):
+    """Raised when a bundle header or block-info table cannot be parsed"""
+
+
+def lz4_block_decompress(src: bytes, uncompressed_size: int) -> bytes:
+    """Decompress a raw LZ4 block (as used for UnityFS block-info tables)"""
+    dst = bytearray()
+    i = 0
+    end = len(src)
+    try:
+        while i < end:
+            token = src[i]
+            i += 1
+
+            literals = token >> 4
+            if literals == 15:
+                while True:
+                    extra = src[i]
+                    i += 1
+                    literals += extra
+                    if extra != 255:
+                        break
+            dst += src[i:i + literals]
+            i += literals
+            if i >= end:
+                break  # Last sequence has literals only
+
+            offset = src[i] | (src[i + 1] << 8)
+            i += 2
+            match = (token & 15) + 4
+            if token & 15 == 15:
+                while True:
+                    extra = src[i]
+                    i += 1
+                    match += extra
+                    if extra != 255:
+                        break
+
+            start = len(dst) - offset
+            if offset == 0 or start < 0:
+                raise BundleFormatError("LZ4 match offset out of range")
+            if offset >= match:
+                dst += dst[start:start + match]
+            else:
+                # Overlapping copy repeats the last `offset` bytes
+                for k in range(match):
+                    dst.append(dst[start + k])
+    except IndexError:
+        raise BundleFormatError("Truncated LZ4 block")
+
+    if len(dst) != uncompressed_size:
+        raise BundleFormatError(f"LZ4 block decoded to {len(dst)} bytes, expected {uncompressed_size}")
+    return bytes(dst)
+
+
+def lzma_block_decompress(src: bytes, uncompressed_size: int) -> bytes:
+    """Decompress a Unity LZMA block: 5 property bytes then a raw LZMA1 stream"""
+    if len(src) < 5:
+        raise BundleFormatError("Truncated LZMA block")
+    props = src[0]
+    lc, props = props % 9, props // 9
+    lp, pb = props % 5, props // 5
+    dict_size = struct.unpack('<I', src[1:5])[0]
+    decompressor = lzma.LZMADecompressor(
+        format=lzma.FORMAT_RAW,
+        filters=[{'id': lzma.FILTER_LZMA1, 'dict_size': dict_size, 'lc': lc, 'lp': lp, 'pb': pb}]
+    )
+    try:
+        data = decompressor.decompress(src[5:], uncompressed_size)
+    except lzma.LZMAError as e:
+        raise BundleFormatError(f"LZMA block: {e}")
+    if len(data) != uncompressed_size:
+        raise BundleFormatError(f"LZMA block decoded to {len(data)} bytes, expected {uncompressed_size}")
+    return data
+
+
+def _read_cstring(buf, pos: int, limit: int = 256) -> Tuple[str, int]:
+    end = buf.find(b'\0', pos, pos + limit)
+    if end < 0:
+        raise BundleFormatError("Unterminated header string")
+    return bytes(buf[pos:end]).decode('utf-8', 'replace'), end + 1
+
+
+def _align(pos: int, alignment: int = 16) -> int:
+    return (pos + alignment - 1) // alignment * alignment
+
+
+def scan_bundle(path: str) -> Dict:
+    """Parse a bundle's UnityFS header and block-info table via mmap.
+
+    Only the header pages and the block-info bytes are decoded; the
+    compressed asset payload is only streamed through SHA-256. Returns a
+    manifest entry with 'problems' listing anything that makes the bundle
+    unusable.
+    """
+    st = os.stat(path)
+    entry = {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'signature': None,
+        'format_version': None,
+        'unity_version': None,
+        'unity_revision': None,
+        'declared_size': None,
+        'compression': None,
+        'blocks': 0,
+        'uncompressed_size': None,
+        'nodes': [],
+        'data_hash': None,
+        'layout_fingerprint': None,
+        'sha256': hashlib.sha256().hexdigest(),
+        'problems': [],
+    }
+    if st.st_size == 0:
+        entry['problems'].append("empty file")
+        return entry
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        entry['sha256'] = hashlib.sha256(mm).hexdigest()
+        try:
+            _parse_unityfs(mm, entry)
+        except (BundleFormatError, struct.error) as e:
+            entry['problems'].append(str(e) or "malformed header")
+    return entry
+
+
+def _parse_unityfs(mm: mmap.mmap, entry: Dict):
+    size = len(mm)
+    signature, pos = _read_cstring(mm, 0, 16)
+    entry['signature'] = signature
+    if signature.encode() != UNITYFS_SIGNATURE:
+        raise BundleFormatError(f"not a UnityFS bundle (signature {signature!r})")
+
+    (entry['format_version'],) = struct.unpack_from('>I', mm, pos)
+    pos += 4
+    entry['unity_version'], pos = _read_cstring(mm, pos)
+    entry['unity_revision'], pos = _read_cstring(mm, pos)
+
+    declared_size, info_compressed, info_size, flags = struct.unpack_from('>qIII', mm, pos)
+    pos += 20
+    entry['declared_size'] = declared_size
+    if declared_size != size:
+        entry['problems'].append(f"declared size {declared_size} != file size {size}")
+
+    if entry['format_version'] >= 7:
+        pos = _align(pos)
+
+    if flags & FLAG_BLOCKINFO_AT_END:
+        info_start = size - info_compressed
+        data_start = pos
+    else:
+        info_start = pos
+        data_start = pos + info_compressed
+        if flags & FLAG_BLOCKINFO_PADDING:
+            data_start = _align(data_start)
+
+    if info_start < pos or info_start + info_compressed > size:
+        raise BundleFormatError("block-info table lies outside the file")
+
+    raw_info = mm[info_start:info_start + info_compressed]
+    compression = flags & FLAG_COMPRESSION_MASK
+    entry['compression'] = COMPRESSION_NAMES.get(compression, f"unknown({compression})")
+    if compression == 0:
+        info = raw_info
+    elif compression == 1:
+        info = lzma_block_decompress(raw_info, info_size)
+    elif compression in (2, 3):
+        info = lz4_block_decompress(raw_info, info_size)
+    else:
+        raise BundleFormatError(f"unsupported block-info compression {compression}")
+
+    # Block-info: 16-byte data hash, blocks, then directory nodes
+    data_hash = info[:16]
+    entry['data_hash'] = data_hash.hex() if any(data_hash) else None
+    (block_count,) = struct.unpack_from('>i', info, 16)
+    ipos = 20
+    compressed_total = 0
+    uncompressed_total = 0
+    for _ in range(block_count):
+        block_uncompressed, block_compressed, _block_flags = struct.unpack_from('>IIH', info, ipos)
+        ipos += 10
+        compressed_total += block_compressed
+        uncompressed_total += block_uncompressed
+    entry['blocks'] = block_count
+    entry['uncompressed_size'] = uncompressed_total
+
+    (node_count,) = struct.unpack_from('>i', info, ipos)
+    ipos += 4
+    for _ in range(node_count):
+        node_offset, node_size, _node_flags = struct.unpack_from('>qqI', info, ipos)
+        ipos += 20
+        name, ipos = _read_cstring(info, ipos, 1024)
+        entry['nodes'].append({'path': name, 'offset': node_offset, 'size': node_size})
+        if node_offset + node_size > uncompressed_total:
+            entry['problems'].append(f"node {name} extends past the bundle data")
+
+    data_end = data_start + compressed_total
+    expected_end = info_start if flags & FLAG_BLOCKINFO_AT_END else size
+    if data_end > expected_end:
+        entry['problems'].append(f"truncated: blocks need {data_end} bytes, file has {expected_end}")
+
+    # Header + block table: identical for bundles built alike (same block and
+    # node sizes), so this groups layouts, not contents - use 'sha256' for identity
+    digest = hashlib.sha256()
+    digest.update(mm[:pos])
+    digest.update(info)
+    entry['layout_fingerprint'] = digest.hexdigest()
+
+
+def find_bundles(root: str) -> List[str]:
+    """All .unity3d files under root, as sorted paths relative to it"""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if name.endswith(BUNDLE_EXTENSION):
+                found.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(found)
+
+
+class BundleManifest:
+    """Persistent index of bundle headers, keyed by path relative to the repo root"""
+
+    def __init__(self, root: str = REPO_ROOT, manifest_path: str = DEFAULT_MANIFEST):
+        self.root = root
+        self.manifest_path = manifest_path
+        self.bundles: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.bundles = data.get('bundles', {})
+
+    def save(self):
+        data = {'version': MANIFEST_VERSION, 'bundles': self.bundles}
+        directory = os.path.dirname(os.path.abspath(self.manifest_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def refresh(self) -> Tuple[int, int]:
+        """Rescan new or changed bundles and drop deleted ones.
+
+        Returns (scanned, reused) counts. Unchanged bundles cost one stat().
+        """
+        scanned = reused = 0
+        current = {}
+        for rel_path in find_bundles(self.root):
+            path = os.path.join(self.root, rel_path)
+            st = os.stat(path)
+            old = self.bundles.get(rel_path)
+            if old and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+                current[rel_path] = old
+                reused += 1
+            else:
+                current[rel_path] = scan_bundle(path)
+                scanned += 1
+        changed = scanned > 0 or set(current) != set(self.bundles)
+        self.bundles = current
+        if changed:
+            self.save()
+        return scanned, reused
+
+    def resolve_url(self, url: str) -> Optional[str]:
+        """Repo-relative path a raw GitHub URL would be served from, if it is one"""
+        if not url.startswith(RAW_URL_PREFIX):
+            return None
+        return url[len(RAW_URL_PREFIX):].split('?', 1)[0]
+
+    def check_url(self, url: str) -> Optional[str]:
+        """Problem with an AssetbundleURL, or None if it maps to a good local bundle"""
+        rel_path = self.resolve_url(url)
+        if rel_path is None:
+            return "not a raw GitHub URL for this repo"
+        entry = self.bundles.get(rel_path)
+        if entry is None:
+            return f"no bundle at {rel_path} (would 404)"
+        if entry['problems']:
+            return f"malformed bundle {rel_path}: {'; '.join(entry['problems'])}"
+        return None
+
+
+def iter_bundle_urls(save_path: str):
+    """(nickname, AssetbundleURL) for every AssetBundle in a save, at any nesting depth"""
+    for key, value in iter_save_stream(save_path):
+        if key != 'ObjectStates' or not isinstance(value, dict):
+            continue
+        for entry in walk_objects((value,)):
+            url = entry.data.get('CustomAssetbundle', {}).get('AssetbundleURL', '')
+            if url:
+                yield entry.nickname or 'Unknown', url
+
+
+def check_save(save_path: str, manifest: BundleManifest) -> List[Tuple[str, str, str]]:
+    """(nickname, url, problem) for every bundle URL in a save that would fail"""
+    problems = []
+    verdicts: Dict[str, Optional[str]] = {}
+    for nickname, url in iter_bundle_urls(save_path):
+        if url not in verdicts:
+            verdicts[url] = manifest.check_url(url)
+        if verdicts[url]:
+            problems.append((nickname, url, verdicts[url]))
+    return problems
+
+
+def print_summary(manifest: BundleManifest, scanned: int, reused: int):
+    bundles = manifest.bundles
+    bad = {path: e for path, e in bundles.items() if e['problems']}
+    total_bytes = sum(e['size'] for e in bundles.values())
+
+    print(f"\n{Color.BOLD}{'='*70}{Color.END}")
+    print(f"{Color.BOLD}ASSETBUNDLE MANIFEST{Color.END}")
+    print(f"{Color.BOLD}{'='*70}{Color.END}")
+    print(f"Bundles:  {len(bundles)} ({total_bytes / 1024 / 1024:.1f} MB)")
+    print(f"Scanned:  {scanned} new/changed, {reused} unchanged")
+    print(f"Manifest: {manifest.manifest_path}")
+
+    versions: Dict[str, int] = {}
+    for e in bundles.values():
+        key = f"UnityFS v{e['format_version']} / {e['unity_revision']} / {e['compression']}"
+        versions[key] = versions.get(key, 0) + 1
+    for key, count in sorted(versions.items()):
+        print(f"  {count:>4} × {key}")
+
+    if bad:
+        print(f"\n{Color.RED}{Color.BOLD}MALFORMED ({len(bad)}):{Color.END}")
+        for path, e in sorted(bad.items()):
+            print(f"{Color.RED}✗ {path}: {'; '.join(e['problems'])}{Color.END}")
+    else:
+        print(f"\n{Color.GREEN}✓ All bundles well-formed{Color.END}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Index AssetBundle headers and check save URLs offline")
+    parser.add_argument('--root', default=REPO_ROOT, help="Repository checkout to scan")
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help="Manifest index file")
+    parser.add_argument('--check', nargs='+', metavar='SAVE',
+                        help="Check every AssetbundleURL in these saves against the manifest")
+    args = parser.parse_args()
+
+    manifest = BundleManifest(args.root, args.manifest)
+    scanned, reused = manifest.refresh()
+    print_summary(manifest, scanned, reused)
+
+    failed = any(e['problems'] for e in manifest.bundles.values())
+    for save_path in args.check or []:
+        problems = check_save(save_path, manifest)
+        print(f"\n{Color.BOLD}{os.path.basename(save_path)}{Color.END}")
+        if not problems:
+            print(f"{Color.GREEN}✓ Every AssetbundleURL maps to a well-formed local bundle{Color.END}")
+            continue
+        failed = True
+        print(f"{Color.RED}✗ {len(problems)} unresolvable AssetbundleURLs{Color.END}")
+        for nickname, url, problem in problems:
+            print(f"{Color.RED}  - {nickname}: {problem}{Color.END}")
+
+    print()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+DBR Duplicate Bundle Report
+===========================
+
+Finds byte-identical .unity3d AssetBundles in the checkout, such as
+`landsknecht_arquebusier_shot.unity3d` and its URL-mangled twin
+`httpsrawgithubusercontentcomkrumphauDBRassetsmain...unity3d.unity3d`.
+
+Bundles are grouped by size first; only same-size candidates have their
+leading chunk hashed, and only candidates that still collide are hashed
+in full. Hashing runs in a thread pool (hashlib releases the GIL). The
+report lists each duplicate group with its canonical copy and the bytes
+reclaimable by deleting the rest, and can rewrite save AssetbundleURLs
+that point at a duplicate to the canonical name.
+
+Usage:
+    python dedup_bundles.py
+    python dedup_bundles.py --rewrite DBR_TTS_Assets/*.json
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from bundle_manifest import MANGLED_PREFIX, RAW_URL_PREFIX, REPO_ROOT, find_bundles
+from result_cache import hash_file
+from test_framework import Color
+
+# Bytes hashed per candidate before committing to a full hash
+LEADING_CHUNK_SIZE = 64 * 1024
+
+
+def hash_leading(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read(LEADING_CHUNK_SIZE)).hexdigest()
+
+
+def _regroup(groups: List[List[str]], hasher, pool: ThreadPoolExecutor,
+             root: str) -> List[List[str]]:
+    """Split each group by hasher(path), keeping only sub-groups that still collide"""
+    paths = [p for group in groups for p in group]
+    digests = dict(zip(paths, pool.map(lambda p: hasher(os.path.join(root, p)), paths)))
+
+    regrouped = []
+    for group in groups:
+        by_digest: Dict[str, List[str]] = {}
+        for path in group:
+            by_digest.setdefault(digests[path], []).append(path)
+        regrouped.extend(g for g in by_digest.values() if len(g) > 1)
+    return regrouped
+
+
+def canonical_sort_key(rel_path: str) -> Tuple:
+    """Prefer readable names, then the repo root (where URLs resolve), then short names"""
+    name = os.path.basename(rel_path)
+    return (name.startswith(MANGLED_PREFIX), rel_path.count(os.sep), len(name), rel_path)
+
+
+def find_duplicates(root: str = REPO_ROOT, jobs: int = 0) -> Tuple[List[List[str]], Dict[str, int]]:
+    """Groups of identical bundles (canonical first) and the hashing work done per stage"""
+    by_size: Dict[int, List[str]] = {}
+    for rel_path in find_bundles(root):
+        size = os.path.getsize(os.path.join(root, rel_path))
+        by_size.setdefault(size, []).append(rel_path)
+    candidates = [g for size, g in by_size.items() if len(g) > 1 and size > 0]
+
+    stats = {'bundles': sum(len(g) for g in by_size.values()),
+             'leading_hashed': sum(len(g) for g in candidates)}
+
+    with ThreadPoolExecutor(max_workers=jobs or None) as pool:
+        candidates = _regroup(candidates, hash_leading, pool, root)
+        stats['fully_hashed'] = sum(len(g) for g in candidates)
+        groups = _regroup(candidates, hash_file, pool, root)
+
+    groups = [sorted(g, key=canonical_sort_key) for g in groups]
+    groups.sort(key=lambda g: g[0])
+    return groups, stats
+
+
+def asset_name(rel_path: str) -> str:
+    """Name a bundle is known by, with URL mangling and punctuation removed"""
+    name = os.path.basename(rel_path)
+    if name.startswith(MANGLED_PREFIX):
+        name = name[len(MANGLED_PREFIX):]
+        name = name[name.index('main') + len('main'):] if 'main' in name else name
+    name = name[:-len('.unity3d')] if name.endswith('.unity3d') else name
+    name = ''.join(c for c in name.lower() if c.isalnum())
+    return name[:-len('unity3d')] if name.endswith('unity3d') else name
+
+
+def canonical_map(groups: List[List[str]]) -> Dict[str, str]:
+    """Duplicate path -> canonical copy of the same asset.
+
+    Differently named assets that merely share bytes (placeholder models)
+    stay separate so saves keep referring to the asset they meant.
+    """
+    canonical = {}
+    for group in groups:
+        targets: Dict[str, str] = {}
+        for path in group:
+            targets.setdefault(asset_name(path), path)
+        for path in group:
+            target = targets[asset_name(path)]
+            if target != path:
+                canonical[path] = target
+    return canonical
+
+
+def rewrite_save_urls(save_path: str, canonical: Dict[str, str]) -> int:
+    """Point AssetbundleURLs at canonical bundles in place; returns URLs rewritten.
+
+    URLs are replaced textually so the rest of the save is byte-for-byte
+    unchanged, and the save is replaced atomically so an interrupted
+    rewrite never leaves it truncated.
+    """
+    with open(save_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    rewritten = 0
+    for dup, target in canonical.items():
+        old_url = RAW_URL_PREFIX + dup.replace(os.sep, '/')
+        new_url = RAW_URL_PREFIX + target.replace(os.sep, '/')
+        needle = f'"{old_url}"'
+        count = text.count(needle)
+        if count:
+            text = text.replace(needle, f'"{new_url}"')
+            rewritten += count
+
+    if rewritten:
+        directory = os.path.dirname(os.path.abspath(save_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, save_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return rewritten
+
+
+def print_report(groups: List[List[str]], stats: Dict[str, int], root: str):
+    print(f"\n{Color.BOLD}{'='*70}{Color.END}")
+    print(f"{Color.BOLD}DUPLICATE BUNDLE REPORT{Color.END}")
+    print(f"{Color.BOLD}{'='*70}{Color.END}")
+    print(f"Bundles: {stats['bundles']}, leading-chunk hashed: {stats['leading_hashed']}, "
+          f"fully hashed: {stats['fully_hashed']}")
+
+    # Only copies canonical_map merges can go; same-bytes different assets stay
+    canonical = canonical_map(groups)
+    reclaimable = 0
+    for group in groups:
+        size = os.path.getsize(os.path.join(root, group[0]))
+        reclaimable += size * sum(1 for path in group if path in canonical)
+        print(f"\n{Color.BLUE}{group[0]}{Color.END} ({size / 1024:.0f} KB)")
+        for dup in group[1:]:
+            note = "" if asset_name(dup) == asset_name(group[0]) else " (different asset, same bytes)"
+            print(f"  = {dup}{note}")
+
+    if groups:
+        print(f"\n{Color.YELLOW}⚠ {len(groups)} duplicate groups, "
+              f"{len(canonical)} mergeable files, "
+              f"{reclaimable / 1024 / 1024:.1f} MB reclaimable{Color.END}")
+    else:
+        print(f"\n{Color.GREEN}✓ No duplicate bundles{Color.END}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Report byte-identical AssetBundles")
+    parser.add_argument('--root', default=REPO_ROOT, help="Repository checkout to scan")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="Hashing threads (default: Python's thread pool default)")
+    parser.add_argument('--rewrite', nargs='+', metavar='SAVE',
+                        help="Rewrite AssetbundleURLs in these saves to canonical bundles")
+    args = parser.parse_args()
+
+    groups, stats = find_duplicates(args.root, args.jobs)
+    print_report(groups, stats, args.root)
+
+    if args.rewrite:
+        canonical = canonical_map(groups)
+        print()
+        for save_path in args.rewrite:
+            count = rewrite_save_urls(save_path, canonical)
+            if count:
+                print(f"{Color.GREEN}✓ {os.path.basename(save_path)}: rewrote {count} URLs{Color.END}")
+            else:
+                print(f"  {os.path.basename(save_path)}: no duplicate URLs")
+
+    print()
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
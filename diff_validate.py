@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Incremental Diff Validator
+==================================
+
+Validates a new save against a baseline version by re-running only the
+checks affected by what changed.
+
+Objects are matched between the two saves by GUID, or by Nickname+Name
+for saves without GUIDs (numbered when repeated); the contents of bags,
+decks and States are keyed under their container. Each added, removed,
+moved, rescaled, otherwise modified (values are compared with their
+type, so -100 -> -100.0 counts) or reordered object marks dirty the
+checks whose registered kinds and fields cover it. Clean
+checks reuse the baseline's per-check results (from the result cache
+when available), so a generator loop can validate after every edit.
+
+Usage:
+    python diff_validate.py <baseline.json> <new.json>
+    python diff_validate.py DBR_TTS_Assets/*_v4.*.json   # each file against the previous one
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from result_cache import DEFAULT_CACHE_DIR, ResultCache
+from test_framework import CheckSpec, Color, IndexedObject, TTSTestFramework
+
+# Position/scale changes smaller than this are treated as unchanged
+TRANSFORM_EPSILON = 1e-6
+
+# Objects listed per change category in the report
+MAX_LISTED = 5
+
+# Keys every check reads through IndexedObject (kind, nickname, reported GUID)
+IMPLICIT_FIELDS = frozenset(('Name', 'Nickname', 'GUID'))
+
+
+def object_key(entry: IndexedObject) -> str:
+    """Stable identity for an object across save versions (before numbering repeats)"""
+    guid = entry.data.get('GUID')
+    if guid:
+        return f"guid:{guid}"
+    return f"{entry.nickname}|{entry.name}"
+
+
+def keyed_objects(framework: TTSTestFramework) -> Dict[str, IndexedObject]:
+    """Every indexed object keyed by identity, contents under their container.
+
+    GUIDs are not unique in practice (copied units keep theirs), so repeated
+    keys are numbered in save order just like unnamed objects.
+    """
+    keyed = {}
+    seen: Dict[str, int] = {}
+    keys: Dict[int, str] = {}
+    for entry in framework.index.objects:
+        key = object_key(entry)
+        if entry.container is not None:
+            key = f"{keys[id(entry.container)]}/{key}"
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        if count:
+            key = f"{key}#{count}"
+        keys[id(entry)] = key
+        keyed[key] = entry
+    return keyed
+
+
+def child_sequences(keyed: Dict[str, IndexedObject]) -> Dict[str, List[str]]:
+    """Container key ('' for ObjectStates itself) -> its children's keys in save order"""
+    key_of = {id(entry): key for key, entry in keyed.items()}
+    sequences: Dict[str, List[str]] = {}
+    for key, entry in keyed.items():
+        parent = key_of[id(entry.container)] if entry.container is not None else ''
+        sequences.setdefault(parent, []).append(key)
+    return sequences
+
+
+def identical(old: Any, new: Any) -> bool:
+    """Deep equality that also tells -100 from -100.0, which findings print differently"""
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, Mapping):
+        return old.keys() == new.keys() and all(identical(old[k], new[k]) for k in old)
+    if isinstance(old, (list, tuple)):
+        return len(old) == len(new) and all(map(identical, old, new))
+    return old == new
+
+
+def _axis_changed(old: Dict, new: Dict, axes: Tuple[str, ...]) -> bool:
+    return any(abs(old.get(a, 0) - new.get(a, 0)) > TRANSFORM_EPSILON for a in axes)
+
+
+def _kinds_under(entry: IndexedObject) -> Set[str]:
+    """Kinds of an object and everything it contains (contents move with it)"""
+    kinds = set()
+    stack = [entry]
+    while stack:
+        current = stack.pop()
+        kinds.add(current.kind)
+        stack.extend(current.contents)
+    return kinds
+
+
+class SaveDiff:
+    """Object-level differences between two loaded saves"""
+
+    def __init__(self, baseline: TTSTestFramework, new: TTSTestFramework):
+        old_objects = keyed_objects(baseline)
+        new_objects = keyed_objects(new)
+
+        self.added = [new_objects[k] for k in new_objects if k not in old_objects]
+        self.removed = [old_objects[k] for k in old_objects if k not in new_objects]
+        self.moved: List[IndexedObject] = []
+        self.rescaled: List[IndexedObject] = []
+        self.modified: List[IndexedObject] = []
+        # (old, new) pairs for every object that changed in place
+        self.changed_pairs: List[Tuple[IndexedObject, IndexedObject]] = []
+        # Keys that differ, per id() of either side of a changed pair
+        self.changed_fields: Dict[int, FrozenSet[str]] = {}
+        # (old, new) pairs for objects whose position among their siblings changed
+        self.reordered_pairs: List[Tuple[IndexedObject, IndexedObject]] = []
+
+        for key, new_entry in new_objects.items():
+            old_entry = old_objects.get(key)
+            if old_entry is None or identical(old_entry.data, new_entry.data):
+                continue
+            self.changed_pairs.append((old_entry, new_entry))
+            old_data, new_data = old_entry.data, new_entry.data
+            fields = frozenset(k for k in old_data.keys() | new_data.keys()
+                               if k not in old_data or k not in new_data
+                               or not identical(old_data[k], new_data[k]))
+            self.changed_fields[id(old_entry)] = self.changed_fields[id(new_entry)] = fields
+
+            old_t, new_t = old_entry.transform, new_entry.transform
+            moved = _axis_changed(old_t, new_t, ('posX', 'posY', 'posZ', 'rotX', 'rotY', 'rotZ'))
+            rescaled = _axis_changed(old_t, new_t, ('scaleX', 'scaleY', 'scaleZ'))
+            if moved:
+                self.moved.append(new_entry)
+            if rescaled:
+                self.rescaled.append(new_entry)
+            # Anything else, including a value only changing type (-100 -> -100.0)
+            if fields - {'Transform'} or not (moved or rescaled):
+                self.modified.append(new_entry)
+
+        # Keys ignore order, so compare each container's surviving children in sequence
+        old_sequences = child_sequences(old_objects)
+        for parent, children in child_sequences(new_objects).items():
+            kept_new = [k for k in children if k in old_objects]
+            kept_old = [k for k in old_sequences.get(parent, ()) if k in new_objects]
+            if kept_new != kept_old:
+                self.reordered_pairs.extend((old_objects[k], new_objects[k]) for k in kept_new)
+
+        # Anything outside ObjectStates (SaveName etc.) only affects metadata
+        old_meta = {k: v for k, v in baseline.save_data.items() if k != 'ObjectStates'}
+        new_meta = {k: v for k, v in new.save_data.items() if k != 'ObjectStates'}
+        self.metadata_changed = not identical(old_meta, new_meta)
+        self.top_level_count_changed = len(baseline.index.top_level) != len(new.index.top_level)
+
+    @property
+    def reordered(self) -> List[IndexedObject]:
+        return [new_entry for _, new_entry in self.reordered_pairs]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed_pairs or self.reordered_pairs
+                    or self.metadata_changed)
+
+    def touched(self) -> List[IndexedObject]:
+        """Old and new versions of every added, removed, changed or reordered object"""
+        touched = list(self.added) + list(self.removed)
+        for old_entry, new_entry in self.changed_pairs + self.reordered_pairs:
+            touched.extend((old_entry, new_entry))
+        return touched
+
+    def _changes(self) -> List[Tuple[str, Optional[FrozenSet[str]]]]:
+        """(kind, changed keys) per touched object and its contents; None keys = whole object"""
+        changes = []
+        for entry in self.added + self.removed:
+            changes.extend((kind, None) for kind in _kinds_under(entry))
+        for old_entry, new_entry in self.reordered_pairs:
+            for entry in (old_entry, new_entry):
+                changes.extend((kind, None) for kind in _kinds_under(entry))
+        for old_entry, new_entry in self.changed_pairs:
+            fields = self.changed_fields[id(new_entry)]
+            for entry in (old_entry, new_entry):
+                changes.extend((kind, fields) for kind in _kinds_under(entry))
+        return changes
+
+    def affected_checks(self, specs: Iterable[CheckSpec]) -> Set[str]:
+        """Checks whose declared inputs (CheckSpec kinds and fields) were touched.
+
+        A check is dirty when a touched object (or anything it contains) is
+        of one of its kinds and a field it reads changed; no kinds means it
+        reads every object, no fields that it reads all of them. Checks that
+        declare neither may also read save metadata. Checks chained with
+        `after` share state, so re-running one re-runs its whole chain.
+        """
+        specs = list(specs)
+        changes = self._changes()
+        affected = set()
+        for spec in specs:
+            if not spec.kinds and not spec.fields and self.metadata_changed:
+                affected.add(spec.name)
+                continue
+            reads = IMPLICIT_FIELDS.union(spec.fields) if spec.fields else None
+            for kind, fields in changes:
+                if spec.kinds and kind not in spec.kinds:
+                    continue
+                if fields is None or reads is None or fields & reads:
+                    affected.add(spec.name)
+                    break
+
+        selected = {spec.name for spec in specs}
+        grown = True
+        while grown:
+            grown = False
+            for spec in specs:
+                chain = {spec.name} | {name for name in spec.after if name in selected}
+                if chain & affected and not chain <= affected:
+                    affected |= chain
+                    grown = True
+        return affected
+
+
+def load_quietly(framework: TTSTestFramework) -> bool:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return framework.load_save_file()
+
+
+def baseline_results(framework: TTSTestFramework, cache: Optional[ResultCache]) -> bool:
+    """Fill the baseline's per-check results from the cache, running it on a miss"""
+    if cache and cache.lookup(framework):
+        return True
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for check in framework.checks:
+            framework.run_check(check)
+    if cache:
+        cache.store(framework)
+    return False
+
+
+def validate_incremental(baseline: TTSTestFramework, new: TTSTestFramework,
+                         cache: Optional[ResultCache] = None) -> Tuple[SaveDiff, Set[str]]:
+    """Run the checks affected by the baseline -> new diff on `new`.
+
+    Both frameworks must be loaded and the baseline must have per-check
+    results. Returns the diff and the set of checks that were re-run.
+    """
+    diff = SaveDiff(baseline, new)
+    affected = diff.affected_checks(new.specs)
+
+    for check in new.checks:
+        if check in affected or check not in baseline.check_results:
+            new.run_check(check)
+        else:
+            reused = baseline.check_results[check]
+            new.findings.extend(reused)
+            new.check_results[check] = reused
+
+    if cache:
+        cache.store(new)
+    return diff, affected
+
+
+def _print_objects(label: str, entries: List[IndexedObject], color: str):
+    if not entries:
+        return
+    print(f"{color}{label}: {len(entries)}{Color.END}")
+    for entry in entries[:MAX_LISTED]:
+        t = entry.transform
+        print(f"  - {entry.nickname or entry.name} at ({t.get('posX', 0):.1f}, "
+              f"{t.get('posY', 0):.1f}, {t.get('posZ', 0):.1f}) scale {t.get('scaleX', 0):.3f}")
+
+
+def print_diff_report(baseline: TTSTestFramework, new: TTSTestFramework,
+                      diff: SaveDiff, affected: Set[str]):
+    """Print object changes, re-run checks and new/resolved errors"""
+    print(f"\n{Color.BOLD}{'='*70}{Color.END}")
+    print(f"{Color.BOLD}DIFF: {os.path.basename(baseline.save_file_path)} → "
+          f"{os.path.basename(new.save_file_path)}{Color.END}")
+    print(f"{Color.BOLD}{'='*70}{Color.END}")
+
+    if diff.is_empty:
+        print(f"{Color.GREEN}No object changes{Color.END}")
+    _print_objects("Added", diff.added, Color.GREEN)
+    _print_objects("Removed", diff.removed, Color.RED)
+    _print_objects("Moved", diff.moved, Color.BLUE)
+    _print_objects("Rescaled", diff.rescaled, Color.YELLOW)
+    _print_objects("Modified", diff.modified, Color.BLUE)
+    _print_objects("Reordered", diff.reordered, Color.BLUE)
+    if diff.metadata_changed:
+        print(f"{Color.BLUE}Save metadata changed{Color.END}")
+
+    rerun = [c for c in new.checks if c in affected]
+    print(f"\nChecks re-run: {len(rerun)}/{len(new.checks)}"
+          + (f" ({', '.join(rerun)})" if rerun else ""))
+
+    old_errors = set(baseline.errors)
+    new_errors = [e for e in new.errors if e not in old_errors]
+    resolved = [e for e in baseline.errors if e not in set(new.errors)]
+    if new_errors:
+        print(f"\n{Color.RED}{Color.BOLD}NEW FAILURES ({len(new_errors)}):{Color.END}")
+        for error in new_errors:
+            print(f"{Color.RED}{error}{Color.END}")
+    if resolved:
+        print(f"\n{Color.GREEN}{Color.BOLD}RESOLVED ({len(resolved)}):{Color.END}")
+        for error in resolved:
+            print(f"{Color.GREEN}{error}{Color.END}")
+
+    if not new.errors:
+        print(f"\n{Color.GREEN}{Color.BOLD}✓ ALL TESTS PASSED{Color.END}")
+    else:
+        print(f"\n{Color.RED}{Color.BOLD}✗ TESTS FAILED{Color.END}")
+        print(f"{Color.RED}  {len(new.errors)} errors, {len(new.warnings)} warnings{Color.END}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Validate save versions incrementally against their predecessor")
+    parser.add_argument('saves', nargs='+',
+                        help="Baseline save followed by one or more newer versions")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not read or write cached baseline results")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="Result cache directory")
+    args = parser.parse_args()
+
+    if len(args.saves) < 2:
+        parser.error("need a baseline and at least one newer save")
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+
+    baseline = TTSTestFramework(args.saves[0])
+    if not load_quietly(baseline):
+        print(f"{Color.RED}{baseline.errors[0]}{Color.END}")
+        sys.exit(1)
+    baseline_results(baseline, cache)
+
+    success = True
+    for path in args.saves[1:]:
+        new = TTSTestFramework(path)
+        if not load_quietly(new):
+            print(f"{Color.RED}{new.errors[0]}{Color.END}")
+            sys.exit(1)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            diff, affected = validate_incremental(baseline, new, cache)
+        print_diff_report(baseline, new, diff, affected)
+
+        success = len(new.errors) == 0
+        # Each version is the baseline for the next
+        baseline = new
+
+    print()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
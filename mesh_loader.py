@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+DBR Wavefront OBJ Mesh Loader
+=============================
+
+Loads the OBJ meshes referenced by CustomMesh.MeshURL (the grass table
+today, larger tables and terrain meshes later) so checks can measure the
+geometry rather than trusting Transform values.
+
+The file is read line by line; vertex lines are converted in bulk and
+polygon faces are fan-triangulated into an (n, 3) index array, with
+NumPy when installed and plain lists otherwise. Parsed meshes are stored
+in a binary .npz sidecar keyed by the OBJ's SHA-256, so multi-megabyte
+meshes are parsed once.
+
+test_table_configuration uses a MeshLoader (see get_mesh_loader) to map
+a table's MeshURL onto the checkout and compare the mesh's bounding box,
+times the table's scale, with the expected playing surface.
+
+Usage:
+    python mesh_loader.py grass_table_6x4.obj
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: array storage and the binary sidecar cache
+    np = None
+
+from bundle_manifest import RAW_URL_PREFIX, REPO_ROOT
+from result_cache import DEFAULT_CACHE_DIR, hash_file
+from url_resolver import checkout_path
+
+# Parsed meshes live next to the result cache
+DEFAULT_MESH_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'meshes')
+
+# Bump when the sidecar layout changes
+SIDECAR_VERSION = 1
+
+
+class MeshFormatError(ValueError):
+    """Raised when an OBJ file cannot be parsed"""
+
+
+class Mesh:
+    """Vertices (n, 3) and triangle indices (m, 3) of an OBJ mesh"""
+
+    def __init__(self, vertices, faces, source: str = ''):
+        self.vertices = vertices
+        self.faces = faces
+        self.source = source
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def face_count(self) -> int:
+        return len(self.faces)
+
+    def bounds(self) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+        """Axis-aligned bounding box as ((min x, y, z), (max x, y, z))"""
+        if not self.vertex_count:
+            raise MeshFormatError(f"{self.source}: mesh has no vertices")
+        if np is not None:
+            lo, hi = self.vertices.min(axis=0), self.vertices.max(axis=0)
+            return tuple(float(v) for v in lo), tuple(float(v) for v in hi)
+        columns = list(zip(*self.vertices))
+        return tuple(min(c) for c in columns), tuple(max(c) for c in columns)
+
+    def extents(self) -> Tuple[float, float, float]:
+        """Bounding box size along x, y and z in model units"""
+        lo, hi = self.bounds()
+        return tuple(h - l for l, h in zip(lo, hi))
+
+
+def parse_obj(path: str) -> Mesh:
+    """Parse vertex positions and faces from an OBJ file"""
+    vertex_tokens: List[bytes] = []
+    faces: List[Tuple[int, int, int]] = []
+    vertex_count = 0
+
+    with open(path, 'rb') as f:
+        for number, line in enumerate(f, 1):
+            if line.startswith(b'v '):
+                coords = line.split()[1:4]
+                if len(coords) != 3:
+                    raise MeshFormatError(f"{path}:{number}: vertex needs 3 coordinates")
+                vertex_tokens.extend(coords)
+                vertex_count += 1
+            elif line.startswith(b'f '):
+                try:
+                    # v, v/vt, v//vn and v/vt/vn; negative indices count back from the end
+                    corners = [int(token.split(b'/', 1)[0]) for token in line.split()[1:]]
+                except ValueError:
+                    raise MeshFormatError(f"{path}:{number}: malformed face")
+                corners = [c - 1 if c > 0 else vertex_count + c for c in corners]
+                if len(corners) < 3 or min(corners) < 0 or max(corners) >= vertex_count:
+                    raise MeshFormatError(f"{path}:{number}: face references missing vertex")
+                # Fan triangulation of convex polygons
+                first = corners[0]
+                for i in range(1, len(corners) - 1):
+                    faces.append((first, corners[i], corners[i + 1]))
+
+    try:
+        if np is not None:
+            vertices = np.array(vertex_tokens, dtype=np.float64).reshape(-1, 3)
+            face_array = np.array(faces, dtype=np.int32).reshape(-1, 3)
+            return Mesh(vertices, face_array, path)
+        values = [float(token) for token in vertex_tokens]
+    except ValueError:
+        raise MeshFormatError(f"{path}: malformed vertex coordinate")
+    vertices = [tuple(values[i:i + 3]) for i in range(0, len(values), 3)]
+    return Mesh(vertices, faces, path)
+
+
+def load_obj(path: str, cache_dir: Optional[str] = DEFAULT_MESH_CACHE_DIR) -> Mesh:
+    """Load an OBJ mesh, reusing the binary sidecar when the file is unchanged.
+
+    The sidecar needs NumPy; without it (or with cache_dir=None) the file
+    is parsed every time.
+    """
+    if np is None or not cache_dir:
+        return parse_obj(path)
+
+    sidecar = os.path.join(cache_dir, f"{hash_file(path)}.npz")
+    try:
+        with np.load(sidecar) as data:
+            if int(data['version']) == SIDECAR_VERSION:
+                return Mesh(data['vertices'], data['faces'], path)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    mesh = parse_obj(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, version=SIDECAR_VERSION, vertices=mesh.vertices, faces=mesh.faces)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        pass  # Caching is best effort
+    return mesh
+
+
+class MeshLoader:
+    """Loads meshes by MeshURL from a checkout, memoized per file version.
+
+    A mesh is re-read only when its mtime or size changes, so batch and
+    watch runs touch the sidecar once per process rather than once per save.
+    """
+
+    def __init__(self, root: str = REPO_ROOT, cache_dir: Optional[str] = DEFAULT_MESH_CACHE_DIR):
+        self.root = root
+        self.cache_dir = cache_dir
+        self._memo: Dict[str, Tuple[Tuple[int, int], Mesh]] = {}
+
+    def path_for_url(self, url: str) -> Optional[str]:
+        """Checkout path for a raw GitHub URL of this repository; None for
+        other URLs and for paths that would leave the checkout"""
+        rel_path = checkout_path(url)
+        if rel_path is None:
+            return None
+        return os.path.join(self.root, rel_path)
+
+    def load(self, path: str) -> Mesh:
+        """Load a mesh file; raises OSError or MeshFormatError"""
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._memo.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+        mesh = load_obj(path, self.cache_dir)
+        self._memo[path] = (version, mesh)
+        return mesh
+
+    def load_url(self, url: str) -> Mesh:
+        """Load the mesh a MeshURL points at; raises OSError or MeshFormatError"""
+        path = self.path_for_url(url)
+        if path is None:
+            if url.startswith(RAW_URL_PREFIX):
+                raise MeshFormatError(f"{url}: path escapes the repository")
+            raise MeshFormatError(f"{url}: not served from this repository")
+        return self.load(path)
+
+
+# Shared per process so batch workers keep their memo across saves
+_loader: Optional[MeshLoader] = None
+
+
+def get_mesh_loader() -> MeshLoader:
+    """Process-wide mesh loader over the local checkout"""
+    global _loader
+    if _loader is None:
+        _loader = MeshLoader()
+    return _loader
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Parse OBJ meshes and print their bounds")
+    parser.add_argument('meshes', nargs='+', help="OBJ files")
+    parser.add_argument('--no-cache', action='store_true', help="Always parse, ignoring sidecars")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.meshes:
+        try:
+            mesh = load_obj(path, None if args.no_cache else DEFAULT_MESH_CACHE_DIR)
+            lo, hi = mesh.bounds()
+        except (OSError, MeshFormatError) as e:
+            print(f"✗ {path}: {e}")
+            failed = True
+            continue
+        x, y, z = mesh.extents()
+        print(f"✓ {path}: {mesh.vertex_count} vertices, {mesh.face_count} triangles")
+        print(f"  bounds ({lo[0]:.3f}, {lo[1]:.3f}, {lo[2]:.3f}) .. ({hi[0]:.3f}, {hi[1]:.3f}, {hi[2]:.3f})")
+        print(f"  size {x:.3f} × {y:.3f} × {z:.3f} units ({x / 12:.2f} × {z / 12:.2f} ft at scale 1)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
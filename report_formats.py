@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Report Formats
+======================
+
+Machine-readable emitters for test framework findings, for CI runs over
+many saves where the coloured terminal report is only noise:
+
+- JSON Lines: one finding per line (save, check, severity, object
+  GUID/nickname, measured and expected values), easy to aggregate and diff.
+- JUnit XML: one testsuite per save and one testcase per check, so CI
+  servers show failing checks natively.
+
+Both work on plain report records (see save_record), which batch workers
+can send back across process boundaries.
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional, TextIO
+
+
+def save_record(framework) -> Dict:
+    """Plain-data summary of one validated save"""
+    return {
+        'path': framework.save_file_path,
+        'passed': not framework.errors,
+        'checks': list(framework.check_results),
+        'findings': [f.to_dict() for f in framework.findings],
+        'timings': framework.timings,
+    }
+
+
+def write_jsonl(records: Iterable[Dict], out: TextIO):
+    """Write every finding of every record as one JSON object per line"""
+    for record in records:
+        save = record['path']
+        for finding in record['findings']:
+            line = {'save': save}
+            line.update(finding)
+            out.write(json.dumps(line, ensure_ascii=False))
+            out.write('\n')
+
+
+def _testcase(suite: ET.Element, save_name: str, check: str, findings: List[Dict],
+              timing: Optional[Dict]):
+    case = ET.SubElement(suite, 'testcase', classname=save_name, name=check)
+    if timing:
+        case.set('time', f"{timing['wall']:.6f}")
+    errors = [f for f in findings if f['severity'] == 'error']
+    if errors:
+        failure = ET.SubElement(case, 'failure', message=errors[0]['message'], type='error')
+        failure.text = '\n'.join(_render(f) for f in errors)
+
+    other = [f for f in findings if f['severity'] != 'error']
+    if other:
+        ET.SubElement(case, 'system-out').text = '\n'.join(_render(f) for f in other)
+    return bool(errors)
+
+
+def _render(finding: Dict) -> str:
+    if finding.get('detail'):
+        return f"  - {finding['message']}"
+    return f"{finding['severity'].upper()}: {finding['message']}"
+
+
+def build_junit(records: Iterable[Dict]) -> ET.ElementTree:
+    """JUnit XML tree: one testsuite per save, one testcase per check"""
+    root = ET.Element('testsuites', name='DBR TTS save validation')
+    total_tests = total_failures = 0
+
+    for record in records:
+        save_name = os.path.basename(record['path'])
+        by_check: Dict[str, List[Dict]] = {}
+        for finding in record['findings']:
+            by_check.setdefault(finding['check'], []).append(finding)
+
+        # Loading is a testcase too, so unreadable saves fail visibly
+        checks = ['load'] + [c for c in record['checks'] if c != 'load']
+        suite = ET.SubElement(root, 'testsuite', name=save_name)
+        timings = record.get('timings', {})
+        failures = sum(_testcase(suite, save_name, check, by_check.get(check, []), timings.get(check))
+                       for check in checks)
+        suite.set('tests', str(len(checks)))
+        suite.set('failures', str(failures))
+        total_tests += len(checks)
+        total_failures += failures
+
+    root.set('tests', str(total_tests))
+    root.set('failures', str(total_failures))
+    return ET.ElementTree(root)
+
+
+def write_junit(records: Iterable[Dict], path: str):
+    tree = build_junit(records)
+    ET.indent(tree)
+    tree.write(path, encoding='utf-8', xml_declaration=True)
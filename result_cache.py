@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Result Cache
+====================
+
+Persistent on-disk cache of test framework results, so unchanged saves
+skip revalidation.
+
+Entries are keyed by the save's file name and the SHA-256 of its bytes,
+combined with a fingerprint of the framework's rules (every UPPERCASE
+rule constant on the framework instance, the selected checks and the
+framework source itself). Editing or renaming a save, a rule constant or
+a check, loading a different rule set or running another selection
+therefore misses the stored entries; findings quoting the file name are
+never replayed under another one. The cache is bounded in bytes and
+evicts least recently used entries first; a hit refreshes the entry's
+mtime.
+
+Usage:
+    python result_cache.py --stats
+    python result_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Dict
+
+from test_framework import Finding
+
+# Default location, overridable with DBR_TTS_CACHE_DIR
+DEFAULT_CACHE_DIR = os.environ.get(
+    'DBR_TTS_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'dbr_tts_test_framework')
+)
+
+# Upper bound on total cache size before LRU eviction
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Bump when the stored entry layout changes
+CACHE_FORMAT_VERSION = 3
+
+# Read size when hashing save files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file's contents (shared by every cache keyed on content)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(framework_class) -> str:
+    """Hash of the module defining the framework class (rules inside check code)"""
+    module = sys.modules.get(framework_class.__module__)
+    source = getattr(module, '__file__', None)
+    if source and os.path.exists(source):
+        return hash_file(source)
+    return ''
+
+
+def rules_fingerprint(framework, source: str = None) -> str:
+    """Hash of the framework's rule constants, selected checks and check code"""
+    rules = {
+        name: getattr(framework, name)
+        for name in dir(framework)
+        if name.isupper() and not callable(getattr(framework, name))
+    }
+    digest = hashlib.sha256()
+    digest.update(json.dumps(rules, sort_keys=True, default=repr).encode('utf-8'))
+    digest.update(json.dumps(framework.checks).encode('utf-8'))
+
+    # Rules that live inside check methods are covered by the source hash
+    if source is None:
+        source = source_fingerprint(type(framework))
+    digest.update(source.encode('ascii'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of structured findings per save file"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._sources: Dict[int, str] = {}
+
+    def key_for(self, framework) -> str:
+        """Cache key for a framework instance's save file (name and content) and rules"""
+        # Check code is fixed per framework class, so hash each source once;
+        # rule sets and check selections vary per instance
+        source = self._sources.get(id(type(framework)))
+        if source is None:
+            source = self._sources[id(type(framework))] = source_fingerprint(type(framework))
+        fingerprint = rules_fingerprint(framework, source)
+
+        # Findings quote the file name, so copies and renames get their own entries
+        name = os.path.basename(framework.save_file_path)
+        content = hash_file(framework.save_file_path)
+        return hashlib.sha256(f"{name}:{content}:{fingerprint}".encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def lookup(self, framework) -> bool:
+        """Replay cached results into the framework; True on a hit"""
+        try:
+            path = self._entry_path(self.key_for(framework))
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if entry.get('version') != CACHE_FORMAT_VERSION:
+            return False
+
+        findings = [Finding.from_dict(f) for f in entry['findings']]
+        framework.findings = findings
+        framework.check_results = {
+            check: [f for f in findings if f.check == check] for check in entry['checks']
+        }
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def store(self, framework):
+        """Save the framework's results and evict old entries if over budget"""
+        try:
+            key = self.key_for(framework)
+        except OSError:
+            return  # Save file vanished; nothing to key on
+
+        entry = {
+            'version': CACHE_FORMAT_VERSION,
+            'save_file': os.path.abspath(framework.save_file_path),
+            'findings': [f.to_dict() for f in framework.findings],
+            'checks': list(framework.check_results),
+        }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write atomically so parallel batch workers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self.evict()
+
+    def _entries(self):
+        """(mtime, size, path) for every cache entry"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> int:
+        """Remove every entry, returning how many were deleted"""
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> Dict:
+        entries = self._entries()
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'cache_dir': self.cache_dir,
+        }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Inspect or clear the DBR TTS result cache")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="Cache directory")
+    parser.add_argument('--clear', action='store_true', help="Delete all cached results")
+    parser.add_argument('--stats', action='store_true', help="Show cache size")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_dir)
+    if args.clear:
+        print(f"Removed {cache.clear()} cached results from {cache.cache_dir}")
+    else:
+        stats = cache.stats()
+        print(f"Cache dir: {stats['cache_dir']}")
+        print(f"Entries:   {stats['entries']}")
+        print(f"Size:      {stats['bytes'] / 1024:.1f} KB of "
+              f"{stats['max_bytes'] / 1024 / 1024:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
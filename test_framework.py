@@ -12,11 +12,26 @@ This framework validates TTS save files and assets to ensure:
 Run after EVERY change to verify correctness.
 """
 
+import argparse
+import contextlib
+import cProfile
+import functools
+import io
 import json
+import math
 import sys
 import os
+import time
+import tracemalloc
+from array import array
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional: enables the vectorized placement/scale checks
+    np = None
 
 class Color:
     """ANSI color codes for terminal output"""
@@ -27,15 +42,756 @@ class Color:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# Object fields read by the checks; everything else is dropped in slim mode
+INDEXED_FIELDS = ('Name', 'Nickname', 'GUID', 'Transform', 'Locked',
+                  'CustomAssetbundle', 'CustomMesh')
+
+# Top-level save fields kept after loading; Lua, XmlUI, notes etc. are dropped
+SAVE_FIELDS = ('SaveName', 'GameMode', 'Date', 'VersionNumber', 'Table', 'Sky')
+
+# Columns of ObjectIndex.transform_matrix(); missing fields read as 0
+TRANSFORM_FIELDS = ('posX', 'posY', 'posZ', 'rotX', 'rotY', 'rotZ',
+                    'scaleX', 'scaleY', 'scaleZ')
+TRANSFORM_COLUMN = {field: column for column, field in enumerate(TRANSFORM_FIELDS)}
+
+# Position fields a contained object inherits from its container
+POSITION_FIELDS = ('posX', 'posY', 'posZ')
+
+# Bytes read from disk per refill when streaming a save
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def iter_save_stream(path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Incrementally parse a TTS save.
+    
+    Yields (key, value) for each top-level member, except that the
+    ObjectStates array is yielded element by element as
+    ('ObjectStates', obj); an empty one is yielded whole as
+    ('ObjectStates', []) so its presence is not lost. Only one value is
+    ever decoded at a time, so peak memory follows the largest single
+    object rather than the file.
+    Raises json.JSONDecodeError on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        pos = 0
+        eof = False
+        
+        def fill(minimum: int = 1) -> bool:
+            """Drop consumed text and read until `minimum` chars are buffered"""
+            nonlocal buf, pos, eof
+            buf = buf[pos:]
+            pos = 0
+            while not eof and len(buf) < minimum:
+                chunk = f.read(max(chunk_size, minimum - len(buf)))
+                if not chunk:
+                    eof = True
+                buf += chunk
+            return len(buf) >= minimum
+        
+        def skip_ws() -> str:
+            """Advance past whitespace and return the next char ('' at EOF)"""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    return ''
+        
+        def expect(chars: str) -> str:
+            nonlocal pos
+            char = skip_ws()
+            if not char or char not in chars:
+                raise json.JSONDecodeError(f"Expected one of {chars!r}", buf, pos)
+            pos += 1
+            return char
+        
+        def decode() -> Any:
+            """Decode the next complete value, reading more text as needed"""
+            nonlocal pos
+            skip_ws()
+            want = len(buf) - pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # A number cut at the end of the buffer ("0" of "0.5")
+                    # decodes fine, so only trust values followed by a delimiter
+                    if eof or (end < len(buf) and buf[end] in ' \t\r\n,]}'):
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                # Grow geometrically so huge objects are not re-parsed per chunk
+                want = max(want * 2, chunk_size)
+                fill(want)
+        
+        expect('{')
+        if skip_ws() == '}':
+            return
+        
+        while True:
+            key = decode()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expected object key", buf, pos)
+            expect(':')
+            
+            if key == 'ObjectStates' and skip_ws() == '[':
+                pos += 1
+                if skip_ws() == ']':
+                    pos += 1
+                    yield key, []
+                else:
+                    while True:
+                        yield key, decode()
+                        if expect(',]') == ']':
+                            break
+            else:
+                yield key, decode()
+            
+            if expect(',}') == '}':
+                return
+
+
+class Transform(Mapping):
+    """Read-only Transform dict packed into one array of doubles.
+    
+    Behaves like the decoded dict (get, items, ==) for the TRANSFORM_FIELDS
+    keys at a fraction of its size; absent fields are stored as NaN and
+    fields decoded as ints are flagged in a bitmask so they read back as ints.
+    """
+    
+    __slots__ = ('_values', '_ints')
+    
+    def __init__(self, transform: Dict):
+        self._values = array('d', (transform.get(field, math.nan) for field in TRANSFORM_FIELDS))
+        self._ints = sum(1 << column for column, field in enumerate(TRANSFORM_FIELDS)
+                         if type(transform.get(field)) is int)
+    
+    def __getitem__(self, field: str) -> float:
+        column = TRANSFORM_COLUMN.get(field)
+        if column is None or math.isnan(self._values[column]):
+            raise KeyError(field)
+        if self._ints >> column & 1:
+            return int(self._values[column])
+        return self._values[column]
+    
+    def __iter__(self) -> Iterator[str]:
+        return (field for field, value in zip(TRANSFORM_FIELDS, self._values)
+                if not math.isnan(value))
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"Transform({dict(self)!r})"
+
+
+def _compact(key: str, value: Any) -> Any:
+    """Copy of a kept field with interned keys and string values.
+    
+    Every decoded object carries its own copies of 'posX', URLs and the
+    like; interning shares one string per distinct value across the save.
+    Transforms are packed into a Transform.
+    """
+    if key == 'Transform' and isinstance(value, dict):
+        return Transform(value)
+    if isinstance(value, dict):
+        return {sys.intern(key): sys.intern(v) if isinstance(v, str) else v
+                for key, v in value.items()}
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class IndexedObject:
+    """A save object with the fields every check needs, computed once.
+    
+    container is the bag, deck or object (for States variants) this one
+    sits in, or None for objects directly in ObjectStates. Only the latter
+    are loose; a States variant is an alternate form of its object, not a
+    second piece on the table (see variant_of).
+    """
+    
+    __slots__ = ('data', 'order', 'container', 'via', 'depth', 'loose', 'name',
+                 'nickname', 'nickname_lower', 'transform', 'kind', 'contents')
+    
+    def __init__(self, data: Dict, order: int, container: Optional['IndexedObject'] = None,
+                 via: Optional[str] = None):
+        self.data = data
+        self.order = order
+        self.container = container
+        self.via = via  # 'ContainedObjects' or 'States' when contained
+        self.depth = container.depth + 1 if container is not None else 0
+        self.loose = container is None
+        self.name = sys.intern(data.get('Name', ''))
+        self.nickname = sys.intern(data.get('Nickname', ''))
+        self.nickname_lower = sys.intern(self.nickname.lower())
+        self.transform = data.get('Transform', {})
+        self.kind = self._classify()
+        self.contents: List['IndexedObject'] = []
+    
+    @property
+    def container_path(self) -> Tuple[str, ...]:
+        """Nicknames (or Names) of the enclosing containers, outermost first"""
+        path = []
+        container = self.container
+        while container is not None:
+            path.append(container.nickname or container.name)
+            container = container.container
+        return tuple(reversed(path))
+    
+    @property
+    def variant_of(self) -> Optional['IndexedObject']:
+        """The loose object this is a (possibly nested) States variant of, if any"""
+        entry = self
+        while entry.via == 'States':
+            entry = entry.container
+        return entry if entry is not self and entry.loose else None
+    
+    @property
+    def world_transform(self) -> Dict:
+        """Transform in table space.
+        
+        Contained objects have stale positions from when they were stored;
+        they appear where their outermost container is, keeping their own
+        rotation and scale.
+        """
+        if self.container is None:
+            return self.transform
+        outermost = self.container
+        while outermost.container is not None:
+            outermost = outermost.container
+        transform = dict(self.transform)
+        for field in POSITION_FIELDS:
+            transform[field] = outermost.transform.get(field, 0)
+        return transform
+    
+    def _classify(self) -> str:
+        """Classify the object as table/unit/terrain/tool/bag/other"""
+        if self.name == 'Custom_AssetBundle':
+            if 'terrain' in self.nickname_lower:
+                return 'terrain'
+            if 'tool' in self.nickname_lower:
+                return 'tool'
+            return 'unit'
+        if self.name == 'Bag':
+            return 'bag'
+        if 'table' in self.nickname_lower:
+            return 'table'
+        return 'other'
+
+
+def walk_objects(roots: Iterable[Dict], order: int = 0,
+                 fields: Optional[Tuple[str, ...]] = None) -> Iterator[IndexedObject]:
+    """Every object under roots in save order, containers before their contents.
+    
+    Descends into ContainedObjects (bags, decks) and States variants to any
+    depth with an explicit stack, so deeply nested libraries never hit the
+    recursion limit. Each object's dict is wrapped, not copied, unless
+    fields is given, in which case only those keys are kept (compacted,
+    see _compact).
+    """
+    stack: List[Tuple[Dict, Optional[IndexedObject], Optional[str]]] = [
+        (root, None, None) for root in reversed(list(roots))
+    ]
+    while stack:
+        data, container, via = stack.pop()
+        kept = {key: _compact(key, data[key]) for key in fields if key in data} if fields else data
+        entry = IndexedObject(kept, order, container, via)
+        order += 1
+        if container is not None:
+            container.contents.append(entry)
+        yield entry
+        
+        states = data.get('States') or {}
+        for state in reversed(list(states.values())):
+            stack.append((state, entry, 'States'))
+        for contained in reversed(data.get('ContainedObjects') or []):
+            stack.append((contained, entry, 'ContainedObjects'))
+
+
+class ObjectIndex:
+    """Index over a save's ObjectStates, built in a single traversal.
+    
+    Objects are kept in save order (a container's contents follow it, at
+    any nesting depth) and looked up by Name, by kind and by container, so
+    checks never rescan ObjectStates or re-lowercase nicknames. With slim=True only
+    `fields` (default INDEXED_FIELDS) are retained, so objects can be fed in one at a time
+    from a streamed save without keeping the full tree alive. With kinds
+    given, only those kinds get by_kind lists (and tables only if 'table'
+    is among them).
+    """
+    
+    def __init__(self, object_states: Iterable[Dict] = (), slim: bool = False,
+                 fields: Optional[Iterable[str]] = None, kinds: Optional[Iterable[str]] = None):
+        self.slim = slim
+        self.fields = tuple(fields) if fields is not None else INDEXED_FIELDS
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.objects: List[IndexedObject] = []
+        self.top_level: List[IndexedObject] = []
+        self.bags: List[IndexedObject] = []  # At any depth
+        self.in_bags: List[IndexedObject] = []  # Everything inside a container, at any depth
+        self.by_name: Dict[str, List[IndexedObject]] = {}
+        self.by_kind: Dict[str, List[IndexedObject]] = {}
+        self.tables: Dict[str, Optional[IndexedObject]] = {
+            'main': None,
+            'left': None,
+            'right': None
+        }
+        self._transform_matrix = None
+        
+        for obj in object_states:
+            self.add(obj)
+    
+    def add(self, obj: Dict) -> IndexedObject:
+        """Index one top-level object and everything nested inside it"""
+        # Keep only what the checks read; Lua, XmlUI and bag payloads are dropped
+        fields = self.fields if self.slim else None
+        kinds = self.kinds
+        top = None
+        for entry in walk_objects((obj,), len(self.objects), fields):
+            self.objects.append(entry)
+            self.by_name.setdefault(entry.name, []).append(entry)
+            if kinds is None or entry.kind in kinds:
+                self.by_kind.setdefault(entry.kind, []).append(entry)
+            if entry.name == 'Bag':
+                self.bags.append(entry)
+            if entry.container is None:
+                top = entry
+            else:
+                self.in_bags.append(entry)
+        
+        self._transform_matrix = None
+        self.top_level.append(top)
+        if kinds is None or 'table' in kinds:
+            self._match_table(top)
+        return top
+    
+    def _match_table(self, entry: IndexedObject):
+        """Record loose objects whose nickname names one of the three tables"""
+        nickname = entry.nickname_lower
+        if 'table' not in nickname:
+            return
+        if 'main' in nickname:
+            self.tables['main'] = entry
+        elif 'left' in nickname:
+            self.tables['left'] = entry
+        elif 'right' in nickname:
+            self.tables['right'] = entry
+    
+    def of_kind(self, *kinds: str, loose_only: bool = False) -> List[IndexedObject]:
+        """Objects of the given kinds in save order, optionally only those on the table"""
+        found = []
+        for kind in kinds:
+            found.extend(self.by_kind.get(kind, []))
+        if loose_only:
+            found = [entry for entry in found if entry.loose]
+        if len(kinds) > 1:
+            found.sort(key=lambda entry: entry.order)
+        return found
+    
+    def variants_of_kind(self, *kinds: str) -> List[IndexedObject]:
+        """States variants of loose objects, of the given kinds, in save order"""
+        return [entry for entry in self.of_kind(*kinds) if entry.variant_of is not None]
+    
+    def transform_matrix(self) -> 'np.ndarray':
+        """Every object's world transform as one contiguous (n, 9) float64 array.
+        
+        Rows follow index order (IndexedObject.order) and columns follow
+        TRANSFORM_FIELDS. Built once on first use; requires NumPy.
+        """
+        if self._transform_matrix is None:
+            count = len(self.objects)
+            transforms = (entry.world_transform for entry in self.objects)
+            flat = np.fromiter(
+                (transform.get(field, 0) for transform in transforms for field in TRANSFORM_FIELDS),
+                dtype=np.float64, count=count * len(TRANSFORM_FIELDS)
+            )
+            self._transform_matrix = flat.reshape(count, len(TRANSFORM_FIELDS))
+        return self._transform_matrix
+    
+    def transform_columns(self, entries: List[IndexedObject], *fields: str) -> 'np.ndarray':
+        """Selected transform columns for the given objects, one row per object"""
+        rows = np.fromiter((entry.order for entry in entries), dtype=np.intp, count=len(entries))
+        columns = [TRANSFORM_COLUMN[field] for field in fields]
+        return self.transform_matrix()[np.ix_(rows, columns)]
+
+
+class TerrainMatcher:
+    """Resolves terrain nicknames to DBR_TERRAIN_SIZES keys.
+    
+    A key such as 'hill_gentle_small' matches when every '_' part occurs in
+    the normalized nickname (lowercased, spaces and 'terrain' removed).
+    Each distinct part is tested once per name, and when several keys
+    match the one covering the most characters wins, ties going to table
+    order. Waterways and coastlines always resolve to 'waterway'.
+    Results are memoized per nickname since the same names repeat across
+    bags and files. Matching only depends on the table's keys (sizes are
+    read by the checks), so matchers are shared by every rule set with the
+    same keys in the same order.
+    """
+    
+    # Matchers keyed by the rule table keys they were compiled from, oldest first
+    _compiled: Dict[Tuple[str, ...], 'TerrainMatcher'] = {}
+    
+    MEMO_SIZE = 4096
+    
+    # Distinct rule tables kept compiled before the oldest is dropped
+    COMPILED_SIZE = 32
+    
+    def __init__(self, rules: Dict[str, Dict]):
+        self.keys = tuple(rules)
+        self._parts = [(key, frozenset(key.split('_')), len(key.replace('_', '')))
+                       for key in self.keys]
+        self._tokens = sorted({part for _, parts, _ in self._parts for part in parts})
+        self.resolve = functools.lru_cache(maxsize=self.MEMO_SIZE)(self._resolve)
+    
+    @classmethod
+    def for_rules(cls, rules: Dict[str, Dict]) -> 'TerrainMatcher':
+        """Shared matcher for a rule table's keys, compiled on first use"""
+        keys = tuple(rules)
+        matcher = cls._compiled.get(keys)
+        if matcher is None:
+            if len(cls._compiled) >= cls.COMPILED_SIZE:
+                del cls._compiled[next(iter(cls._compiled))]
+            matcher = cls._compiled[keys] = cls(rules)
+        return matcher
+    
+    @staticmethod
+    def normalize(nickname: str) -> str:
+        return nickname.lower().replace(' ', '').replace('terrain', '')
+    
+    def _resolve(self, nickname: str) -> Optional[str]:
+        name = self.normalize(nickname)
+        
+        # Special case for waterways
+        if ('waterway' in name or 'coastline' in name) and 'waterway' in self.keys:
+            return 'waterway'
+        
+        present = {token for token in self._tokens if token in name}
+        best_key = None
+        best_length = 0
+        for key, parts, length in self._parts:
+            if length > best_length and parts <= present:
+                best_key, best_length = key, length
+        return best_key
+
+
+class Footprint:
+    """Oriented rectangle an object covers on the table (x/z plane, TTS units)"""
+    
+    def __init__(self, entry: IndexedObject, half_x: float, half_z: float):
+        transform = entry.world_transform
+        self.entry = entry
+        self.x = transform.get('posX', 0)
+        self.z = transform.get('posZ', 0)
+        self.half_x = half_x
+        self.half_z = half_z
+        
+        # Local x/z axes in world space after rotating about Y
+        rad = math.radians(transform.get('rotY', 0))
+        cos, sin = math.cos(rad), math.sin(rad)
+        self.axes = ((cos, -sin), (sin, cos))
+        
+        # Axis-aligned half extents, used for grid bucketing
+        self.extent_x = abs(half_x * cos) + abs(half_z * sin)
+        self.extent_z = abs(half_x * sin) + abs(half_z * cos)
+    
+    def _radius(self, axis: Tuple[float, float]) -> float:
+        (ux, uz), (vx, vz) = self.axes
+        return (self.half_x * abs(ux * axis[0] + uz * axis[1]) +
+                self.half_z * abs(vx * axis[0] + vz * axis[1]))
+    
+    def overlaps(self, other: 'Footprint', tolerance: float = 0.0) -> bool:
+        """Separating axis test; rectangles must interpenetrate by more than tolerance"""
+        dx, dz = other.x - self.x, other.z - self.z
+        for axis in self.axes + other.axes:
+            distance = abs(dx * axis[0] + dz * axis[1])
+            if distance >= self._radius(axis) + other._radius(axis) - tolerance:
+                return False
+        return True
+
+
+class SpatialGrid:
+    """Uniform grid hash over footprints for finding overlapping pairs.
+    
+    Each footprint is bucketed into every cell its bounding box touches,
+    so only footprints sharing a cell are compared - roughly linear for
+    evenly sized pieces instead of testing all pairs.
+    """
+    
+    def __init__(self, footprints: List[Footprint]):
+        self.footprints = footprints
+        largest = max((max(fp.extent_x, fp.extent_z) for fp in footprints), default=0.0)
+        self.cell_size = max(2.0 * largest, 1e-6)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        
+        for i, fp in enumerate(footprints):
+            for cell in self._cells(fp):
+                self.cells.setdefault(cell, []).append(i)
+    
+    def _cells(self, fp: Footprint) -> Iterator[Tuple[int, int]]:
+        size = self.cell_size
+        x0 = math.floor((fp.x - fp.extent_x) / size)
+        x1 = math.floor((fp.x + fp.extent_x) / size)
+        z0 = math.floor((fp.z - fp.extent_z) / size)
+        z1 = math.floor((fp.z + fp.extent_z) / size)
+        for cx in range(x0, x1 + 1):
+            for cz in range(z0, z1 + 1):
+                yield cx, cz
+    
+    def overlapping_pairs(self, tolerance: float = 0.0) -> List[Tuple[Footprint, Footprint]]:
+        """Every pair of overlapping footprints, in save order"""
+        tested = set()
+        found = []
+        for members in self.cells.values():
+            for a in range(len(members)):
+                for b in range(a + 1, len(members)):
+                    pair = (members[a], members[b])
+                    if pair in tested:
+                        continue
+                    tested.add(pair)
+                    first, second = self.footprints[pair[0]], self.footprints[pair[1]]
+                    if first.overlaps(second, tolerance):
+                        found.append(pair)
+        return [(self.footprints[i], self.footprints[j]) for i, j in sorted(found)]
+
+
+class Finding:
+    """One structured check result; the text report is rendered from these"""
+    
+    PREFIXES = {'error': '✗', 'warning': '⚠', 'info': '✓'}
+    
+    def __init__(self, check: str, severity: str, message: str,
+                 entry: Optional[IndexedObject] = None, measured: Any = None,
+                 expected: Any = None, detail: bool = False):
+        self.check = check
+        self.severity = severity
+        self.message = message
+        self.nickname = entry.nickname if entry is not None else None
+        self.guid = entry.data.get('GUID') if entry is not None else None
+        self.measured = measured
+        self.expected = expected
+        self.detail = detail  # Per-object line under a summary finding
+    
+    @property
+    def text(self) -> str:
+        """The line shown in the terminal report"""
+        if self.detail:
+            return f"  - {self.message}"
+        return f"{self.PREFIXES[self.severity]} {self.message}"
+    
+    def to_dict(self) -> Dict:
+        return {
+            'check': self.check,
+            'severity': self.severity,
+            'message': self.message,
+            'nickname': self.nickname,
+            'guid': self.guid,
+            'measured': _plain(self.measured),
+            'expected': _plain(self.expected),
+            'detail': self.detail,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Finding':
+        finding = cls(data['check'], data['severity'], data['message'],
+                      measured=data.get('measured'), expected=data.get('expected'),
+                      detail=data.get('detail', False))
+        finding.nickname = data.get('nickname')
+        finding.guid = data.get('guid')
+        return finding
+
+
+def _plain(value: Any) -> Any:
+    """JSON-safe copy of a measured/expected value (tuples, NumPy scalars)"""
+    if isinstance(value, (tuple, list)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+class CheckSpec:
+    """A registered check and the inputs it reads.
+    
+    kinds are the IndexedObject kinds the check looks up by kind, fields
+    the object keys it reads, and after names checks that must run first
+    when both are selected. run is called with the framework instance, so
+    test_* methods and plain plugin functions register the same way.
+    """
+    
+    def __init__(self, name: str, title: str, run, tags: Iterable[str] = (),
+                 kinds: Iterable[str] = (), fields: Iterable[str] = (),
+                 after: Iterable[str] = ()):
+        self.name = name
+        self.title = title
+        self.run = run
+        self.tags = frozenset(tags)
+        self.kinds = tuple(kinds)
+        self.fields = tuple(fields)
+        self.after = tuple(after)
+    
+    def matches(self, selector: str) -> bool:
+        """Selected by full name, name without 'test_', or tag"""
+        return selector in (self.name, self.name[len('test_'):]) or selector in self.tags
+
+
+class CheckRegistry:
+    """Checks in registration order, selectable by name or tag"""
+    
+    def __init__(self):
+        self.specs: Dict[str, CheckSpec] = {}
+    
+    def register(self, title: str, name: Optional[str] = None, **declared):
+        """Decorator registering a check function under its (or the given) name"""
+        def decorator(func):
+            check = name or func.__name__
+            self.specs[check] = CheckSpec(check, title, func, **declared)
+            return func
+        return decorator
+    
+    def number(self, name: str) -> int:
+        """1-based position in registration order, used in report headers"""
+        return list(self.specs).index(name) + 1
+    
+    def select(self, only: Optional[Iterable[str]] = None) -> List[CheckSpec]:
+        """Checks matching any selector (all when only is empty), in run order.
+        
+        Registration order, except that a check runs after every selected
+        check named in its after list. Raises ValueError for selectors that
+        match nothing and for cyclic orderings.
+        """
+        only = list(only or ())
+        unknown = [s for s in only if not any(spec.matches(s) for spec in self.specs.values())]
+        if unknown:
+            raise ValueError(f"Unknown check or tag: {', '.join(unknown)}")
+        selected = {name: spec for name, spec in self.specs.items()
+                    if not only or any(spec.matches(s) for s in only)}
+        
+        ordered: List[CheckSpec] = []
+        placed = set()
+        pending = list(selected.values())
+        while pending:
+            ready = next((spec for spec in pending
+                          if all(dep in placed or dep not in selected for dep in spec.after)), None)
+            if ready is None:
+                raise ValueError(f"Cyclic check ordering among: {', '.join(s.name for s in pending)}")
+            pending.remove(ready)
+            ordered.append(ready)
+            placed.add(ready.name)
+        return ordered
+
+
+# Built-in checks; plugins register more with @CHECK_REGISTRY.register(...)
+CHECK_REGISTRY = CheckRegistry()
+
+
+def load_rules(path: str) -> Dict[str, Any]:
+    """Read a rule set (JSON object of UPPERCASE rule overrides) from a file.
+    
+    An optional "checks" list selects checks by name or tag, like --only.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict):
+        raise ValueError(f"{path}: rule set must be a JSON object")
+    return rules
+
+
 class TTSTestFramework:
     """Test framework for validating DBR TTS save files"""
     
-    def __init__(self, save_file_path: str):
+    # Checks available to this framework; instances run a selection of them
+    registry = CHECK_REGISTRY
+    
+    # Use NumPy array checks (when installed) from this many objects upwards
+    VECTORIZE_MIN_OBJECTS = 64
+    
+    # DBR terrain size rules (in feet on 6x4 table)
+    # These are the ACTUAL physical dimensions after scale is applied
+    DBR_TERRAIN_SIZES = {
+        # Area terrain (organic boundaries)
+        'bua_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},  # 6-12 inches
+        'bua_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},  # 9-18 inches
+        'bua_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},  # 12-24 inches
+        
+        'wood_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
+        'wood_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
+        'wood_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
+        
+        'marsh_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
+        'marsh_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
+        'marsh_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
+        
+        'hill_gentle_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
+        'hill_gentle_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
+        'hill_gentle_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
+        
+        'hill_steep_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
+        'hill_steep_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
+        'hill_steep_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
+        
+        'ploughedfield_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
+        'ploughedfield_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
+        'ploughedfield_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
+        
+        'rockyground_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
+        'rockyground_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
+        'rockyground_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
+        
+        'enclosure_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
+        'enclosure_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
+        'enclosure_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
+        
+        # Linear terrain
+        'river': {'min': 0.25, 'max': 1.0, 'typical': 0.5},  # 3-12 inches wide
+        'stream': {'min': 0.1, 'max': 0.5, 'typical': 0.25},  # 1-6 inches wide
+        'road': {'min': 0.15, 'max': 0.5, 'typical': 0.25},  # 2-6 inches wide
+        'ford': {'min': 0.25, 'max': 0.75, 'typical': 0.5},
+        'pond': {'min': 0.5, 'max': 1.5, 'typical': 1.0},
+        'lake': {'min': 1.0, 'max': 3.0, 'typical': 2.0},
+        
+        # Fortifications
+        'fortification': {'min': 0.5, 'max': 2.0, 'typical': 1.0},
+        
+        # Waterway features (4 feet long × 0.5-2 feet wide coastline)
+        'waterway': {'min': 2.0, 'max': 6.0, 'typical': 4.0},  # Length (up to 6 feet for large features)
+        'coastline': {'min': 2.0, 'max': 6.0, 'typical': 4.0},  # Same as waterway
+    }
+    
+    # Estimated base dimensions for different terrain types (in TTS units before scale)
+    # These are rough estimates - the actual check is against final physical size
+    TERRAIN_BASE_SIZES = {
+        'default': 100.0,  # Most terrain models are ~100 units base size
+        'waterway': 100.0,  # Coastline waterway base is ~100 units (4 feet at scale 4.0)
+        'coastline': 100.0,  # Same as waterway
+    }
+    
+    def __init__(self, save_file_path: str, streaming: bool = False, cache=None,
+                 trace_memory: bool = False, profile_path: Optional[str] = None,
+                 url_resolver=None, mesh_loader=None, rules: Optional[Dict[str, Any]] = None,
+                 only: Optional[Iterable[str]] = None):
         self.save_file_path = save_file_path
+        self.streaming = streaming
+        self.cache = cache  # Optional result_cache.ResultCache
+        self.trace_memory = trace_memory  # Peak memory per check via tracemalloc (slow)
+        self.profile_path = profile_path  # cProfile stats dump for the whole run
+        self.url_resolver = url_resolver  # Optional url_resolver.UrlResolver
+        self.mesh_loader = mesh_loader  # Optional mesh_loader.MeshLoader
         self.save_data = None
-        self.errors = []
-        self.warnings = []
-        self.info = []
+        self.index: Optional[ObjectIndex] = None
+        self.has_object_states = False
+        self.findings: List[Finding] = []
+        self.check_results: Dict[str, List[Finding]] = {}
+        self.current_check = 'load'
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.objects_visited = 0
         
         # Expected configuration (from Memory ID: 13378506)
         self.EXPECTED_MAIN_TABLE = {
@@ -79,84 +835,197 @@ class TTSTestFramework:
             'y': 2.0
         }
         
+        # Footprints for overlap checks. Unit models are built in mm, so the
+        # base width in TTS units is the mm size times scaleX (40mm * UNIT_SCALE)
+        self.UNIT_BASE_MM = {'width': 40.0, 'depth': 20.0}  # Shallowest DBR base
+        self.OVERLAP_TOLERANCE = 0.05  # Bases in contact may touch, not interpenetrate
+        
+        # Playing surface half extents at scale 1 (grass_table_6x4.obj, 1 unit = 1 inch)
+        self.PLAYING_SURFACE = {'half_x': 36.0, 'half_z': 24.0}
+        
+        # Measured main table surface (mesh bounding box times scale) in feet
+        self.MAIN_TABLE_SURFACE_FEET = {'x': 6.0, 'z': 4.0}
+        self.MAIN_TABLE_SURFACE_TOLERANCE = 0.05  # 0.6 inches
+        
+        # Surface overlap checks use; replaced by the measured mesh when checked
+        self.playing_surface = dict(self.PLAYING_SURFACE)
+        
+        rules = dict(rules or {})
+        configured = rules.pop('checks', None)
+        self.apply_rules(rules)
+        self.specs = self.registry.select(only or configured)
+        self.checks = [spec.name for spec in self.specs]
+        self._terrain_matcher: Optional[TerrainMatcher] = None
+    
+    def apply_rules(self, rules: Dict[str, Any]):
+        """Override rule constants; dict rules are merged key by key.
+        
+        Raises ValueError for names that are not rules of this framework.
+        """
+        for name, value in rules.items():
+            current = getattr(self, name, None)
+            if not name.isupper() or current is None or callable(current):
+                raise ValueError(f"Unknown rule: {name}")
+            if isinstance(current, dict) and isinstance(value, dict):
+                value = {**current, **value}
+            setattr(self, name, value)
+    
+    @property
+    def terrain_matcher(self) -> TerrainMatcher:
+        """Compiled once per set of terrain rule keys and shared across instances"""
+        if self._terrain_matcher is None:
+            self._terrain_matcher = TerrainMatcher.for_rules(self.DBR_TERRAIN_SIZES)
+        return self._terrain_matcher
+    
+    def _index_options(self) -> Dict:
+        """Fields and kinds the selected checks read, for building the index"""
+        fields = {'Name', 'Nickname', 'GUID'}
+        kinds = set()
+        for spec in self.specs:
+            fields.update(spec.fields)
+            kinds.update(spec.kinds)
+        return {'fields': tuple(f for f in INDEXED_FIELDS if f in fields), 'kinds': kinds}
+        
+    @property
+    def errors(self) -> List[str]:
+        return [f.text for f in self.findings if f.severity == 'error']
+    
+    @property
+    def warnings(self) -> List[str]:
+        return [f.text for f in self.findings if f.severity == 'warning']
+    
+    @property
+    def info(self) -> List[str]:
+        return [f.text for f in self.findings if f.severity == 'info']
+    
+    def report(self, severity: str, message: str, entry: Optional[IndexedObject] = None,
+               measured: Any = None, expected: Any = None, detail: bool = False):
+        """Record a finding against the check currently running"""
+        self.findings.append(Finding(self.current_check, severity, message,
+                                     entry, measured, expected, detail))
+    
+    def _visit(self, entries):
+        """Count objects a check reads, for the timing report"""
+        self.objects_visited += len(entries)
+        return entries
+    
+    @contextlib.contextmanager
+    def measure(self, phase: str):
+        """Record wall/CPU time, objects visited and peak memory for a phase"""
+        self.objects_visited = 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timing = {
+                'wall': time.perf_counter() - wall,
+                'cpu': time.process_time() - cpu,
+                'objects': self.objects_visited,
+            }
+            if self.trace_memory:
+                timing['peak_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+            self.timings[phase] = timing
+    
     def load_save_file(self) -> bool:
         """Load and parse the save file"""
         try:
-            with open(self.save_file_path, 'r') as f:
-                self.save_data = json.load(f)
-            self.info.append(f"✓ Loaded save file: {os.path.basename(self.save_file_path)}")
+            if self.streaming:
+                self._stream_save_file()
+            else:
+                with open(self.save_file_path, 'r') as f:
+                    save_data = json.load(f)
+                self.has_object_states = 'ObjectStates' in save_data
+                self.index = ObjectIndex(save_data.get('ObjectStates', []), slim=True,
+                                         **self._index_options())
+                # Only the compact index and metadata outlive the parsed tree
+                self.save_data = {key: save_data[key] for key in SAVE_FIELDS if key in save_data}
+            self.report('info', f"Loaded save file: {os.path.basename(self.save_file_path)}")
+            self._visit(self.index.objects)
             return True
         except FileNotFoundError:
-            self.errors.append(f"✗ Save file not found: {self.save_file_path}")
+            self.report('error', f"Save file not found: {self.save_file_path}")
             return False
         except json.JSONDecodeError as e:
-            self.errors.append(f"✗ Invalid JSON: {e}")
+            self.report('error', f"Invalid JSON: {e}")
             return False
     
+    def _stream_save_file(self):
+        """Load incrementally, indexing each object as it is decoded.
+        
+        save_data receives the SAVE_FIELDS members only; ObjectStates goes
+        straight into a slim index and is never held as a whole.
+        """
+        self.save_data = {}
+        self.index = ObjectIndex(slim=True, **self._index_options())
+        
+        for key, value in iter_save_stream(self.save_file_path):
+            if key == 'ObjectStates':
+                self.has_object_states = True
+                if isinstance(value, dict):  # Not the empty-array marker
+                    self.index.add(value)
+            elif key in SAVE_FIELDS:
+                self.save_data[key] = value
+    
+    def _vectorized(self, entries: List[IndexedObject]) -> bool:
+        """Whether to check these objects with NumPy array operations"""
+        return np is not None and len(entries) >= self.VECTORIZE_MIN_OBJECTS
+    
+    @CHECK_REGISTRY.register("Save File Metadata", tags=('metadata',))
     def test_save_metadata(self):
         """Test 1: Validate save file metadata"""
-        print(f"\n{Color.BOLD}Test 1: Save File Metadata{Color.END}")
-        
         # Check SaveName has timestamp
         save_name = self.save_data.get('SaveName', '')
         if not save_name:
-            self.errors.append("✗ Missing SaveName field")
+            self.report('error', "Missing SaveName field", expected='SaveName')
         elif ' - ' not in save_name or not any(char.isdigit() for char in save_name[-20:]):
-            self.warnings.append("⚠ SaveName may be missing timestamp")
+            self.report('warning', "SaveName may be missing timestamp", measured=save_name)
         else:
-            self.info.append(f"✓ SaveName: {save_name}")
+            self.report('info', f"SaveName: {save_name}", measured=save_name)
         
         # Check ObjectStates exists
-        if 'ObjectStates' not in self.save_data:
-            self.errors.append("✗ Missing ObjectStates array")
+        if not self.has_object_states:
+            self.report('error', "Missing ObjectStates array", expected='ObjectStates')
             return
         
-        obj_count = len(self.save_data['ObjectStates'])
-        self.info.append(f"✓ Total objects: {obj_count}")
+        obj_count = len(self._visit(self.index.top_level))
+        self.report('info', f"Total objects: {obj_count}", measured=obj_count)
         
         if obj_count < 35:
-            self.warnings.append(f"⚠ Low object count: {obj_count} (expected 40+)")
+            self.report('warning', f"Low object count: {obj_count} (expected 40+)",
+                        measured=obj_count, expected=40)
     
+    @CHECK_REGISTRY.register("Table Configuration", tags=('tables',), kinds=('table',),
+                             fields=('Transform', 'Locked', 'CustomMesh'))
     def test_table_configuration(self):
         """Test 2: Validate table dimensions and properties"""
-        print(f"\n{Color.BOLD}Test 2: Table Configuration{Color.END}")
-        
-        tables = {
-            'main': None,
-            'left': None,
-            'right': None
-        }
-        
-        for obj in self.save_data['ObjectStates']:
-            nickname = obj.get('Nickname', '').lower()
-            if 'main' in nickname and 'table' in nickname:
-                tables['main'] = obj
-            elif 'left' in nickname and 'table' in nickname:
-                tables['left'] = obj
-            elif 'right' in nickname and 'table' in nickname:
-                tables['right'] = obj
+        tables = self.index.tables
+        self._visit([t for t in tables.values() if t])
         
         # Check main table
         if not tables['main']:
-            self.errors.append("✗ Main table not found")
+            self.report('error', "Main table not found")
         else:
             self._validate_table(tables['main'], self.EXPECTED_MAIN_TABLE, "Main")
+            if self.mesh_loader:
+                self._validate_table_mesh(tables['main'])
         
         # Check left table
         if not tables['left']:
-            self.errors.append("✗ Left side table not found")
+            self.report('error', "Left side table not found")
         else:
             self._validate_table(tables['left'], self.EXPECTED_LEFT_TABLE, "Left")
         
         # Check right table
         if not tables['right']:
-            self.errors.append("✗ Right side table not found")
+            self.report('error', "Right side table not found")
         else:
             self._validate_table(tables['right'], self.EXPECTED_RIGHT_TABLE, "Right")
     
-    def _validate_table(self, table: Dict, expected: Dict, name: str):
+    def _validate_table(self, table: IndexedObject, expected: Dict, name: str):
         """Validate a single table configuration"""
-        transform = table.get('Transform', {})
+        transform = table.transform
         
         # Check position
         pos_x = transform.get('posX', 0)
@@ -165,9 +1034,10 @@ class TTSTestFramework:
         
         exp_pos = expected['position']
         if abs(pos_x - exp_pos['x']) > 0.1 or abs(pos_y - exp_pos['y']) > 0.1 or abs(pos_z - exp_pos['z']) > 0.1:
-            self.errors.append(f"✗ {name} table position incorrect: ({pos_x}, {pos_y}, {pos_z}) != ({exp_pos['x']}, {exp_pos['y']}, {exp_pos['z']})")
+            self.report('error', f"{name} table position incorrect: ({pos_x}, {pos_y}, {pos_z}) != ({exp_pos['x']}, {exp_pos['y']}, {exp_pos['z']})",
+                        table, measured=(pos_x, pos_y, pos_z), expected=(exp_pos['x'], exp_pos['y'], exp_pos['z']))
         else:
-            self.info.append(f"✓ {name} table position correct")
+            self.report('info', f"{name} table position correct", table)
         
         # Check scale
         scale_x = transform.get('scaleX', 1)
@@ -176,190 +1046,160 @@ class TTSTestFramework:
         
         exp_scale = expected['scale']
         if abs(scale_x - exp_scale['x']) > 0.1 or abs(scale_y - exp_scale['y']) > 0.1 or abs(scale_z - exp_scale['z']) > 0.1:
-            self.errors.append(f"✗ {name} table scale incorrect: ({scale_x}, {scale_y}, {scale_z}) != ({exp_scale['x']}, {exp_scale['y']}, {exp_scale['z']})")
+            self.report('error', f"{name} table scale incorrect: ({scale_x}, {scale_y}, {scale_z}) != ({exp_scale['x']}, {exp_scale['y']}, {exp_scale['z']})",
+                        table, measured=(scale_x, scale_y, scale_z), expected=(exp_scale['x'], exp_scale['y'], exp_scale['z']))
         else:
-            self.info.append(f"✓ {name} table scale correct")
+            self.report('info', f"{name} table scale correct", table)
         
         # Check locked
-        if name == "Main" and not table.get('Locked', False):
-            self.warnings.append(f"⚠ {name} table should be locked")
+        if name == "Main" and not table.data.get('Locked', False):
+            self.report('warning', f"{name} table should be locked", table, measured=False, expected=True)
+    
+    def _validate_table_mesh(self, table: IndexedObject):
+        """Measure the main table's mesh and check the scaled surface is 6x4 ft"""
+        from mesh_loader import MeshFormatError
+        
+        mesh_url = table.data.get('CustomMesh', {}).get('MeshURL', '')
+        if not mesh_url:
+            self.report('error', "Main table has no MeshURL", table, expected='MeshURL')
+            return
+        try:
+            width, _, depth = self.mesh_loader.load_url(mesh_url).extents()
+        except (OSError, MeshFormatError) as e:
+            self.report('error', f"Main table mesh unreadable: {e}", table, measured=mesh_url)
+            return
+        
+        # 1 TTS unit = 1 inch
+        transform = table.transform
+        size_x = width * transform.get('scaleX', 1) / 12
+        size_z = depth * transform.get('scaleZ', 1) / 12
+        expected = self.MAIN_TABLE_SURFACE_FEET
+        # Overlap checks bound terrain by the surface actually measured
+        self.playing_surface = {'half_x': width / 2, 'half_z': depth / 2}
+        
+        if (abs(size_x - expected['x']) > self.MAIN_TABLE_SURFACE_TOLERANCE or
+                abs(size_z - expected['z']) > self.MAIN_TABLE_SURFACE_TOLERANCE):
+            self.report('error', f"Main table surface {size_x:.2f} x {size_z:.2f} ft "
+                                 f"!= {expected['x']} x {expected['z']} ft",
+                        table, measured=(size_x, size_z), expected=(expected['x'], expected['z']))
+        else:
+            self.report('info', f"Main table surface measures {size_x:.2f} x {size_z:.2f} ft",
+                        table, measured=(size_x, size_z))
     
+    @CHECK_REGISTRY.register("Asset Placement", tags=('units', 'placement'), kinds=('unit',),
+                             fields=('Transform',))
     def test_asset_placement(self):
         """Test 3: Validate asset placement on tables"""
-        print(f"\n{Color.BOLD}Test 3: Asset Placement{Color.END}")
-        
-        units_on_table = []
+        units = self._visit(self.index.of_kind('unit', loose_only=True))
+        bounds = self.RIGHT_TABLE_BOUNDS
+        units_on_table = 0
         units_off_table = []
         
-        for obj in self.save_data['ObjectStates']:
-            if obj.get('Name') == 'Custom_AssetBundle':
-                nickname = obj.get('Nickname', '')
-                
-                # Skip terrain (in bag) and tools
-                if any(word in nickname.lower() for word in ['terrain', 'tool']):
-                    continue
-                
-                transform = obj.get('Transform', {})
+        if self._vectorized(units):
+            # Bounds test over all unit positions at once
+            x, y, z = self.index.transform_columns(units, 'posX', 'posY', 'posZ').T
+            on_table = ((bounds['x_min'] <= x) & (x <= bounds['x_max']) &
+                        (bounds['z_min'] <= z) & (z <= bounds['z_max']) &
+                        (np.abs(y - bounds['y']) < 0.5))
+            units_on_table = int(np.count_nonzero(on_table))
+            units_off_table = [(units[i], x[i], y[i], z[i])
+                               for i in np.flatnonzero(~on_table)]
+        else:
+            # Loose units only (terrain lives in bags, tools are excluded)
+            for unit in units:
+                transform = unit.world_transform
                 x = transform.get('posX', 0)
                 z = transform.get('posZ', 0)
                 y = transform.get('posY', 0)
                 
                 # Check if on right side table
-                bounds = self.RIGHT_TABLE_BOUNDS
                 if (bounds['x_min'] <= x <= bounds['x_max'] and 
                     bounds['z_min'] <= z <= bounds['z_max'] and
                     abs(y - bounds['y']) < 0.5):
-                    units_on_table.append(nickname)
+                    units_on_table += 1
                 else:
-                    units_off_table.append((nickname, x, y, z))
+                    units_off_table.append((unit, x, y, z))
         
-        self.info.append(f"✓ Units on right table: {len(units_on_table)}")
+        self.report('info', f"Units on right table: {units_on_table}", measured=units_on_table)
         
         if units_off_table:
-            self.warnings.append(f"⚠ Units off table or falling: {len(units_off_table)}")
-            for name, x, y, z in units_off_table[:5]:  # Show first 5
-                self.warnings.append(f"  - {name} at ({x:.1f}, {y:.1f}, {z:.1f})")
+            self.report('warning', f"Units off table or falling: {len(units_off_table)}",
+                        measured=len(units_off_table), expected=0)
+            for unit, x, y, z in units_off_table[:5]:  # Show first 5
+                self.report('warning', f"{unit.nickname} at ({x:.1f}, {y:.1f}, {z:.1f})",
+                            unit, measured=(x, y, z), expected=bounds, detail=True)
     
+    @CHECK_REGISTRY.register("Unit Scaling", tags=('units', 'scale'), kinds=('unit', 'tool'),
+                             fields=('Transform',))
     def test_unit_scaling(self):
         """Test 4: Validate unit scaling (40mm bases)"""
-        print(f"\n{Color.BOLD}Test 4: Unit Scaling{Color.END}")
-        
+        # Loose units and tools share the 40mm base scale; terrain is skipped
+        units = self._visit(self.index.of_kind('unit', 'tool', loose_only=True))
         incorrectly_scaled = []
         correctly_scaled = 0
         
-        for obj in self.save_data['ObjectStates']:
-            if obj.get('Name') == 'Custom_AssetBundle':
-                nickname = obj.get('Nickname', '')
-                
-                # Skip terrain
-                if 'terrain' in nickname.lower():
-                    continue
-                
-                transform = obj.get('Transform', {})
-                scale = transform.get('scaleX', 0)
+        if self._vectorized(units):
+            scales = self.index.transform_columns(units, 'scaleX')[:, 0]
+            wrong = np.abs(scales - self.UNIT_SCALE) > self.UNIT_SCALE_TOLERANCE
+            incorrectly_scaled = [(units[i], scales[i]) for i in np.flatnonzero(wrong)]
+            correctly_scaled = len(units) - len(incorrectly_scaled)
+        else:
+            for obj in units:
+                scale = obj.transform.get('scaleX', 0)
                 
                 if abs(scale - self.UNIT_SCALE) > self.UNIT_SCALE_TOLERANCE:
-                    incorrectly_scaled.append((nickname, scale))
+                    incorrectly_scaled.append((obj, scale))
                 else:
                     correctly_scaled += 1
         
-        self.info.append(f"✓ Correctly scaled units: {correctly_scaled}")
+        self.report('info', f"Correctly scaled units: {correctly_scaled}", measured=correctly_scaled)
         
         if incorrectly_scaled:
-            self.errors.append(f"✗ Incorrectly scaled units: {len(incorrectly_scaled)}")
-            for name, scale in incorrectly_scaled[:5]:  # Show first 5
-                self.errors.append(f"  - {name}: {scale:.4f} (expected {self.UNIT_SCALE})")
+            self.report('error', f"Incorrectly scaled units: {len(incorrectly_scaled)}",
+                        measured=len(incorrectly_scaled), expected=0)
+            for unit, scale in incorrectly_scaled[:5]:  # Show first 5
+                self.report('error', f"{unit.nickname}: {scale:.4f} (expected {self.UNIT_SCALE})",
+                            unit, measured=scale, expected=self.UNIT_SCALE, detail=True)
+        
+        # Alternate States of a loose unit share its base but are not extra units,
+        # so only their scale is checked and they are not counted above
+        wrong_variants = []
+        for variant in self._visit(self.index.variants_of_kind('unit', 'tool')):
+            scale = variant.transform.get('scaleX', 0)
+            if abs(scale - self.UNIT_SCALE) > self.UNIT_SCALE_TOLERANCE:
+                wrong_variants.append((variant, scale))
+        
+        if wrong_variants:
+            self.report('error', f"Incorrectly scaled unit states: {len(wrong_variants)}",
+                        measured=len(wrong_variants), expected=0)
+            for variant, scale in wrong_variants[:5]:  # Show first 5
+                self.report('error', f"{variant.variant_of.nickname} state {variant.nickname}: "
+                                     f"{scale:.4f} (expected {self.UNIT_SCALE})",
+                            variant, measured=scale, expected=self.UNIT_SCALE, detail=True)
     
+    @CHECK_REGISTRY.register("Terrain Scaling (Physical Size)", tags=('terrain', 'scale'),
+                             kinds=('terrain',), fields=('Transform',))
     def test_terrain_scaling(self):
         """Test 5: Validate terrain scaling based on ACTUAL PHYSICAL SIZE in DBR rules"""
-        print(f"\n{Color.BOLD}Test 5: Terrain Scaling (Physical Size){Color.END}")
-        
-        # DBR terrain size rules (in feet on 6x4 table)
-        # These are the ACTUAL physical dimensions after scale is applied
-        DBR_TERRAIN_SIZES = {
-            # Area terrain (organic boundaries)
-            'bua_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},  # 6-12 inches
-            'bua_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},  # 9-18 inches
-            'bua_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},  # 12-24 inches
-            
-            'wood_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
-            'wood_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
-            'wood_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
-            
-            'marsh_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
-            'marsh_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
-            'marsh_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
-            
-            'hill_gentle_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
-            'hill_gentle_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
-            'hill_gentle_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
-            
-            'hill_steep_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
-            'hill_steep_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
-            'hill_steep_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
-            
-            'ploughedfield_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
-            'ploughedfield_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
-            'ploughedfield_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
-            
-            'rockyground_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
-            'rockyground_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
-            'rockyground_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
-            
-            'enclosure_small': {'min': 0.5, 'max': 1.0, 'typical': 0.75},
-            'enclosure_medium': {'min': 0.75, 'max': 1.5, 'typical': 1.0},
-            'enclosure_large': {'min': 1.0, 'max': 2.0, 'typical': 1.5},
-            
-            # Linear terrain
-            'river': {'min': 0.25, 'max': 1.0, 'typical': 0.5},  # 3-12 inches wide
-            'stream': {'min': 0.1, 'max': 0.5, 'typical': 0.25},  # 1-6 inches wide
-            'road': {'min': 0.15, 'max': 0.5, 'typical': 0.25},  # 2-6 inches wide
-            'ford': {'min': 0.25, 'max': 0.75, 'typical': 0.5},
-            'pond': {'min': 0.5, 'max': 1.5, 'typical': 1.0},
-            'lake': {'min': 1.0, 'max': 3.0, 'typical': 2.0},
-            
-            # Fortifications
-            'fortification': {'min': 0.5, 'max': 2.0, 'typical': 1.0},
-            
-            # Waterway features (4 feet long × 0.5-2 feet wide coastline)
-            'waterway': {'min': 2.0, 'max': 6.0, 'typical': 4.0},  # Length (up to 6 feet for large features)
-            'coastline': {'min': 2.0, 'max': 6.0, 'typical': 4.0},  # Same as waterway
-        }
-        
-        # Estimated base dimensions for different terrain types (in TTS units before scale)
-        # These are rough estimates - the actual check is against final physical size
-        TERRAIN_BASE_SIZES = {
-            'default': 100.0,  # Most terrain models are ~100 units base size
-            'waterway': 100.0,  # Coastline waterway base is ~100 units (4 feet at scale 4.0)
-            'coastline': 100.0,  # Same as waterway
-        }
-        
         terrain_pieces = []
         terrain_correct = []
         terrain_too_small = []
         terrain_too_large = []
         
-        for obj in self.save_data['ObjectStates']:
-            # Check in bags too
-            if obj.get('Name') == 'Bag':
-                for contained in obj.get('ContainedObjects', []):
-                    if contained.get('Name') == 'Custom_AssetBundle':
-                        nickname = contained.get('Nickname', '')
-                        if 'terrain' in nickname.lower():
-                            scale = contained.get('Transform', {}).get('scaleX', 0)
-                            terrain_pieces.append((nickname, scale, contained))
-            
-            # Check loose terrain
-            if obj.get('Name') == 'Custom_AssetBundle':
-                nickname = obj.get('Nickname', '')
-                if 'terrain' in nickname.lower():
-                    scale = obj.get('Transform', {}).get('scaleX', 0)
-                    terrain_pieces.append((nickname, scale, obj))
+        # Loose terrain and terrain at any depth inside bags
+        for terrain in self._visit(self.index.of_kind('terrain')):
+            scale = terrain.transform.get('scaleX', 0)
+            terrain_pieces.append((terrain.nickname, scale, terrain))
         
         # Check terrain physical sizes
         for name, scale, obj in terrain_pieces:
-            name_lower = name.lower().replace(' ', '').replace('terrain', '')
-            
             # Determine terrain type and size
-            terrain_key = None
-            base_size = TERRAIN_BASE_SIZES['default']
-            
-            # Match terrain type
-            for key in DBR_TERRAIN_SIZES.keys():
-                key_parts = key.split('_')
-                # Check if all parts of key are in the name
-                if all(part in name_lower for part in key_parts):
-                    terrain_key = key
-                    break
-            
-            # Special case for waterways
-            if 'waterway' in name_lower or 'coastline' in name_lower:
-                terrain_key = 'waterway'
-                base_size = TERRAIN_BASE_SIZES['waterway']
+            terrain_key = self.terrain_matcher.resolve(name)
+            base_size = self.TERRAIN_BASE_SIZES.get(terrain_key, self.TERRAIN_BASE_SIZES['default'])
             
             # If we found a matching terrain type, validate size
             if terrain_key:
-                size_rules = DBR_TERRAIN_SIZES[terrain_key]
+                size_rules = self.DBR_TERRAIN_SIZES[terrain_key]
                 
                 # Calculate physical size in feet (TTS scale * base_size / 100)
                 # Approximate conversion: 100 TTS units ≈ 1 foot at scale 1.0
@@ -369,9 +1209,9 @@ class TTSTestFramework:
                 max_size = size_rules['max']
                 
                 if physical_size < min_size:
-                    terrain_too_small.append((name, scale, physical_size, min_size, max_size))
+                    terrain_too_small.append((obj, scale, physical_size, min_size, max_size))
                 elif physical_size > max_size:
-                    terrain_too_large.append((name, scale, physical_size, min_size, max_size))
+                    terrain_too_large.append((obj, scale, physical_size, min_size, max_size))
                 else:
                     terrain_correct.append((name, scale, physical_size))
             else:
@@ -380,27 +1220,31 @@ class TTSTestFramework:
                 if 0.1 <= physical_size <= 3.0:  # Between 1 inch and 3 feet
                     terrain_correct.append((name, scale, physical_size))
                 else:
-                    self.warnings.append(f"⚠ {name}: unusual size {physical_size:.2f} feet (scale {scale:.3f})")
+                    self.report('warning', f"{name}: unusual size {physical_size:.2f} feet (scale {scale:.3f})",
+                                obj, measured=physical_size, expected=(0.1, 3.0))
         
-        self.info.append(f"✓ Total terrain pieces: {len(terrain_pieces)}")
-        self.info.append(f"✓ Correctly sized terrain: {len(terrain_correct)}")
+        self.report('info', f"Total terrain pieces: {len(terrain_pieces)}", measured=len(terrain_pieces))
+        self.report('info', f"Correctly sized terrain: {len(terrain_correct)}", measured=len(terrain_correct))
         
         if terrain_too_small:
-            self.errors.append(f"✗ Terrain pieces TOO SMALL for DBR: {len(terrain_too_small)}")
-            for name, scale, phys, min_s, max_s in terrain_too_small[:5]:
-                self.errors.append(f"  - {name}: {phys:.2f}ft (scale {scale:.3f}) < min {min_s:.2f}ft")
+            self.report('error', f"Terrain pieces TOO SMALL for DBR: {len(terrain_too_small)}",
+                        measured=len(terrain_too_small), expected=0)
+            for terrain, scale, phys, min_s, max_s in terrain_too_small[:5]:
+                self.report('error', f"{terrain.nickname}: {phys:.2f}ft (scale {scale:.3f}) < min {min_s:.2f}ft",
+                            terrain, measured=phys, expected=(min_s, max_s), detail=True)
         
         if terrain_too_large:
-            self.errors.append(f"✗ Terrain pieces TOO LARGE for DBR: {len(terrain_too_large)}")
-            for name, scale, phys, min_s, max_s in terrain_too_large[:5]:
-                self.errors.append(f"  - {name}: {phys:.2f}ft (scale {scale:.3f}) > max {max_s:.2f}ft")
+            self.report('error', f"Terrain pieces TOO LARGE for DBR: {len(terrain_too_large)}",
+                        measured=len(terrain_too_large), expected=0)
+            for terrain, scale, phys, min_s, max_s in terrain_too_large[:5]:
+                self.report('error', f"{terrain.nickname}: {phys:.2f}ft (scale {scale:.3f}) > max {max_s:.2f}ft",
+                            terrain, measured=phys, expected=(min_s, max_s), detail=True)
     
+    @CHECK_REGISTRY.register("GitHub URLs", tags=('urls',), fields=('CustomAssetbundle', 'CustomMesh'))
     def test_github_urls(self):
         """Test 6: Validate all assets use GitHub URLs"""
-        print(f"\n{Color.BOLD}Test 6: GitHub URLs{Color.END}")
-        
         local_urls = []
-        github_urls = 0
+        github_refs = []
         
         def check_urls(obj):
             # Check AssetBundles
@@ -408,7 +1252,7 @@ class TTSTestFramework:
                 url = obj.get('CustomAssetbundle', {}).get('AssetbundleURL', '')
                 if url:
                     if url.startswith('http') and 'github' in url:
-                        return 'github'
+                        return ('github', obj.get('Nickname', 'Unknown'), url)
                     else:
                         return ('local', obj.get('Nickname', 'Unknown'), url)
             
@@ -420,13 +1264,13 @@ class TTSTestFramework:
                 results = []
                 if mesh_url:
                     if 'github' in mesh_url:
-                        results.append('github')
+                        results.append(('github', obj.get('Nickname', 'Table'), mesh_url))
                     else:
                         results.append(('local', obj.get('Nickname', 'Table'), mesh_url))
                 
                 if diff_url:
                     if 'github' in diff_url:
-                        results.append('github')
+                        results.append(('github', obj.get('Nickname', 'Table'), diff_url))
                     else:
                         results.append(('local', obj.get('Nickname', 'Table'), diff_url))
                 
@@ -434,85 +1278,206 @@ class TTSTestFramework:
             
             return None
         
-        for obj in self.save_data['ObjectStates']:
-            result = check_urls(obj)
-            if result:
-                if isinstance(result, list):
-                    for r in result:
-                        if r == 'github':
-                            github_urls += 1
-                        else:
-                            local_urls.append(r[1:])  # name, url
-                elif result == 'github':
-                    github_urls += 1
-                elif result[0] == 'local':
-                    local_urls.append(result[1:])  # name, url
-            
-            # Check in bags
-            if obj.get('Name') == 'Bag':
-                for contained in obj.get('ContainedObjects', []):
-                    result = check_urls(contained)
-                    if result == 'github':
-                        github_urls += 1
-                    elif result and result[0] == 'local':
-                        local_urls.append(result[1:])
+        # Loose objects and bag contents alike
+        for obj in self._visit(self.index.objects):
+            result = check_urls(obj.data)
+            if not result:
+                continue
+            for r in (result if isinstance(result, list) else [result]):
+                if r[0] == 'github':
+                    github_refs.append((obj, r[1], r[2]))  # entry, name, url
+                else:
+                    local_urls.append((obj, r[1], r[2]))
+        
+        self.report('info', f"GitHub URLs: {len(github_refs)}", measured=len(github_refs))
         
-        self.info.append(f"✓ GitHub URLs: {github_urls}")
+        if self.url_resolver:
+            self._resolve_github_urls(github_refs)
         
         if local_urls:
-            self.errors.append(f"✗ Local file paths found: {len(local_urls)}")
-            for name, url in local_urls[:5]:
-                self.errors.append(f"  - {name}: {url[:60]}...")
+            self.report('error', f"Local file paths found: {len(local_urls)}",
+                        measured=len(local_urls), expected=0)
+            for entry, name, url in local_urls[:5]:
+                self.report('error', f"{name}: {url[:60]}...", entry, measured=url,
+                            expected='GitHub URL', detail=True)
+    
+    def _resolve_github_urls(self, github_refs: List[Tuple[IndexedObject, str, str]]):
+        """Check that GitHub URLs actually resolve (each unique URL once)"""
+        from url_resolver import partition
+        resolutions = self.url_resolver.resolve_many(url for _, _, url in github_refs)
+        broken = [(entry, name, resolutions[url]) for entry, name, url in github_refs
+                  if resolutions[url].ok is False]
+        resolved, failed, skipped = partition(resolutions.values())
+        
+        self.report('info', f"GitHub URLs via {self.url_resolver.backend.name}: "
+                            f"{len(resolved)} resolved, {len(failed)} failed, {len(skipped)} skipped "
+                            f"of {len(resolutions)} unique", measured=len(resolved))
+        
+        if broken:
+            self.report('error', f"Unresolvable GitHub URLs: {len(broken)}",
+                        measured=len(broken), expected=0)
+            for entry, name, resolution in broken[:5]:
+                self.report('error', f"{name}: {resolution.detail}", entry,
+                            measured=resolution.url, expected='resolvable URL', detail=True)
     
+    @CHECK_REGISTRY.register("Organic Terrain Boundaries", tags=('terrain',))
     def test_organic_terrain(self):
         """Test 7: Check for organic terrain boundaries (informational)"""
-        print(f"\n{Color.BOLD}Test 7: Organic Terrain Boundaries{Color.END}")
-        
         area_terrain_types = [
             'bua', 'wood', 'marsh', 'hill', 'ploughed', 'rocky', 'enclosure'
         ]
         
         area_terrain_count = 0
         
-        for obj in self.save_data['ObjectStates']:
-            if obj.get('Name') == 'Bag':
-                for contained in obj.get('ContainedObjects', []):
-                    nickname = contained.get('Nickname', '').lower()
-                    if any(t in nickname for t in area_terrain_types):
-                        area_terrain_count += 1
+        for contained in self._visit(self.index.in_bags):
+            if any(t in contained.nickname_lower for t in area_terrain_types):
+                area_terrain_count += 1
         
-        self.info.append(f"✓ Area terrain pieces: {area_terrain_count}")
+        self.report('info', f"Area terrain pieces: {area_terrain_count}", measured=area_terrain_count)
         
         if area_terrain_count >= 24:
-            self.info.append(f"✓ All 24 area terrain pieces present (should have organic polygons)")
+            self.report('info', "All 24 area terrain pieces present (should have organic polygons)",
+                        measured=area_terrain_count, expected=24)
         else:
-            self.warnings.append(f"⚠ Expected 24 area terrain pieces, found {area_terrain_count}")
+            self.report('warning', f"Expected 24 area terrain pieces, found {area_terrain_count}",
+                        measured=area_terrain_count, expected=24)
+    
+    @CHECK_REGISTRY.register("Overlapping Objects", tags=('units', 'terrain', 'placement'),
+                             kinds=('unit', 'terrain', 'table'), fields=('Transform',),
+                             after=('test_table_configuration',))
+    def test_overlaps(self):
+        """Test 8: Detect stacked unit bases and overlapping terrain on the playing surface"""
+        base = self.UNIT_BASE_MM
+        unit_prints = []
+        for unit in self._visit(self.index.of_kind('unit', loose_only=True)):
+            transform = unit.transform
+            unit_prints.append(Footprint(unit,
+                                         base['width'] / 2 * transform.get('scaleX', 0),
+                                         base['depth'] / 2 * transform.get('scaleZ', 0)))
+        
+        # Terrain only matters once placed on the main table
+        terrain_prints = []
+        table = self.index.tables['main']
+        if table:
+            table_t = table.transform
+            surface_x = self.playing_surface['half_x'] * table_t.get('scaleX', 1)
+            surface_z = self.playing_surface['half_z'] * table_t.get('scaleZ', 1)
+            for terrain in self._visit(self.index.of_kind('terrain', loose_only=True)):
+                fp = self._terrain_footprint(terrain)
+                if (abs(fp.x - table_t.get('posX', 0)) <= surface_x and
+                        abs(fp.z - table_t.get('posZ', 0)) <= surface_z):
+                    terrain_prints.append(fp)
+        
+        unit_overlaps = SpatialGrid(unit_prints).overlapping_pairs(self.OVERLAP_TOLERANCE)
+        terrain_overlaps = SpatialGrid(terrain_prints).overlapping_pairs(self.OVERLAP_TOLERANCE)
+        
+        self.report('info', f"Overlap check: {len(unit_prints)} units, "
+                            f"{len(terrain_prints)} terrain pieces on table")
+        
+        if unit_overlaps:
+            self.report('error', f"Overlapping unit bases: {len(unit_overlaps)} pairs",
+                        measured=len(unit_overlaps), expected=0)
+            for a, b in unit_overlaps[:5]:
+                self.report('error', f"{a.entry.nickname} ({a.x:.1f}, {a.z:.1f}) overlaps "
+                                     f"{b.entry.nickname} ({b.x:.1f}, {b.z:.1f})",
+                            a.entry, measured=((a.x, a.z), (b.x, b.z)), detail=True)
+        
+        if terrain_overlaps:
+            self.report('warning', f"Overlapping terrain on table: {len(terrain_overlaps)} pairs",
+                        measured=len(terrain_overlaps), expected=0)
+            for a, b in terrain_overlaps[:5]:
+                self.report('warning', f"{a.entry.nickname} ({a.x:.1f}, {a.z:.1f}) overlaps "
+                                       f"{b.entry.nickname} ({b.x:.1f}, {b.z:.1f})",
+                            a.entry, measured=((a.x, a.z), (b.x, b.z)), detail=True)
+    
+    def _terrain_footprint(self, terrain: IndexedObject) -> Footprint:
+        """Square footprint from the same physical size estimate as test_terrain_scaling"""
+        terrain_key = self.terrain_matcher.resolve(terrain.nickname)
+        base_size = self.TERRAIN_BASE_SIZES.get(terrain_key, self.TERRAIN_BASE_SIZES['default'])
+        
+        # scale * base_size / 100 feet per side, 12 TTS units (inches) per foot
+        inches_per_scale = base_size / 100.0 * 12
+        transform = terrain.transform
+        return Footprint(terrain,
+                         transform.get('scaleX', 0) * inches_per_scale / 2,
+                         transform.get('scaleZ', 0) * inches_per_scale / 2)
+    
+    def run_check(self, check: str):
+        """Run one registered check, recording the findings it produced"""
+        spec = self.registry.specs[check]
+        print(f"\n{Color.BOLD}Test {self.registry.number(check)}: {spec.title}{Color.END}")
+        start = len(self.findings)
+        self.current_check = check
+        with self.measure(check):
+            spec.run(self)
+        self.check_results[check] = self.findings[start:]
     
     def run_all_tests(self) -> bool:
-        """Run all tests and return overall pass/fail"""
+        """Run the selected checks and return overall pass/fail"""
         print(f"\n{Color.BOLD}{'='*70}{Color.END}")
         print(f"{Color.BOLD}DBR TTS SAVE FILE TEST FRAMEWORK{Color.END}")
         print(f"{Color.BOLD}{'='*70}{Color.END}")
         print(f"Save File: {os.path.basename(self.save_file_path)}")
         print(f"Test Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        if not self.load_save_file():
+        # Unchanged save and rules: replay the stored results without parsing
+        if self.cache and self.cache.lookup(self):
+            print(f"{Color.BLUE}Results replayed from cache{Color.END}")
+            self._print_results()
+            return len(self.errors) == 0
+        
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile() if self.profile_path else None
+        if profiler:
+            profiler.enable()
+        
+        try:
+            with self.measure('load'):
+                loaded = self.load_save_file()
+            
+            # Run the selected checks
+            if loaded:
+                for check in self.checks:
+                    self.run_check(check)
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(self.profile_path)
+            if started_tracing:
+                tracemalloc.stop()
+        
+        if not loaded:
             return False
         
-        # Run all tests
-        self.test_save_metadata()
-        self.test_table_configuration()
-        self.test_asset_placement()
-        self.test_unit_scaling()
-        self.test_terrain_scaling()
-        self.test_github_urls()
-        self.test_organic_terrain()
+        if self.cache:
+            self.cache.store(self)
         
         # Print results
         self._print_results()
         
         return len(self.errors) == 0
     
+    def print_timings(self):
+        """Print the per-phase instrumentation summary"""
+        print(f"{Color.BOLD}TIMINGS{Color.END}")
+        if not self.timings:
+            print("  (results replayed from cache, nothing was measured)\n")
+            return
+        
+        memory = self.trace_memory
+        print(f"  {'Phase':<26} {'Wall ms':>9} {'CPU ms':>9} {'Objects':>8}"
+              + (f" {'Peak KB':>9}" if memory else ""))
+        for phase, t in self.timings.items():
+            print(f"  {phase:<26} {t['wall'] * 1000:>9.2f} {t['cpu'] * 1000:>9.2f} {t['objects']:>8}"
+                  + (f" {t['peak_kb']:>9.1f}" if memory else ""))
+        total = sum(t['wall'] for t in self.timings.values())
+        print(f"  {'total':<26} {total * 1000:>9.2f}")
+        if self.profile_path:
+            print(f"  cProfile stats written to {self.profile_path}")
+        print()
+    
     def _print_results(self):
         """Print test results summary"""
         print(f"\n{Color.BOLD}{'='*70}{Color.END}")
@@ -554,16 +1519,101 @@ class TTSTestFramework:
 
 def main():
     """Main entry point"""
-    if len(sys.argv) < 2:
-        print("Usage: python test_framework.py <save_file_path>")
-        print("\nExample:")
-        print("  python test_framework.py ~/Library/Tabletop\\ Simulator/Saves/DBR_*.json")
+    parser = argparse.ArgumentParser(
+        description="Validate a DBR TTS save file",
+        epilog="Example: python test_framework.py ~/Library/Tabletop\\ Simulator/Saves/DBR_*.json")
+    parser.add_argument('save_file', nargs='?', help="Save file to validate")
+    parser.add_argument('--only', metavar='CHECK', action='append',
+                        help="Run only checks with this name or tag (repeatable, e.g. --only terrain)")
+    parser.add_argument('--rules', metavar='FILE',
+                        help="JSON rule set overriding the built-in rule constants")
+    parser.add_argument('--list-checks', action='store_true',
+                        help="List the registered checks and their tags")
+    parser.add_argument('--fix', action='store_true',
+                        help="Write a corrected, timestamped copy of the save and re-validate it")
+    parser.add_argument('--stream', action='store_true',
+                        help="Parse ObjectStates incrementally (bounded memory for large saves)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Revalidate even if the save and rules are unchanged")
+    parser.add_argument('--jsonl', metavar='FILE',
+                        help="Write findings as JSON Lines ('-' for stdout instead of the text report)")
+    parser.add_argument('--junit', metavar='FILE', help="Write a JUnit XML report")
+    parser.add_argument('--timings', action='store_true',
+                        help="Append per-check wall/CPU time and objects visited to the report")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Also record peak memory per check with tracemalloc (slower)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="Dump cProfile stats for the run (view with python -m pstats)")
+    parser.add_argument('--resolve-urls', action='store_true',
+                        help="Check GitHub URLs resolve to files in the local checkout")
+    parser.add_argument('--url-server', metavar='URL',
+                        help="Resolve GitHub URLs with HEAD requests against this HTTP stand-in")
+    parser.add_argument('--check-meshes', action='store_true',
+                        help="Measure the main table mesh from the local checkout")
+    args = parser.parse_args()
+    
+    if args.list_checks:
+        for name, spec in TTSTestFramework.registry.specs.items():
+            print(f"{name:<26} {spec.title} [{', '.join(sorted(spec.tags))}]")
+        sys.exit(0)
+    if not args.save_file:
+        parser.error("the following arguments are required: save_file")
+    
+    if args.fix:
+        from autofix import fix_save
+        try:
+            rules = load_rules(args.rules) if args.rules else None
+            success = fix_save(args.save_file, rules, args.only)
+        except (OSError, ValueError) as e:
+            print(f"{Color.RED}✗ {e}{Color.END}")
+            success = False
+        sys.exit(0 if success else 1)
+    
+    url_resolver = None
+    if args.resolve_urls or args.url_server:
+        from url_resolver import get_resolver
+        url_resolver = get_resolver(args.url_server)
+    mesh_loader = None
+    if args.check_meshes:
+        from mesh_loader import get_mesh_loader
+        mesh_loader = get_mesh_loader()
+    
+    # Measuring needs a real run, and resolution and meshes depend on files
+    # outside the save, so none of them may be replayed from the cache
+    measuring = args.timings or args.trace_memory or args.profile
+    cache = None
+    if not (args.no_cache or measuring or url_resolver or mesh_loader):
+        from result_cache import ResultCache
+        cache = ResultCache()
+    
+    try:
+        rules = load_rules(args.rules) if args.rules else None
+        framework = TTSTestFramework(args.save_file, streaming=args.stream, cache=cache,
+                                     trace_memory=args.trace_memory, profile_path=args.profile,
+                                     url_resolver=url_resolver, mesh_loader=mesh_loader,
+                                     rules=rules, only=args.only)
+    except (OSError, ValueError) as e:
+        print(f"{Color.RED}✗ {e}{Color.END}")
         sys.exit(1)
     
-    save_file = sys.argv[1]
+    if args.jsonl == '-':
+        with contextlib.redirect_stdout(io.StringIO()):
+            success = framework.run_all_tests()
+    else:
+        success = framework.run_all_tests()
+        if measuring:
+            framework.print_timings()
     
-    framework = TTSTestFramework(save_file)
-    success = framework.run_all_tests()
+    if args.jsonl or args.junit:
+        from report_formats import save_record, write_jsonl, write_junit
+        records = [save_record(framework)]
+        if args.junit:
+            write_junit(records, args.junit)
+        if args.jsonl == '-':
+            write_jsonl(records, sys.stdout)
+        elif args.jsonl:
+            with open(args.jsonl, 'w', encoding='utf-8') as f:
+                write_jsonl(records, f)
     
     sys.exit(0 if success else 1)
 
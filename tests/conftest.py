@@ -0,0 +1,69 @@
+"""Shared fixtures: the repo root on sys.path and synthetic save/bundle builders"""
+
+import json
+import os
+import struct
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def unityfs_bytes(payload: bytes, node_name: str = 'CAB-test') -> bytes:
+    """A minimal well-formed UnityFS bundle (format 6, uncompressed block info).
+
+    Bundles with equal-length payloads share a header and block table, so
+    only the payload bytes tell them apart.
+    """
+    info = bytearray(16)  # data hash, unset like the repo's bundles
+    info += struct.pack('>i', 1)
+    info += struct.pack('>IIH', len(payload), len(payload), 0)
+    info += struct.pack('>i', 1)
+    info += struct.pack('>qqI', 0, len(payload), 4)
+    info += node_name.encode() + b'\0'
+
+    header = b'UnityFS\0' + struct.pack('>I', 6) + b'5.x.x\0' + b'2019.4.40f1\0'
+    size = len(header) + 20 + len(info) + len(payload)
+    header += struct.pack('>qIII', size, len(info), len(info), 0)
+    return header + bytes(info) + payload
+
+
+@pytest.fixture
+def write_bundle(tmp_path):
+    """write_bundle(rel_path, payload) -> absolute path of a synthetic bundle under tmp_path"""
+    def write(rel_path: str, payload: bytes) -> str:
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(unityfs_bytes(payload))
+        return str(path)
+    return write
+
+
+def unit(nickname: str, x: float, z: float, scale: float = 0.039, **extra) -> dict:
+    """A loose Custom_AssetBundle unit as TTS saves it"""
+    data = {
+        'GUID': extra.pop('GUID', nickname.lower().replace(' ', '')[:6]),
+        'Name': 'Custom_AssetBundle',
+        'Nickname': nickname,
+        'Transform': {'posX': x, 'posY': 2.0, 'posZ': z, 'rotX': 0.0, 'rotY': 0.0, 'rotZ': 0.0,
+                      'scaleX': scale, 'scaleY': scale, 'scaleZ': scale},
+    }
+    data.update(extra)
+    return data
+
+
+@pytest.fixture
+def write_save(tmp_path):
+    """write_save(objects, name=..., **members) -> path of a save written like TTS does"""
+    def write(objects, name: str = 'save.json', **members) -> str:
+        save = {'SaveName': 'Test Save', 'GameMode': '', 'Date': '1/1/2026 12:00:00 PM',
+                'VersionNumber': 'v13.2.2', **members}
+        if objects is not None:
+            save['ObjectStates'] = objects
+        path = tmp_path / name
+        path.write_text(json.dumps(save, indent=2), encoding='utf-8')
+        return str(path)
+    return write
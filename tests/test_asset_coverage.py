@@ -0,0 +1,35 @@
+from asset_coverage import BundleInventory, Coverage
+from bundle_manifest import RAW_URL_PREFIX
+from url_resolver import mangled_name
+
+
+def _inventory(tmp_path):
+    return BundleInventory(str(tmp_path), str(tmp_path / 'manifest.json'))
+
+
+def test_same_layout_different_bytes_is_not_a_duplicate(tmp_path, write_bundle):
+    write_bundle('bombard.unity3d', b'\x01' * 64)
+    write_bundle('french_bombard.unity3d', b'\x02' * 64)  # Same layout, other model
+    write_bundle('copy/bombard.unity3d', b'\x01' * 64)
+    coverage = Coverage(_inventory(tmp_path), {RAW_URL_PREFIX + 'bombard.unity3d': {'v1'}})
+
+    assert coverage.used == {'bombard.unity3d': {'v1'}}
+    assert coverage.unused == ['copy/bombard.unity3d', 'french_bombard.unity3d']
+    assert coverage.duplicate_of('copy/bombard.unity3d') == 'bombard.unity3d'
+    assert coverage.duplicate_of('french_bombard.unity3d') is None
+
+
+def test_missing_mangled_and_external_urls(tmp_path, write_bundle):
+    mangled_url = RAW_URL_PREFIX + 'english_billman.unity3d'
+    write_bundle(mangled_name(mangled_url), b'\x01' * 64)
+    references = {
+        mangled_url: {'v1'},
+        RAW_URL_PREFIX + 'gone.unity3d': {'v1', 'v2'},
+        'https://example.com/other.unity3d': {'v2'},
+    }
+    coverage = Coverage(_inventory(tmp_path), references)
+
+    assert coverage.mangled_only == {mangled_url: mangled_name(mangled_url)}
+    assert coverage.missing == {RAW_URL_PREFIX + 'gone.unity3d': {'v1', 'v2'}}
+    assert list(coverage.external) == ['https://example.com/other.unity3d']
+    assert coverage.unused == []
@@ -0,0 +1,61 @@
+import glob
+import io
+import json
+import os
+
+import pytest
+
+from autofix import FixPlan, fix_save, write_fixed
+from conftest import REPO_ROOT, unit
+
+ARCHIVE_SAVE = sorted(glob.glob(os.path.join(REPO_ROOT, 'DBR_TTS_Assets', '*.json')))[-1]
+
+
+def rewrite(path, plan, save_name=None):
+    out = io.StringIO()
+    write_fixed(path, out, plan, save_name)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('objects', [[], None, [unit("Scots Pike", 42, -8)]])
+def test_empty_plan_reproduces_the_file(write_save, objects):
+    path = write_save(objects)
+    with open(path, encoding='utf-8') as f:
+        assert rewrite(path, FixPlan()) == f.read()
+
+
+def test_empty_plan_reproduces_an_archive_save():
+    with open(ARCHIVE_SAVE, encoding='utf-8') as f:
+        assert rewrite(ARCHIVE_SAVE, FixPlan()) == f.read()
+
+
+def test_empty_save(tmp_path):
+    path = tmp_path / 'empty.json'
+    path.write_text('{}')
+    assert json.loads(rewrite(str(path), FixPlan())) == {}
+
+
+def test_fixed_save_round_trips(write_save, tmp_path):
+    bag = {'GUID': 'bag001', 'Name': 'Bag', 'Nickname': 'Reserves',
+           'Transform': {'posX': -60, 'posY': 1.5, 'posZ': -35},
+           'ContainedObjects': [unit("Scots Bow", 0, 0, scale=0.05)]}
+    path = write_save([bag, unit("Scots Pike", 42, -8, scale=0.05), unit("Scots Bill", 44, -8)],
+                      SaveName="Scots v1 - 2026-01-14 17:23:19")
+    output = str(tmp_path / 'fixed.json')
+    fix_save(path, output=output)
+
+    with open(output, encoding='utf-8') as f:
+        text = f.read()
+    fixed = json.loads(text)
+    assert text == json.dumps(fixed, indent=2)
+
+    with open(path, encoding='utf-8') as f:
+        original = json.load(f)
+    bag_out, pike, bill = fixed['ObjectStates']
+    assert bag_out == original['ObjectStates'][0]
+    assert [pike['Transform'][axis] for axis in ('scaleX', 'scaleY', 'scaleZ')] == \
+        pytest.approx([0.039] * 3)
+    assert bill == original['ObjectStates'][2]
+    assert fixed['SaveName'].startswith("Scots v1 - ") and fixed['SaveName'] != original['SaveName']
+    assert {k: v for k, v in fixed.items() if k not in ('SaveName', 'ObjectStates')} == \
+        {k: v for k, v in original.items() if k not in ('SaveName', 'ObjectStates')}
@@ -0,0 +1,32 @@
+import os
+
+from bundle_manifest import BundleManifest, scan_bundle
+
+
+def test_same_layout_different_bytes_differ_only_by_sha256(write_bundle):
+    first = scan_bundle(write_bundle('a.unity3d', b'\x01' * 64))
+    second = scan_bundle(write_bundle('b.unity3d', b'\x02' * 64))
+
+    assert not first['problems'] and not second['problems']
+    assert first['layout_fingerprint'] == second['layout_fingerprint']
+    assert first['sha256'] != second['sha256']
+
+
+def test_identical_bundles_share_sha256(write_bundle):
+    first = scan_bundle(write_bundle('a.unity3d', b'same' * 16))
+    second = scan_bundle(write_bundle('sub/b.unity3d', b'same' * 16))
+    assert first['sha256'] == second['sha256']
+
+
+def test_refresh_rehashes_changed_bundles_only(tmp_path, write_bundle):
+    write_bundle('a.unity3d', b'\x01' * 64)
+    path = write_bundle('b.unity3d', b'\x02' * 64)
+    manifest = BundleManifest(str(tmp_path), str(tmp_path / 'manifest.json'))
+    assert manifest.refresh() == (2, 0)
+    old_hash = manifest.bundles['b.unity3d']['sha256']
+
+    write_bundle('b.unity3d', b'\x03' * 64)
+    os.utime(path, ns=(0, 1))  # Same size; the mtime alone must trigger a rescan
+    reloaded = BundleManifest(str(tmp_path), str(tmp_path / 'manifest.json'))
+    assert reloaded.refresh() == (1, 1)
+    assert reloaded.bundles['b.unity3d']['sha256'] != old_hash
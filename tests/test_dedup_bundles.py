@@ -0,0 +1,33 @@
+from dedup_bundles import canonical_map, find_duplicates, rewrite_save_urls
+from bundle_manifest import RAW_URL_PREFIX
+from url_resolver import mangled_name
+
+
+def test_same_layout_different_bytes_are_not_grouped(tmp_path, write_bundle):
+    write_bundle('bombard.unity3d', b'\x01' * 64)
+    write_bundle('french_bombard.unity3d', b'\x02' * 64)
+    groups, stats = find_duplicates(str(tmp_path))
+    assert groups == []
+    assert stats['fully_hashed'] == 0  # Leading chunks already differ
+
+
+def test_mangled_twin_merges_but_different_asset_stays(tmp_path, write_bundle):
+    mangled = mangled_name(RAW_URL_PREFIX + 'english_billman.unity3d')
+    write_bundle('english_billman.unity3d', b'\x05' * 64)
+    write_bundle(mangled, b'\x05' * 64)
+    write_bundle('scots_billman.unity3d', b'\x05' * 64)  # Placeholder with the same bytes
+
+    groups, _ = find_duplicates(str(tmp_path))
+    assert len(groups) == 1 and len(groups[0]) == 3
+    assert canonical_map(groups) == {mangled: 'english_billman.unity3d'}
+
+
+def test_rewrite_save_urls_replaces_whole_urls_only(tmp_path):
+    save = tmp_path / 'save.json'
+    dup_url = RAW_URL_PREFIX + 'dup.unity3d'
+    save.write_text(f'{{"a": "{dup_url}", "b": "{dup_url}x"}}', encoding='utf-8')
+
+    assert rewrite_save_urls(str(save), {'dup.unity3d': 'real.unity3d'}) == 1
+    assert save.read_text(encoding='utf-8') == \
+        f'{{"a": "{RAW_URL_PREFIX}real.unity3d", "b": "{dup_url}x"}}'
+    assert [p.name for p in tmp_path.iterdir()] == ['save.json']  # No temp file left
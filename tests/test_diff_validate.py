@@ -0,0 +1,79 @@
+import contextlib
+import io
+
+from conftest import unit
+from diff_validate import SaveDiff, baseline_results, load_quietly, validate_incremental
+from test_framework import CheckSpec, TTSTestFramework
+
+
+def _terrain(nickname, scale):
+    return unit(nickname, 0.0, 0.0, scale=scale, GUID='')
+
+
+def _bag(*contents):
+    return {'GUID': 'bag001', 'Name': 'Bag', 'Nickname': 'Terrain Bag',
+            'Transform': {'posX': -60, 'posY': 1.5, 'posZ': -35}, 'ContainedObjects': list(contents)}
+
+
+def _loaded(path):
+    framework = TTSTestFramework(path)
+    assert load_quietly(framework)
+    return framework
+
+
+def _incremental_and_full(old_path, new_path):
+    baseline = _loaded(old_path)
+    baseline_results(baseline, None)
+    new = _loaded(new_path)
+    full = TTSTestFramework(new_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        diff, affected = validate_incremental(baseline, new)
+        full.run_all_tests()
+    return diff, affected, [f.text for f in new.findings], [f.text for f in full.findings]
+
+
+def test_reordered_bag_contents_rerun_dependent_checks(write_save):
+    # Only the first five wrongly sized pieces are listed, so order shows in the output
+    pieces = [_terrain(f"Terrain Wood Large {n}", 0.01) for n in range(6)]
+    old = write_save([_bag(*pieces)], name='old.json')
+    new = write_save([_bag(*reversed(pieces))], name='new.json')
+
+    diff, affected, incremental, full = _incremental_and_full(old, new)
+    assert not diff.is_empty and len(diff.reordered) == 6
+    assert 'test_terrain_scaling' in affected
+    assert incremental == full
+
+
+def test_int_to_float_change_is_not_equal(write_save):
+    old = write_save([unit("Scots Pike", 42, -8, scale=0.5)], name='old.json')
+    new = write_save([unit("Scots Pike", 42.0, -8, scale=0.5)], name='new.json')
+
+    diff, affected, incremental, full = _incremental_and_full(old, new)
+    assert [entry.nickname for entry in diff.modified] == ["Scots Pike"]
+    assert {'test_asset_placement', 'test_overlaps'} <= affected
+    assert incremental == full
+
+
+def test_unchanged_save_reuses_everything(write_save):
+    objects = [unit("Scots Pike", 42, -8)]
+    diff, affected, incremental, full = _incremental_and_full(
+        write_save(objects, name='old.json'), write_save(objects, name='new.json'))
+    assert diff.is_empty and affected == set()
+    assert incremental == full
+
+
+def test_plugin_checks_are_dirtied_from_their_declared_inputs(write_save):
+    old = _loaded(write_save([_bag(_terrain("Terrain Wood Large", 0.5))], name='old.json'))
+    new = _loaded(write_save([_bag(_terrain("Terrain Wood Large", 0.7))], name='new.json'))
+    diff = SaveDiff(old, new)
+
+    def run(framework):
+        pass
+
+    specs = [
+        CheckSpec('bag_terrain', 'Bagged terrain', run, kinds=('terrain',), fields=('Transform',)),
+        CheckSpec('bag_locks', 'Locked bags', run, kinds=('bag',), fields=('Locked',)),
+        CheckSpec('first', 'First', run, kinds=('table',)),
+        CheckSpec('second', 'Second', run, after=('first',), kinds=('terrain',)),
+    ]
+    assert diff.affected_checks(specs) == {'bag_terrain', 'first', 'second'}
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from bundle_manifest import RAW_URL_PREFIX
+from mesh_loader import MeshFormatError, MeshLoader
+
+
+@pytest.fixture
+def loader(tmp_path):
+    (tmp_path / 'Table Meshes').mkdir()
+    (tmp_path / 'Table Meshes' / 'grass table.obj').write_text(
+        "v 0 0 0\nv 6 0 0\nv 6 0.1 4\nv 0 0 4\nf 1 2 3 4\n")
+    return MeshLoader(str(tmp_path), cache_dir=None)
+
+
+def test_percent_encoded_url_maps_onto_checkout(loader):
+    url = RAW_URL_PREFIX + 'Table%20Meshes/grass%20table.obj?raw=true'
+    assert loader.path_for_url(url) == os.path.join(loader.root, 'Table Meshes', 'grass table.obj')
+    assert loader.load_url(url).extents() == pytest.approx((6.0, 0.1, 4.0))
+
+
+@pytest.mark.parametrize('path', ['../outside.obj', 'Table%20Meshes/%2E%2E/%2E%2E/outside.obj',
+                                  '%2Fetc/passwd', 'a%00.obj'])
+def test_paths_leaving_the_checkout_are_rejected(loader, path):
+    url = RAW_URL_PREFIX + path
+    assert loader.path_for_url(url) is None
+    with pytest.raises(MeshFormatError, match="escapes"):
+        loader.load_url(url)
+
+
+def test_other_hosts_are_not_mapped(loader):
+    assert loader.path_for_url('https://example.com/grass_table.obj') is None
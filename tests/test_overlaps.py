@@ -0,0 +1,81 @@
+import contextlib
+import io
+import itertools
+import math
+import random
+
+import pytest
+
+from conftest import unit
+from test_framework import Footprint, IndexedObject, SpatialGrid, TTSTestFramework
+
+TOLERANCE = 0.05
+
+
+def footprint(x, z, half_x=1.0, half_z=1.0, rot_y=0.0, order=0):
+    entry = IndexedObject({'Nickname': f"piece {order}",
+                           'Transform': {'posX': x, 'posZ': z, 'rotY': rot_y}}, order)
+    return Footprint(entry, half_x, half_z)
+
+
+def test_rotation_turns_the_long_side():
+    # 4 x 2 bases 3.5 apart along x: side by side they overlap, turned 90 they clear
+    assert footprint(0, 0, 2, 1).overlaps(footprint(3.5, 0, 2, 1))
+    assert not footprint(0, 0, 2, 1, rot_y=90).overlaps(footprint(3.5, 0, 2, 1, rot_y=90))
+
+
+def test_bounding_boxes_touching_is_not_an_overlap():
+    # A diamond's bounding box reaches the square, its sides do not
+    diamond, square = footprint(0, 0, rot_y=45), footprint(2.2, 2.2)
+    assert diamond.extent_x + square.half_x > 2.2
+    assert not diamond.overlaps(square)
+    assert not square.overlaps(diamond)
+    assert diamond.overlaps(footprint(1.6, 1.6))
+
+
+@pytest.mark.parametrize('gap, overlaps', [
+    (0.0, False),     # edge contact
+    (-0.04, False),   # within tolerance
+    (-0.06, True),    # interpenetrating
+])
+def test_edge_contact_and_tolerance(gap, overlaps):
+    first, second = footprint(0, 0), footprint(2.0 + gap, 0.5)
+    assert first.overlaps(second, TOLERANCE) is overlaps
+    # The same contact between bases turned 30 degrees, offset along their local z
+    offset = 2.0 + gap
+    turned = footprint(offset * math.sin(math.radians(30)), offset * math.cos(math.radians(30)), rot_y=30)
+    assert footprint(0, 0, rot_y=30).overlaps(turned, TOLERANCE) is overlaps
+
+
+def test_grid_finds_pairs_across_cell_boundaries():
+    # Cells are 1.0 wide here, so these pairs straddle x = 0, x = -2 and z = 2
+    prints = [footprint(-0.5, 0.3, 0.5, 0.5, order=0), footprint(0.4, 0.3, 0.5, 0.5, order=1),
+              footprint(-2.45, -5, 0.5, 0.5, order=2), footprint(-1.6, -5, 0.5, 0.5, order=3),
+              footprint(7, 1.55, 0.5, 0.5, order=4), footprint(7, 2.45, 0.5, 0.5, order=5)]
+    grid = SpatialGrid(prints)
+    assert grid.cell_size == pytest.approx(1.0)
+    pairs = [(a.entry.order, b.entry.order) for a, b in grid.overlapping_pairs(TOLERANCE)]
+    assert pairs == [(0, 1), (2, 3), (4, 5)]
+
+
+def test_grid_matches_all_pairs():
+    rng = random.Random(8)
+    prints = [footprint(rng.uniform(-20, 20), rng.uniform(-20, 20), rng.uniform(0.2, 1.5),
+                        rng.uniform(0.2, 1.5), rng.choice((0, 15, 45, 90, 137)), order=n)
+              for n in range(300)]
+    expected = [(a.entry.order, b.entry.order) for a, b in itertools.combinations(prints, 2)
+                if a.overlaps(b, TOLERANCE)]
+    found = [(a.entry.order, b.entry.order) for a, b in SpatialGrid(prints).overlapping_pairs(TOLERANCE)]
+    assert expected and found == expected
+
+
+def test_stacked_units_are_errors(write_save):
+    # Same shape as v1.9_20260114_180413: two bases at one spot
+    framework = TTSTestFramework(write_save([unit("Scots Pike", 42, -12), unit("Scots Bow", 42, -12),
+                                             unit("Scots Bill", 44, -12)]))
+    with contextlib.redirect_stdout(io.StringIO()):
+        framework.load_save_file()
+        framework.run_check('test_overlaps')
+    errors = [f.text for f in framework.findings if f.severity == 'error']
+    assert any("Overlapping unit bases: 1 pairs" in text for text in errors)
+    assert any("Scots Pike (42.0, -12.0) overlaps Scots Bow (42.0, -12.0)" in text for text in errors)
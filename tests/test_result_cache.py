@@ -0,0 +1,77 @@
+import contextlib
+import importlib.util
+import io
+import shutil
+import sys
+
+import pytest
+
+from conftest import unit
+from result_cache import ResultCache, rules_fingerprint
+from test_framework import TTSTestFramework
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def save(write_save):
+    return write_save([unit("Scots Pike", 42, -8)], name='army_v1.json')
+
+
+def run(framework):
+    with contextlib.redirect_stdout(io.StringIO()):
+        framework.run_all_tests()
+    return framework
+
+
+def test_unchanged_save_and_rules_share_a_key(cache, save):
+    assert cache.key_for(TTSTestFramework(save)) == cache.key_for(TTSTestFramework(save))
+
+
+def test_rule_and_selection_changes_change_the_key(cache, save):
+    key = cache.key_for(TTSTestFramework(save))
+    assert cache.key_for(TTSTestFramework(save, rules={'UNIT_SCALE': 0.04})) != key
+    assert cache.key_for(TTSTestFramework(save, rules={'HILL_SCALES': {'small': 0.2}})) != key
+    assert cache.key_for(TTSTestFramework(save, only=['test_unit_scaling'])) != key
+
+
+def test_source_change_changes_the_fingerprint(tmp_path, save, monkeypatch):
+    plugin = tmp_path / 'cache_plugin.py'
+    plugin.write_text("from test_framework import TTSTestFramework\n\n"
+                      "class Framework(TTSTestFramework):\n    pass\n")
+
+    def key():
+        spec = importlib.util.spec_from_file_location('cache_plugin', plugin)
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, 'cache_plugin', module)
+        spec.loader.exec_module(module)
+        return ResultCache(str(tmp_path / 'cache')).key_for(module.Framework(save))
+
+    before = key()
+    plugin.write_text(plugin.read_text() + "    # edited check code\n")
+    assert key() != before
+    framework = TTSTestFramework(save)
+    assert rules_fingerprint(framework, 'a' * 64) != rules_fingerprint(framework, 'b' * 64)
+
+
+def test_rename_and_edit_change_the_key(cache, save, tmp_path, write_save):
+    key = cache.key_for(TTSTestFramework(save))
+    renamed = str(tmp_path / 'army_v2.json')
+    shutil.copyfile(save, renamed)
+    assert cache.key_for(TTSTestFramework(renamed)) != key
+    write_save([unit("Scots Pike", 42, -6)], name='army_v1.json')
+    assert cache.key_for(TTSTestFramework(save)) != key
+
+
+def test_results_replay_until_the_save_changes(cache, save, write_save):
+    stored = run(TTSTestFramework(save, cache=cache))
+    cache.store(stored)
+    replayed = TTSTestFramework(save, cache=cache)
+    assert cache.lookup(replayed)
+    assert [f.to_dict() for f in replayed.findings] == [f.to_dict() for f in stored.findings]
+
+    write_save([unit("Scots Pike", 42, -6, scale=0.05)], name='army_v1.json')
+    assert not cache.lookup(TTSTestFramework(save, cache=cache))
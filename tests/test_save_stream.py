@@ -0,0 +1,73 @@
+import contextlib
+import glob
+import io
+import json
+import os
+
+import pytest
+
+from conftest import REPO_ROOT, unit
+from test_framework import TTSTestFramework, iter_save_stream
+
+ARCHIVE_SAVE = sorted(glob.glob(os.path.join(REPO_ROOT, 'DBR_TTS_Assets', '*.json')))[-1]
+
+
+def rebuild(path, chunk_size):
+    """The save as a dict, reassembled from the stream"""
+    save = {}
+    for key, value in iter_save_stream(path, chunk_size):
+        if key == 'ObjectStates':
+            objects = save.setdefault(key, [])
+            if value != []:
+                objects.append(value)
+        else:
+            save[key] = value
+    return save
+
+
+def parity(path, chunk_size):
+    with open(path, encoding='utf-8') as f:
+        expected = json.load(f)
+    assert rebuild(path, chunk_size) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096, 1 << 20])
+def test_archive_save_matches_json_load(chunk_size):
+    parity(ARCHIVE_SAVE, chunk_size)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64])
+def test_awkward_values_match_json_load(write_save, chunk_size):
+    tricky = unit("Pike \"]},\" é中 \\", -0.5, 1e-7, LuaScript='{"a": [1, 2]}\n', Tags=[],
+                  States={'2': unit("Pike (shaken)", 0, 0)}, ContainedObjects=[{}])
+    parity(write_save([tricky, unit("Bow", 12345678901234567890, -0.0)], Note=[[]], Flag=None), chunk_size)
+    parity(write_save([{'Name': 'Card'}]), chunk_size)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 4096])
+def test_empty_object_states_is_kept(write_save, chunk_size):
+    path = write_save([])
+    assert [pair for pair in iter_save_stream(path, chunk_size) if pair[0] == 'ObjectStates'] == \
+        [('ObjectStates', [])]
+    parity(path, chunk_size)
+    parity(write_save(None), chunk_size)
+
+
+@pytest.mark.parametrize('text', ['{"SaveName": "x", "ObjectStates": [{"a": 1},]}',
+                                  '{"SaveName": "x" "ObjectStates": []}', '{"a": 0.', '[]'])
+def test_malformed_saves_raise(tmp_path, text):
+    path = tmp_path / 'bad.json'
+    path.write_text(text)
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_save_stream(str(path), 4))
+
+
+def test_streaming_framework_reports_like_the_full_load(write_save):
+    for path in (ARCHIVE_SAVE, write_save([])):
+        texts = []
+        for streaming in (False, True):
+            framework = TTSTestFramework(path, streaming=streaming)
+            with contextlib.redirect_stdout(io.StringIO()):
+                framework.run_all_tests()
+            texts.append([f.text for f in framework.findings])
+        assert texts[0] == texts[1]
@@ -0,0 +1,56 @@
+import pytest
+
+from test_framework import TerrainMatcher, TTSTestFramework
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(TerrainMatcher, '_compiled', {})
+
+
+def rules(*keys, size=1):
+    return {key: {'size': size} for key in keys}
+
+
+@pytest.mark.parametrize('keys', [('hill_small', 'hill_gentle_small'), ('hill_gentle_small', 'hill_small')])
+def test_longest_key_wins_in_any_table_order(keys):
+    matcher = TerrainMatcher(rules(*keys))
+    assert matcher.resolve("Terrain Hill Gentle Small 2") == 'hill_gentle_small'
+    assert matcher.resolve("Hill Small") == 'hill_small'
+    assert matcher.resolve("Gentle Hill") is None
+
+
+def test_ties_go_to_table_order():
+    assert TerrainMatcher(rules('wood_small', 'pond_small')).resolve("Pond Wood Small") == 'wood_small'
+    assert TerrainMatcher(rules('pond_small', 'wood_small')).resolve("Pond Wood Small") == 'pond_small'
+
+
+def test_waterways_and_coastlines():
+    matcher = TerrainMatcher(rules('river', 'waterway', 'coastline'))
+    assert matcher.resolve("Terrain Coastline River Mouth") == 'waterway'
+    assert matcher.resolve("Waterway 3") == 'waterway'
+    assert TerrainMatcher(rules('river')).resolve("Waterway River") == 'river'
+
+
+def test_framework_table():
+    matcher = TerrainMatcher(TTSTestFramework.DBR_TERRAIN_SIZES)
+    assert matcher.resolve("Terrain Hill Steep Large") == 'hill_steep_large'
+    assert matcher.resolve("Rocky Ground Medium") == 'rockyground_medium'
+    assert matcher.resolve("Terrain Wood Large 4") == 'wood_large'
+
+
+def test_matchers_are_shared_by_keys_not_sizes():
+    first = TerrainMatcher.for_rules(rules('wood_small', 'wood_large'))
+    assert TerrainMatcher.for_rules(rules('wood_small', 'wood_large', size=9)) is first
+    assert TerrainMatcher.for_rules(rules('wood_large', 'wood_small')) is not first
+    # The table can be rebuilt between runs; the matcher does not depend on the dict object
+    assert TerrainMatcher.for_rules(dict(rules('wood_small', 'wood_large'))) is first
+
+
+def test_compiled_matchers_are_bounded(monkeypatch):
+    monkeypatch.setattr(TerrainMatcher, 'COMPILED_SIZE', 3)
+    first = TerrainMatcher.for_rules(rules('k0'))
+    for n in range(1, 4):
+        TerrainMatcher.for_rules(rules(f"k{n}"))
+    assert len(TerrainMatcher._compiled) == 3
+    assert TerrainMatcher.for_rules(rules('k0')) is not first
@@ -0,0 +1,47 @@
+import sys
+
+import pytest
+
+import url_resolver
+from bundle_manifest import RAW_URL_PREFIX
+from conftest import unit
+from url_resolver import LocalCheckoutBackend, Resolution, UrlResolver, checkout_path, partition
+
+
+@pytest.mark.parametrize('url, expected', [
+    (RAW_URL_PREFIX + 'Table%20Meshes/grass.obj?raw=true', 'Table Meshes/grass.obj'),
+    (RAW_URL_PREFIX + 'a/../../b.unity3d', None),
+    (RAW_URL_PREFIX + '%2E%2E/b.unity3d', None),
+    (RAW_URL_PREFIX + '/etc/passwd', None),
+    ('https://example.com/a.unity3d', None),
+])
+def test_checkout_path(url, expected):
+    assert checkout_path(url) == expected
+
+
+def test_partition_keeps_skipped_apart():
+    resolved, failed, skipped = partition([Resolution('a', True), Resolution('b', False),
+                                           Resolution('c', None), Resolution('d', None)])
+    assert [r.url for r in resolved] == ['a']
+    assert [r.url for r in failed] == ['b']
+    assert [r.url for r in skipped] == ['c', 'd']
+
+
+def test_main_counts_resolved_failed_and_skipped(tmp_path, write_save, monkeypatch, capsys):
+    (tmp_path / 'Units').mkdir()
+    (tmp_path / 'Units' / 'pike.unity3d').write_bytes(b'UnityFS')
+    def asset(name, url):
+        return unit(name, 0, 0, CustomAssetbundle={'AssetbundleURL': url})
+    path = write_save([asset("Scots Pike", RAW_URL_PREFIX + 'Units/pike.unity3d'),
+                       asset("Scots Pike", RAW_URL_PREFIX + 'Units/pike.unity3d'),
+                       asset("Scots Bow", RAW_URL_PREFIX + 'Units/bow.unity3d'),
+                       asset("Steam", 'http://cloud-3.steamusercontent.com/ugc/1/')])
+    monkeypatch.setattr(url_resolver, '_resolvers',
+                        {None: UrlResolver(LocalCheckoutBackend(str(tmp_path)))})
+    monkeypatch.setattr(sys, 'argv', ['url_resolver.py', path])
+
+    with pytest.raises(SystemExit) as exit_info:
+        url_resolver.main()
+    out = capsys.readouterr().out
+    assert exit_info.value.code == 1
+    assert "1 resolved, 1 failed, 1 skipped of 3 unique URLs (4 references)" in out
@@ -0,0 +1,34 @@
+import contextlib
+import io
+
+from conftest import unit
+from test_framework import TTSTestFramework
+from watch_validate import WatchSession
+
+
+def _full_run(path):
+    framework = TTSTestFramework(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        framework.run_all_tests()
+    return [f.text for f in framework.findings]
+
+
+def test_rewrites_report_what_a_full_run_reports(write_save):
+    pieces = [unit(f"Terrain Marsh Large {n}", 0.0, 0.0, scale=0.01, GUID='') for n in range(6)]
+    bag = {'GUID': 'bag001', 'Name': 'Bag', 'Nickname': 'Terrain Bag',
+           'Transform': {'posX': -60, 'posY': 1.5, 'posZ': -35}, 'ContainedObjects': pieces}
+    session = WatchSession()
+    path = write_save([bag, unit("Scots Pike", 42, -8)])
+    with contextlib.redirect_stdout(io.StringIO()):
+        session.validate(path)
+
+    # Each rewrite: reorder the bag, then change only a value's type
+    rewrites = [
+        [dict(bag, ContainedObjects=pieces[::-1]), unit("Scots Pike", 42, -8)],
+        [dict(bag, ContainedObjects=pieces[::-1]), unit("Scots Pike", 42.0, -8)],
+    ]
+    for objects in rewrites:
+        write_save(objects)
+        with contextlib.redirect_stdout(io.StringIO()):
+            session.validate(path)
+        assert [f.text for f in session.previous[path].findings] == _full_run(path)
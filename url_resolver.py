@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+DBR Asset URL Resolver
+======================
+
+Answers "would this GitHub raw URL actually resolve?" for test_github_urls,
+which otherwise only checks that a URL mentions github.
+
+Two interchangeable backends:
+
+- local (default): maps https://raw.githubusercontent.com/krumphau/DBR_assets/main/<file>
+  onto the checkout. A file that only exists under its URL-mangled name
+  (httpsrawgithubusercontentcom...unity3d) is reported separately, since
+  GitHub would still 404 on the real name.
+- http: concurrent HEAD requests over keep-alive connections that
+  persist across calls until close(), optionally against a local HTTP
+  stand-in (e.g. http://localhost:8080/) instead of GitHub.
+
+Saves reference the same bundle URL dozens of times, so resolution is
+memoized per unique URL for the life of the resolver (and, through
+get_resolver, of the process).
+
+Usage:
+    python url_resolver.py DBR_TTS_Assets/*_v4.5_*.json
+    python url_resolver.py --server http://localhost:8080/ DBR_Scots_Common_Early_Tudor_English.json
+"""
+
+import argparse
+import atexit
+import http.client
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from bundle_manifest import MANGLED_PREFIX, RAW_URL_PREFIX, REPO_ROOT, SKIP_DIRS
+from test_framework import Color, ObjectIndex, iter_save_stream
+
+DEFAULT_HTTP_WORKERS = 8
+DEFAULT_HTTP_TIMEOUT = 5.0
+
+
+def mangled_name(url: str) -> str:
+    """The URL-derived filename the asset caches use (alphanumerics only, plus extension)"""
+    path = urlsplit(url).path
+    extension = os.path.splitext(path)[1]
+    return re.sub(r'[^A-Za-z0-9]', '', url) + extension
+
+
+def checkout_path(url: str) -> Optional[str]:
+    """Percent-decoded repo-relative path of a raw GitHub URL for this repository.
+
+    None for other URLs and for paths that would leave the checkout.
+    """
+    if not url.startswith(RAW_URL_PREFIX):
+        return None
+    rel_path = unquote(url[len(RAW_URL_PREFIX):].split('?', 1)[0])
+    parts = rel_path.replace('\\', '/').split('/')
+    if not rel_path or rel_path.startswith('/') or '..' in parts or '\0' in rel_path:
+        return None
+    return rel_path
+
+
+class Resolution:
+    """Outcome of resolving one URL; ok is None when the backend cannot judge it"""
+
+    def __init__(self, url: str, ok: Optional[bool], detail: str = '',
+                 location: Optional[str] = None):
+        self.url = url
+        self.ok = ok
+        self.detail = detail
+        self.location = location  # Local path or HTTP status line
+
+    def __repr__(self):
+        return f"Resolution({self.url!r}, ok={self.ok}, {self.detail!r})"
+
+
+class LocalCheckoutBackend:
+    """Resolves raw GitHub URLs against the files in a checkout"""
+
+    name = 'local'
+
+    def __init__(self, root: str = REPO_ROOT):
+        self.root = root
+        self._mangled: Optional[Dict[str, str]] = None
+
+    def _mangled_files(self) -> Dict[str, str]:
+        """Mangled filename -> repo-relative path, scanned once"""
+        if self._mangled is None:
+            self._mangled = {}
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                for name in filenames:
+                    if name.startswith(MANGLED_PREFIX):
+                        rel_path = os.path.relpath(os.path.join(dirpath, name), self.root)
+                        self._mangled.setdefault(name, rel_path)
+        return self._mangled
+
+    def resolve(self, url: str) -> Resolution:
+        if not url.startswith(RAW_URL_PREFIX):
+            return Resolution(url, None, "not served from this repository")
+
+        rel_path = checkout_path(url)
+        if rel_path is None:
+            return Resolution(url, False, "path escapes the repository")
+        if os.path.isfile(os.path.join(self.root, rel_path)):
+            return Resolution(url, True, location=rel_path)
+
+        mangled = self._mangled_files().get(mangled_name(url))
+        if mangled:
+            return Resolution(url, False, f"{rel_path} only exists as mangled copy {mangled}",
+                              location=mangled)
+        return Resolution(url, False, f"{rel_path} not in repository (404)")
+
+    def resolve_many(self, urls: List[str]) -> Dict[str, Resolution]:
+        return {url: self.resolve(url) for url in urls}
+
+    def close(self):
+        pass
+
+
+class HttpHeadBackend:
+    """Concurrent HEAD requests over per-thread keep-alive connections.
+
+    The worker threads and their connections live as long as the backend,
+    so repeated resolve_many calls reuse them; close() (or leaving a with
+    block) shuts both down. With base_url set, raw GitHub URLs are
+    rewritten onto that server, so a local stand-in can be checked without
+    touching the network.
+    """
+
+    name = 'http'
+
+    def __init__(self, base_url: Optional[str] = None, workers: int = DEFAULT_HTTP_WORKERS,
+                 timeout: float = DEFAULT_HTTP_TIMEOUT):
+        self.base_url = base_url.rstrip('/') + '/' if base_url else None
+        self.workers = workers
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: List[http.client.HTTPConnection] = []  # Every thread's, for close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the worker threads and close every pooled connection"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def target(self, url: str) -> str:
+        if self.base_url and url.startswith(RAW_URL_PREFIX):
+            return self.base_url + url[len(RAW_URL_PREFIX):]
+        return url
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        pool = getattr(self._local, 'pool', None)
+        if pool is None:
+            pool = self._local.pool = {}
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = pool[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop(self, scheme: str, netloc: str):
+        conn = self._local.pool.pop((scheme, netloc), None)
+        if conn:
+            conn.close()
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+    def resolve(self, url: str) -> Resolution:
+        target = self.target(url)
+        parts = urlsplit(target)
+        if parts.scheme not in ('http', 'https'):
+            return Resolution(url, None, "not an HTTP URL")
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        # One retry covers keep-alive connections the server has since closed
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request('HEAD', path)
+                response = conn.getresponse()
+                response.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                self._drop(parts.scheme, parts.netloc)
+                if attempt:
+                    return Resolution(url, False, f"{target}: {type(e).__name__}: {e}")
+
+        status = f"{response.status} {response.reason}"
+        if 200 <= response.status < 400:
+            return Resolution(url, True, location=status)
+        return Resolution(url, False, f"{target}: HTTP {status}", location=status)
+
+    def resolve_many(self, urls: List[str]) -> Dict[str, Resolution]:
+        if len(urls) <= 1:
+            return {url: self.resolve(url) for url in urls}
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='url-head')
+            executor = self._executor
+        return dict(zip(urls, executor.map(self.resolve, urls)))
+
+
+class UrlResolver:
+    """Memoizing front end: each unique URL hits the backend once"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or LocalCheckoutBackend()
+        self._memo: Dict[str, Resolution] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the backend's threads and connections; the memo is kept"""
+        self.backend.close()
+
+    def resolve_many(self, urls: Iterable[str]) -> Dict[str, Resolution]:
+        urls = list(dict.fromkeys(urls))
+        todo = [url for url in urls if url not in self._memo]
+        self.hits += len(urls) - len(todo)
+        self.misses += len(todo)
+        if todo:
+            self._memo.update(self.backend.resolve_many(todo))
+        return {url: self._memo[url] for url in urls}
+
+    def resolve(self, url: str) -> Resolution:
+        return self.resolve_many((url,))[url]
+
+
+def partition(resolutions: Iterable[Resolution]) -> Tuple[List[Resolution], List[Resolution],
+                                                         List[Resolution]]:
+    """Split resolutions into (resolved, failed, skipped); skipped ones have
+    ok None - the backend could not judge them, so they count as neither"""
+    outcomes: Dict[Optional[bool], List[Resolution]] = {True: [], False: [], None: []}
+    for resolution in resolutions:
+        outcomes[resolution.ok].append(resolution)
+    return outcomes[True], outcomes[False], outcomes[None]
+
+
+# Shared per process so batch workers keep their memo across saves
+_resolvers: Dict[Optional[str], UrlResolver] = {}
+
+
+def get_resolver(server: Optional[str] = None) -> UrlResolver:
+    """Process-wide resolver: local checkout, or HEAD requests against `server`"""
+    resolver = _resolvers.get(server)
+    if resolver is None:
+        if not _resolvers:
+            atexit.register(close_resolvers)
+        backend = HttpHeadBackend(server) if server else LocalCheckoutBackend()
+        resolver = _resolvers[server] = UrlResolver(backend)
+    return resolver
+
+
+def close_resolvers():
+    """Close every process-wide resolver's backend"""
+    for resolver in _resolvers.values():
+        resolver.close()
+
+
+def save_urls(save_path: str) -> List[str]:
+    """Every asset URL in a save, duplicates included"""
+    urls = []
+    index = ObjectIndex(slim=True)
+    for key, value in iter_save_stream(save_path):
+        if key == 'ObjectStates' and isinstance(value, dict):
+            index.add(value)
+    for entry in index.objects:
+        data = entry.data
+        for url in (data.get('CustomAssetbundle', {}).get('AssetbundleURL', ''),
+                    data.get('CustomMesh', {}).get('MeshURL', ''),
+                    data.get('CustomMesh', {}).get('DiffuseURL', '')):
+            if url:
+                urls.append(url)
+    return urls
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Check that the asset URLs in saves resolve")
+    parser.add_argument('saves', nargs='+', help="Save files to check")
+    parser.add_argument('--server', metavar='URL',
+                        help="HEAD-check against this HTTP stand-in instead of the local checkout")
+    args = parser.parse_args()
+
+    resolver = get_resolver(args.server)
+    failed = False
+    for save_path in args.saves:
+        urls = save_urls(save_path)
+        resolutions = resolver.resolve_many(urls)
+        resolved, broken, skipped = partition(resolutions.values())
+        name = os.path.basename(save_path)
+        counts = (f"{len(resolved)} resolved, {len(broken)} failed, {len(skipped)} skipped "
+                  f"of {len(resolutions)} unique URLs ({len(urls)} references)")
+        if broken:
+            failed = True
+            print(f"{Color.RED}✗ {name}: {counts}{Color.END}")
+            for r in broken:
+                print(f"{Color.RED}  - {r.detail}{Color.END}")
+        elif skipped:
+            print(f"{Color.YELLOW}⚠ {name}: {counts}{Color.END}")
+        else:
+            print(f"{Color.GREEN}✓ {name}: {counts}{Color.END}")
+        for r in skipped:
+            print(f"{Color.YELLOW}  - skipped {r.url}: {r.detail}{Color.END}")
+
+    print(f"\nResolver ({resolver.backend.name}): {resolver.misses} lookups, {resolver.hits} memo hits")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
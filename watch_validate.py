@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+DBR TTS Watch Mode
+==================
+
+Long-running validator for the "run after EVERY change" workflow: watches
+save files and directories and revalidates a save as soon as it has been
+rewritten.
+
+Changes are picked up with inotify on Linux (through ctypes, no extra
+packages) and by polling mtimes everywhere else. Bursts of writes are
+debounced until the file has stopped changing. The process stays warm:
+compiled rule tables are reused, and each save's previous run is kept in
+memory, so a rewrite only re-runs the checks whose declared inputs changed
+- including reordered container contents and int/float-only edits (see
+diff_validate.py) - and reports new and resolved failures.
+
+Usage:
+    python watch_validate.py DBR_TTS_Assets TTS_Saves
+    python watch_validate.py --poll --interval 1.0 DBR_Scots_Common_Early_Tudor_English.json
+"""
+
+import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import io
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from diff_validate import load_quietly, print_diff_report, validate_incremental
+from test_framework import Color, TTSTestFramework
+
+# Seconds a file must stay unchanged before it is validated
+DEFAULT_DEBOUNCE = 0.3
+
+# Seconds between scans when polling
+DEFAULT_POLL_INTERVAL = 0.5
+
+SAVE_EXTENSION = '.json'
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _watch_targets(paths: List[str]) -> Tuple[Set[str], Set[str]]:
+    """Split watch arguments into whole directories and individual save files"""
+    dirs, files = set(), set()
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            dirs.add(path)
+        else:
+            files.add(path)
+    return dirs, files
+
+
+class PollingWatcher:
+    """Portable watcher that compares (mtime, size) snapshots"""
+
+    def __init__(self, paths: List[str], interval: float = DEFAULT_POLL_INTERVAL):
+        self.watched_dirs, self.files = _watch_targets(paths)
+        # Individual files are watched through their parent directory
+        self.dirs = self.watched_dirs | {os.path.dirname(f) for f in self.files}
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _wanted(self, path: str) -> bool:
+        if path in self.files:
+            return True
+        return path.endswith(SAVE_EXTENSION) and os.path.dirname(path) in self.watched_dirs
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for directory in self.dirs:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if not self._wanted(entry.path):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[str]:
+        """Paths created, modified or deleted since the last call"""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {p for p, sig in current.items() if self.snapshot.get(p) != sig}
+        changed.update(p for p in self.snapshot if p not in current)
+        self.snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(PollingWatcher):
+    """Linux watcher on inotify(7) through ctypes; raises OSError if unavailable"""
+
+    def __init__(self, paths: List[str], interval: float = DEFAULT_POLL_INTERVAL):
+        super().__init__(paths, interval)
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name or not sys.platform.startswith('linux'):
+            raise OSError("inotify is not available")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.watches: Dict[int, str] = {}
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        for directory in self.dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.watches[wd] = directory
+
+    def poll(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos + INOTIFY_EVENT.size <= len(buf):
+            wd, _mask, _cookie, length = INOTIFY_EVENT.unpack_from(buf, pos)
+            pos += INOTIFY_EVENT.size
+            name = os.fsdecode(buf[pos:pos + length].rstrip(b'\0'))
+            pos += length
+            path = os.path.join(self.watches.get(wd, ''), name)
+            if self._wanted(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(paths: List[str], interval: float, force_poll: bool = False) -> PollingWatcher:
+    """inotify where available, polling otherwise"""
+    if not force_poll:
+        try:
+            return InotifyWatcher(paths, interval)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, interval)
+
+
+class WatchSession:
+    """Warm validator state: the previous validated run of every watched save"""
+
+    def __init__(self, streaming: bool = False):
+        self.streaming = streaming
+        self.previous: Dict[str, TTSTestFramework] = {}
+
+    def forget(self, path: str):
+        self.previous.pop(path, None)
+
+    def validate(self, path: str) -> Optional[bool]:
+        """Revalidate one save; None if it could not be loaded (e.g. mid-write)"""
+        start = time.perf_counter()
+        new = TTSTestFramework(path, streaming=self.streaming)
+        if not load_quietly(new):
+            print(f"{Color.YELLOW}⚠ {os.path.basename(path)}: {new.errors[0]}{Color.END}")
+            return None
+
+        old = self.previous.get(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if old is None:
+                for check in new.checks:
+                    new.run_check(check)
+            else:
+                diff, affected = validate_incremental(old, new)
+
+        stamp = datetime.now().strftime('%H:%M:%S')
+        elapsed = (time.perf_counter() - start) * 1000
+        if old is None:
+            self._print_first_run(new, stamp, elapsed)
+        else:
+            print_diff_report(old, new, diff, affected)
+            print(f"{Color.BLUE}[{stamp}] revalidated in {elapsed:.0f} ms{Color.END}")
+
+        self.previous[path] = new
+        return not new.errors
+
+    @staticmethod
+    def _print_first_run(framework: TTSTestFramework, stamp: str, elapsed: float):
+        name = os.path.basename(framework.save_file_path)
+        errors, warnings = framework.errors, framework.warnings
+        if errors:
+            print(f"{Color.RED}✗ [{stamp}] {name}: {len(errors)} errors, "
+                  f"{len(warnings)} warnings ({elapsed:.0f} ms){Color.END}")
+            for error in errors:
+                print(f"{Color.RED}  {error}{Color.END}")
+        else:
+            print(f"{Color.GREEN}✓ [{stamp}] {name}: passed, "
+                  f"{len(warnings)} warnings ({elapsed:.0f} ms){Color.END}")
+
+
+def watch(watcher: PollingWatcher, session: WatchSession, debounce: float,
+          initial: List[str]):
+    """Validate `initial`, then every settled change until interrupted"""
+    for path in initial:
+        session.validate(path)
+
+    # path -> (time of last event, (mtime, size) when last seen)
+    pending: Dict[str, Tuple[float, Optional[Tuple[int, int]]]] = {}
+    while True:
+        for path in watcher.poll(debounce if pending else 1.0):
+            pending[path] = (time.monotonic(), None)
+
+        now = time.monotonic()
+        for path, (last_event, seen) in list(pending.items()):
+            if now - last_event < debounce:
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                del pending[path]
+                session.forget(path)
+                continue
+            signature = (st.st_mtime_ns, st.st_size)
+            if signature != seen:
+                # Still being written: wait another debounce period
+                pending[path] = (now, signature)
+                continue
+            del pending[path]
+            session.validate(path)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Revalidate DBR TTS saves whenever they change")
+    parser.add_argument('paths', nargs='+', help="Save files or directories to watch")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help="Seconds a file must be unchanged before validating")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Polling interval when inotify is unavailable")
+    parser.add_argument('--poll', action='store_true', help="Always poll instead of using inotify")
+    parser.add_argument('--stream', action='store_true',
+                        help="Parse ObjectStates incrementally (bounded memory for large saves)")
+    parser.add_argument('--skip-initial', action='store_true',
+                        help="Do not validate existing saves at startup")
+    args = parser.parse_args()
+
+    watcher = make_watcher(args.paths, args.interval, args.poll)
+    session = WatchSession(args.stream)
+    initial = [] if args.skip_initial else sorted(watcher.snapshot)
+
+    mode = 'inotify' if isinstance(watcher, InotifyWatcher) else f"polling every {args.interval}s"
+    print(f"{Color.BOLD}Watching {len(watcher.snapshot)} saves ({mode}); Ctrl+C to stop{Color.END}")
+    try:
+        watch(watcher, session, args.debounce, initial)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()